@@ -1,6 +1,7 @@
 from __future__ import annotations
 import os
 import sys
+import multiprocessing
 from time import perf_counter
 from copy import deepcopy
 
@@ -46,6 +47,7 @@ from PyQt6.QtWidgets import (
     QScrollArea,
     QScrollBar,
     QSizePolicy,
+    QSlider,
     QSplitter,
     QTableView,
     QVBoxLayout,
@@ -55,8 +57,15 @@ from pyparsing import Literal
 from scipy.interpolate import interp1d
 
 
+from project.spectra.BatchDetection import getThreshold
+from project.spectra.Conversion import energyToTOF
 from project.spectra.SpectraDataStructure import SpectraData
+from project.spectra.PeakDatabase import loadPeakTable, tableColumns
+from project.spectra.SpectraCatalog import getCatalog
+from project.spectra.SpectrumRepository import spectrumRepository
+from project.spectra.SpectrumStore import saveSpectrum
 
+from project.myPyQt.BatchDetectionThread import BatchDetectionThread
 from project.myPyQt.ButtonDelegate import ButtonDelegate
 from project.myPyQt.CustomSortingProxy import CustomSortingProxy
 from project.myPyQt.ExtendedComboBox import ExtendedComboBox
@@ -66,7 +75,11 @@ from project.myPyQt.PeakWindow import PeakWindow
 from project.myPyQt.PeriodicTable import QtPeriodicTable
 
 from project.myMatplotlib.CustomFigureCanvas import FigureCanvas
+from project.myMatplotlib.AnnotationLayer import AnnotationLayer
+from project.myMatplotlib.ArtistRegistry import ArtistRegistry
 from project.myMatplotlib.BlittedCursor import BlittedCursor
+from project.myMatplotlib.DecimatedLine import plotDecimated
+from project.myMatplotlib.PeakMarkers import PeakMarkers
 
 from project.helpers.getRandomColor import getRandomColor
 from project.helpers.getWidgets import getLayoutWidgets
@@ -148,6 +161,9 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
         self.ax: matplotlib.axes.Axes = None
         self.axPD: matplotlib.axes.Axes = None
+        # Artists of each plotted spectra, keyed by (spectra title, role).
+        self.artists: ArtistRegistry = ArtistRegistry()
+        self.annotationLayer: AnnotationLayer = None
 
         self.plotCount: int = -1
         self.annotations: list[matplotlib.text.Annotations] = []
@@ -259,6 +275,10 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         editLength = QAction(QIcon(resource_path(f"{params['dir_img']}edit-component.svg")), "&Edit Length", self)
         editLength.setShortcut("Ctrl+Shift+L")
         editLength.triggered.connect(self.editLength)
+
+        analyseIsotopes = QAction(
+            QIcon(resource_path(f"{params['dir_img']}edit-component.svg")), "&Analyse Isotopes", self)
+        analyseIsotopes.triggered.connect(self.analyseIsotopes)
         # fileMenu.addAction(saveAction)
 
         editMenu = menubar.addMenu("&Edit")
@@ -266,6 +286,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         editMenu.addAction(editThresholdAction)
         editMenu.addAction(editDistribution)
         editMenu.addAction(editLength)
+        editMenu.addAction(analyseIsotopes)
 
         menubarLayout.addWidget(menubar, alignment=Qt.AlignmentFlag.AlignLeft)
         # Adding label which shows number of peaks
@@ -342,13 +363,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         # Establishing source and destination directories
 
         # Creating a list of substances stored in the NRCA database data directory
-        self.spectraNames = [None]
-        for file in os.listdir(resource_path(f"{self.graphDataDir}")):
-            filename = os.fsdecode(file)
-            if ".csv" not in filename[-4:]:
-                continue
-            filename = filename[:-4]
-            self.spectraNames.append(filename)
+        self.spectraNames = [None, *getCatalog(self.graphDataDir).names()]
 
         # Creating combo box (drop down menu)
         self.combobox = ExtendedComboBox(self)
@@ -510,13 +525,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             index=self.compoundCombobox.currentIndex(),
             comboboxName=self.compoundCombobox.objectName()
         ))
-        self.compoundNames = [None]
-        for file in os.listdir(resource_path(params['dir_compoundGraphData'])):
-            filename = os.fsdecode(file)
-            if ".csv" not in filename[-4:]:
-                continue
-            filename = filename[:-4]
-            self.compoundNames.append(filename)
+        self.compoundNames = [None, *getCatalog(params['dir_compoundGraphData']).names()]
         self.compoundCombobox.addItems(self.compoundNames)
         compoundCreaterLayout.addWidget(compoundLabel)
         compoundCreaterLayout.addWidget(compoundCreaterBtn)
@@ -743,65 +752,57 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             spectraName: str = spectras.itemText(spectras.currentIndex() or 0)
             spectra: SpectraData = self.spectraData[spectraName]
             which = 'max' if maxOptionRadio.isChecked() else 'min'
-            peakList = spectra.maxima if which == 'max' else spectra.minima
             whichLim = 'both' if firstLimitX.text(
             ) and secondLimitX.text() else 'left' if firstLimitX.text() else 'right' if secondLimitX.text() else None
             ax: matplotlib.axes.Axes = self.axPD if self.axPD is not None else self.ax
-            for line in [line for line in ax.lines if 'peakEdit' in line.get_gid()]:
-                if removeAll:
-                    line.remove()
-
-                elif str(peak[0]) in line.get_gid():
-                    line.remove()
-
+            # Guides of the peak being edited are registered under 'peakEdit', by the peak.
+            self.artists.remove('peakEdit', None if removeAll else [str(peak[0])])
             if removeAll:
-                self.figure.canvas.draw()
+                self.canvas.requestDraw()
                 return
             if not spectra.whichAnnotationsDrawn == which:
                 self.drawAnnotations(spectra, which)
             xLims, yLims = (spectra.maxPeakLimitsX, spectra.maxPeakLimitsY) if maxOptionRadio.isChecked(
             ) else (spectra.minPeakLimitsX, spectra.minPeakLimitsY)
             leftLim, rightLim = list(zip(xLims[peak[0]], yLims[peak[0]]))
-            index = np.where(peakList[0] == peak[0])[0][0]
-            if whichLim is not None:
-                for line in [line for line in ax.lines
-                             if f'{which}-limL-{index}' in line.get_gid() or f'{which}-limR-{index}' in line.get_gid()]:
-
-                    if whichLim in ['left', 'both'] and 'limL' in line.get_gid():
-                        line.set_data([leftLim[0]], [leftLim[1]])
-
-                    elif whichLim in ['right', 'both'] and 'limR' in line.get_gid():
-                        line.set_data([rightLim[0]], [rightLim[1]])
-
-            ax.plot(peak[0],
-                    peak[1],
-                    "x",
-                    color="black",
-                    markersize=3,
-                    alpha=0.6,
-                    gid=f"peakEdit-{peak[0]}-peak"
-                    )
-            ax.axline(leftLim,
-                      rightLim,
-
-                      linestyle="--",
-                      color='r',
-                      linewidth=1.0,
-                      gid=f"peakEdit-{peak[0]}-midLine"
-                      )
-
-            ax.axvline(x=leftLim[0],
-                       linestyle="--",
-                       color='r',
-                       linewidth=1.0,
-                       gid=f"peakEdit-{peak[0]}-leftLine"
-                       )
-            ax.axvline(x=rightLim[0],
-                       linestyle="--",
-                       color='r',
-                       linewidth=1.0,
-                       gid=f"peakEdit-{peak[0]}-rightLim"
-                       )
+            markers = self.artists.first(f"{spectra.name}-{'ToF' if spectra.isToF else 'Energy'}", which)
+            if whichLim is not None and markers is not None:
+                markers.setPeakLimits(peak[0],
+                                      leftLim if whichLim in ['left', 'both'] else None,
+                                      rightLim if whichLim in ['right', 'both'] else None)
+
+            guides = [
+                ax.plot(peak[0],
+                        peak[1],
+                        "x",
+                        color="black",
+                        markersize=3,
+                        alpha=0.6,
+                        gid=f"peakEdit-{peak[0]}-peak"
+                        )[0],
+                ax.axline(leftLim,
+                          rightLim,
+
+                          linestyle="--",
+                          color='r',
+                          linewidth=1.0,
+                          gid=f"peakEdit-{peak[0]}-midLine"
+                          ),
+                ax.axvline(x=leftLim[0],
+                           linestyle="--",
+                           color='r',
+                           linewidth=1.0,
+                           gid=f"peakEdit-{peak[0]}-leftLine"
+                           ),
+                ax.axvline(x=rightLim[0],
+                           linestyle="--",
+                           color='r',
+                           linewidth=1.0,
+                           gid=f"peakEdit-{peak[0]}-rightLim"
+                           )
+            ]
+            for guide in guides:
+                self.artists.add('peakEdit', str(peak[0]), guide)
             self.toolbar.push_current()
 
             ax.set_xlim(left=(lambda x: x if x > 0 else 0.001)(leftLim[0] - 0.1 * (rightLim[0] - leftLim[0])),
@@ -810,7 +811,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                                 if maxOptionRadio.isChecked()
                                 else peak[1]) * 0.8,
                         top=(peak[1] if maxOptionRadio.isChecked() else max(leftLim[1], rightLim[1])) * 1.2)
-            self.figure.canvas.draw()
+            self.canvas.requestDraw()
 
         def onAccept():
             drawPeakData(removeAll=True)
@@ -1207,8 +1208,33 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         applyBtn.clicked.connect(onAccept)
         cancelBtn.clicked.connect(optionsWindow.reject)
 
+        previewed = set()
+
+        def previewDistribution(spectraName: str, distributions: dict[str, float] | None = None) -> None:
+            # Plotted lines of the spectra follow the distribution as it is typed, the weighted sum of its isotopes is
+            # a single product over their cached resampled data. Without a distribution the plotted data is restored.
+            if distributions is None:
+                previewed.discard(spectraName)
+            else:
+                previewed.add(spectraName)
+            for title, Tof in self.plottedSpectra:
+                if spectraName != title:
+                    continue
+                label = f"{title}-{'ToF' if Tof else 'Energy'}"
+                spectra = self.spectraData[label]
+                graphData = spectra.graphData if distributions is None else spectra.mixedGraphData(distributions)
+                for line in self.artists.get(label, 'line'):
+                    line.set_data(graphData.iloc[:, 0], graphData.iloc[:, 1])
+            self.canvas.requestDraw()
+
+        def restorePreviews() -> None:
+            for spectraName in list(previewed):
+                previewDistribution(spectraName)
+        optionsWindow.rejected.connect(restorePreviews)
+
         def onReset():
             onElementChange(index=spectras.currentIndex(), reset=True)
+            onDistributionChange()
             applyBtn.setEnabled(True)
         resetBtn.clicked.connect(onReset)
 
@@ -1218,6 +1244,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             if spectraName == '':
                 spectras.setCurrentIndex(0)
                 return
+            restorePreviews()
             totalLabel.setStyleSheet(f"color: {self.text_color};")
             for widget in getLayoutWidgets(optionsWindow.mainLayout, QWidget):
                 if widget.objectName() == "isotopeDistribution":
@@ -1261,13 +1288,16 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 return
             total: float = 0
             acc = min([len(str(a)) - 2 for a in self.defaultDistributions[spectraName].values()])
+            distributions = {}
             for widget in getLayoutWidgets(optionsWindow.mainLayout, QWidget):
                 lineEdit = widget.findChild(QLineEdit)
                 distribution = lineEdit.placeholderText() if lineEdit.text() == '' else lineEdit.text()
                 if distribution == ".":
                     continue
+                distributions[widget.findChild(QLabel).text()[:-1]] = float(distribution)
                 total += float(distribution)
             total = round(total, acc)
+            previewDistribution(spectraName, distributions)
             totalLabel.setText(f"Total: {total}")
             applyBtn.setEnabled(False)
             if total < 1:
@@ -1305,6 +1335,27 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
         optionsWindow.inputForm.addRow(QLabel("Threshold:"), inputThreshold)
 
+        # Each slider step is the height of a candidate peak, so every step shows or hides a single peak.
+        thresholdSlider = QSlider(Qt.Orientation.Horizontal)
+        optionsWindow.inputForm.addRow(QLabel("Sweep:"), thresholdSlider)
+
+        def sliderThresholds() -> np.ndarray:
+            spectra = self.spectraData.get(spectras.currentText(), None)
+            if spectra is None or spectra.peakDetector is None:
+                return np.array([])
+            return spectra.peakDetector.maximaThresholds()
+
+        def resetSlider() -> None:
+            thresholds = sliderThresholds()
+            thresholdSlider.blockSignals(True)
+            thresholdSlider.setEnabled(thresholds.size != 0)
+            thresholdSlider.setRange(0, max(thresholds.size - 1, 0))
+            if thresholds.size != 0:
+                spectra = self.spectraData[spectras.currentText()]
+                thresholdSlider.setValue(int(np.searchsorted(thresholds, spectra.threshold)))
+            thresholdSlider.blockSignals(False)
+        resetSlider()
+
         applyBtn = optionsWindow.buttonBox.addButton(QDialogButtonBox.StandardButton.Apply)
         cancelBtn = optionsWindow.buttonBox.addButton(QDialogButtonBox.StandardButton.Cancel)
         applyBtn.setEnabled(False)
@@ -1325,6 +1376,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 inputThreshold.setText(None)
                 return
             inputThreshold.setPlaceholderText(str(self.spectraData[spectras.itemText(index)].threshold))
+            resetSlider()
         spectras.editTextChanged.connect(lambda: onElementChange(spectras.currentIndex()))
 
         def onThresholdTextChange():
@@ -1334,17 +1386,21 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 applyBtn.setEnabled(True)
         inputThreshold.textChanged.connect(onThresholdTextChange)
 
-        def onAccept():
-            spectraName = spectras.currentText()
-            if inputThreshold.text() == '':
-                return
+        def setThreshold() -> SpectraData:
             threshold_value = float(inputThreshold.text())
-            spectra: SpectraData = self.spectraData[spectraName]
+            spectra: SpectraData = self.spectraData[spectras.currentText()]
             spectra.thresholds[spectra.plotType] = threshold_value
             spectra.threshold = threshold_value
             self.threshold = threshold_value
             self.numRows = spectra.numPeaks
             spectra.updatePeaks(which='max')
+            return spectra
+
+        def onAccept():
+            spectraName = spectras.currentText()
+            if inputThreshold.text() == '':
+                return
+            spectra = setThreshold()
             self.addTableData()
             self.toggleThreshold()
             self.plotDerivatives(spectra)
@@ -1360,6 +1416,20 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             self.updateLabels(spectraName)
         applyBtn.clicked.connect(onAccept)
 
+        def onSweep(position: int):
+            thresholds = sliderThresholds()
+            if thresholds.size == 0:
+                return
+            inputThreshold.setText(np.format_float_positional(thresholds[position]))
+            if not thresholdSlider.isSliderDown():
+                onAccept()
+                return
+            # Only the annotations follow the slider while dragging, the rest is updated once released.
+            spectra = setThreshold()
+            self.drawAnnotations(spectra, which='max' if self.maxTableOptionRadio.isChecked() else 'min')
+        thresholdSlider.valueChanged.connect(onSweep)
+        thresholdSlider.sliderReleased.connect(onAccept)
+
         inputThreshold.setFocus()
         optionsWindow.setModal(False)
         optionsWindow.show()
@@ -1403,30 +1473,25 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         cancelBtn.clicked.connect(onCancel)
 
         def onAccept():
-            lengthConversion = deepcopy(self.length)
+            previousLength = deepcopy(self.length)
 
             self.length["n-g"] = float(lineEditNG.text())
             self.length["n-tot"] = float(lineEditNTOT.text())
             params['length'] = self.length
 
-            lengthConversion["n-g"] = self.length["n-g"] / lengthConversion["n-g"]
-            lengthConversion["n-tot"] = self.length["n-tot"] / lengthConversion["n-tot"]
             for spectra in self.spectraData.values():
-                spectra.length = self.length
-                if spectra.isToF:
-                    spectra.graphData = spectra.graphData * [lengthConversion[spectra.plotType], 1]
-
-                spectra.updatePeaks('both', True)
+                # Peaks, limits and tables are rescaled with the time of flight axis, rather than detected again.
+                spectra.rescaleLength(self.length, previousLength)
                 spectra.orderAnnotations('max')
                 spectra.orderAnnotations('min')
 
-                for line in self.ax.lines:
-                    if f"{spectra.name}-{'ToF'}" == line.get_label():
-                        line.set_xdata(spectra.graphData[0])
-                        break
+                for line in self.artists.get(f"{spectra.name}-ToF", 'line'):
+                    line.set_xdata(spectra.graphData[0])
 
                 self.drawAnnotations(spectra=spectra, which='max' if self.maxTableOptionRadio.isChecked() else 'min')
-            self.canvas.draw()
+            if self.spectraData:
+                self.addTableData(True)
+            self.canvas.requestDraw()
         applyBtn.clicked.connect(onAccept)
 
         optionsWindow.setModal(False)
@@ -1775,6 +1840,66 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         optionsWindow.setModal(False)
         optionsWindow.show()
 
+    def analyseIsotopes(self) -> None:
+        """
+        ``analyseIsotopes``
+        -------------------
+        Opens a dialog which finds the peaks of every isotope of a plotted element at once, across a process pool, and
+        lists how many maxima and minima each isotope has.
+        """
+        elements = [title for title, spectra in self.spectraData.items() if spectra.name.startswith('element')]
+        if elements == []:
+            return
+
+        optionsWindow = InputSpectraDialog(self, self.styleSheet())
+        spectras = optionsWindow.spectras
+        spectras.addItems(elements)
+
+        progressLabel = QLabel("")
+        optionsWindow.mainLayout.insertWidget(1, progressLabel)
+        optionsWindow.mainLayout.insertItem(2, optionsWindow.inputForm)
+
+        applyBtn = optionsWindow.buttonBox.addButton(QDialogButtonBox.StandardButton.Apply)
+        cancelBtn = optionsWindow.buttonBox.addButton(QDialogButtonBox.StandardButton.Cancel)
+
+        optionsWindow.setWindowTitle("Analyse Isotopes")
+        optionsWindow.setLayout(optionsWindow.mainLayout)
+
+        def closeWindow():
+            optionsWindow.close()
+        cancelBtn.clicked.connect(closeWindow)
+
+        def onAccept():
+            spectra = self.spectraData[spectras.currentText()]
+            info = interpName(spectra.name)
+            names = getCatalog(self.graphDataDir).names(symbol=info['symbol'], mode=spectra.plotType, isElement=False)
+            while optionsWindow.inputForm.rowCount():
+                optionsWindow.inputForm.removeRow(0)
+            completed = []
+
+            def onProgress(name: str, result: dict) -> None:
+                completed.append(name)
+                progressLabel.setText(f"Analysed {len(completed)} of {len(names)} Isotopes")
+
+            def onDetected(results: dict) -> None:
+                for name, result in results.items():
+                    optionsWindow.inputForm.addRow(QLabel(f"{name}:"), QLabel(
+                        f"{result['maxima'].shape[1]} Maxima, {result['minima'].shape[1]} Minima"))
+                applyBtn.setEnabled(True)
+
+            # Detection runs off the GUI thread, each isotope with its own threshold.
+            applyBtn.setEnabled(False)
+            optionsWindow.detectionThread = BatchDetectionThread(
+                {name: spectrumRepository.get(name, self.graphDataDir) for name in names},
+                {name: getThreshold(name) for name in names}, parent=optionsWindow)
+            optionsWindow.detectionThread.progress.connect(onProgress)
+            optionsWindow.detectionThread.detected.connect(onDetected)
+            optionsWindow.detectionThread.start()
+        applyBtn.clicked.connect(onAccept)
+
+        optionsWindow.setModal(False)
+        optionsWindow.show()
+
     def createCompound(self) -> None:
         """
         ``createCompound``
@@ -1821,15 +1946,16 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             }
             name = f"""compound_{'-'.join([f'{name.split("-", 1)[1].split("_")[0]}[{str(dist)}]'
                                            for name, dist in compoundDist.items()])}_{compoundMode[0]}"""
-            weightedGraphData = {name: pd.read_csv(resource_path(f"{self.graphDataDir}{name}.csv"),
-                                                   header=None) * [1, dist]
+            weightedGraphData = {name: pd.DataFrame(spectrumRepository.get(name, self.graphDataDir) * [1, dist])
                                  for name, dist in compoundDist.items() if dist != 0}
             newElement = SpectraData(name, None, None, None, None, None, None,
-                                     compoundDist, compoundDist, isCompound=True)
+                                     compoundDist, compoundDist, isCompound=True, graphDataDir=self.graphDataDir)
             newElement.setGraphDataFromDist(weightedGraphData)
             newElement.graphData.to_csv(f"{self.graphDataDir}Compound Data\\{name}.csv",
                                         index=False,
                                         header=False)
+            saveSpectrum(name, newElement.graphData)
+            spectrumRepository.invalidate(name)
             pd.DataFrame(compoundDist.items()).to_csv(
                 f"{self.dir}data\\Distribution Information\\{name}.csv", index=False, header=False)
 
@@ -2477,26 +2603,17 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         -----------------
         Read and display the selected substances data within the table.
         """
-        # Finding relevant file for peak information
-        filepath = None
-        for file in os.listdir(params['dir_peakInfo']):
-            if self.selectionName.replace('element_', '') in file:
-                filepath = resource_path(f"""{
-                    params['dir_peakInfo']
-                }{file[:-7]}{'max' if self.maxTableOptionRadio.isChecked() else 'min'}.csv""")
-                break
-
         try:
             for row in self.table_model.titleRows:
                 self.table.setItemDelegateForRow(row, None)
         except AttributeError:
             pass
         try:
-            if filepath is None:
+            if self.selectionName is None:
                 raise ValueError
-
+            # Direct lookup of the selection's peak table within the peak database.
+            file = loadPeakTable(self.selectionName, False, 'max' if self.maxTableOptionRadio.isChecked() else 'min')
             self.table.blockSignals(True)
-            file = pd.read_csv(resource_path(filepath), header=0)
             # Reset any changes to spans before displaying selection data.
             self.table.clearSpans()
 
@@ -2633,10 +2750,15 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 self.plotFilepath = f"{params['dir_compoundGraphData']}{spectraName}.csv"
             else:
                 self.plotFilepath = f"{self.graphDataDir}{spectraName}.csv" if filepath is None else filepath
-            peakInfoDir = f"{self.dir}data\\Peak information\\" if filepath is None else None
+            isDatabaseSpectra = filepath is None
 
             try:
-                graphData = pd.read_csv(resource_path(self.plotFilepath), header=None).iloc[:, :2]
+                if self.plotFilepath == filepath:
+                    graphData = pd.read_csv(resource_path(self.plotFilepath), header=None).iloc[:, :2]
+                else:
+                    # Database spectra are memory-mapped from the binary store when available.
+                    graphData = spectrumRepository.getGraphData(spectraName,
+                                                                self.plotFilepath[:-len(f"{spectraName}.csv")])
 
             except pd.errors.EmptyDataError:
                 QMessageBox.warning(self, "Warning", "Selection has Empty Graph Data")
@@ -2666,23 +2788,11 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 return
 
             try:
-                elementTableDataMax = pd.read_csv(
-                    resource_path(
-                        f"{peakInfoDir}{'TOF' if tof else 'Energy'}/{spectraName.replace(
-                            'element_', '')}_tableData_max.csv"))
+                if not isDatabaseSpectra:
+                    raise FileNotFoundError
+                elementTableDataMax = loadPeakTable(spectraName, tof, 'max')
             except FileNotFoundError:
-                elementTableDataMax = pd.DataFrame(
-                    columns=[
-                        "Rank by Integral",
-                        "TOF (us)" if tof else "Energy (eV)",
-                        "Rank by " + ("TOF" if tof else "Energy"),
-                        "Integral",
-                        "Peak Width",
-                        "Rank by Peak Width",
-                        "Peak Height",
-                        "Rank by Peak Height",
-                        "Relevant Isotope"
-                    ])
+                elementTableDataMax = pd.DataFrame(columns=tableColumns(tof))
             # Title Rows
             if elementTableDataMax.empty:
                 elementTableDataMax.loc[-1] = [f"No Peak Data for {spectraName}", *[""] * 8]
@@ -2692,23 +2802,11 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             elementTableDataMax.index += 1
             elementTableDataMax.sort_index(inplace=True)
             try:
-                elementTableDataMin = pd.read_csv(
-                    resource_path(
-                        f"{peakInfoDir}{'TOF' if tof else 'Energy'}/{spectraName.replace(
-                            'element_', '')}_tableData_min.csv"))
+                if not isDatabaseSpectra:
+                    raise FileNotFoundError
+                elementTableDataMin = loadPeakTable(spectraName, tof, 'min')
             except FileNotFoundError:
-                elementTableDataMin = pd.DataFrame(
-                    columns=[
-                        "Rank by Integral",
-                        "TOF (us)" if tof else "Energy (eV)",
-                        "Rank by " + ("TOF" if tof else "Energy"),
-                        "Integral",
-                        "Peak Width",
-                        "Rank by Peak Width",
-                        "Peak Height",
-                        "Rank by Peak Height",
-                        "Relevant Isotope"
-                    ])
+                elementTableDataMin = pd.DataFrame(columns=tableColumns(tof))
             # Title Rows
             if elementTableDataMin.empty:
                 elementTableDataMin.loc[-1] = [f"No Peak Data for {spectraName}", *[""] * 8]
@@ -2723,6 +2821,11 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                     point.remove()
             symbol = interpName(spectraName)['symbol']
             thresholds = params['threshold_exceptions'].get(symbol, {'n-tot': 100, 'n-g': 100})
+            # ToF peaks are derived from the plotted energy spectra where it matches, rather than detected again.
+            energySpectra = self.spectraData.get(f"{spectraName}-Energy", None)
+            energyResults = energySpectra.derivedResults() if tof and not distAltered and not imported \
+                and energySpectra is not None and energySpectra.peakDetector is not None \
+                and energySpectra.distributions == self.elementDistributions.get(spectraName, None) else None
             newSpectra = SpectraData(name=spectraName,
                                      numPeaks=self.numRows,
                                      tableDataMax=elementTableDataMax,
@@ -2738,7 +2841,9 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                                      thresholds=thresholds,
                                      length=params['length'],
                                      isImported=imported,
-                                     updatingDatabase=params['updating_database'])
+                                     updatingDatabase=params['updating_database'],
+                                     energyResults=energyResults,
+                                     graphDataDir=self.graphDataDir)
 
             self.spectraData[title] = newSpectra
 
@@ -2746,20 +2851,9 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         redrawMin = False
         if distAltered:
             title = f"{newSpectra.name}-{'ToF' if tof else 'Energy'}"
-            for line in self.ax.get_lines():
-                if title in line.get_label():
-                    line.remove()
-            try:
-                for line in self.axPD.get_lines():
-                    if 'max' in line.get_gid():
-                        redrawMax = True
-                    if 'min' in line.get_gid():
-                        redrawMin = True
-                    if title in line.get_label() or title in line.get_gid():
-                        line.remove()
-
-            except AttributeError:
-                pass
+            redrawMax = self.artists.hasRole('max')
+            redrawMin = self.artists.hasRole('min')
+            self.artists.remove(title)
 
         distAltered = False
 
@@ -2771,7 +2865,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
         self.onPeakTableOptionChange()
 
-        self.canvas.draw()
+        self.canvas.requestDraw()
 
     def plot(self, spectraData: SpectraData, filepath: str = None, imported: bool = False, name: str = None) -> None:
         """
@@ -2795,6 +2889,9 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         # General Plotting ---------------------------------------------------------------------------------------------
         if self.plotCount < 0:
             self.ax = self.figure.add_subplot(111)
+            if self.annotationLayer is not None:
+                self.annotationLayer.disconnect()
+            self.annotationLayer = AnnotationLayer(self.ax)
             # Setting scale to be logarithmic
 
             self.ax.set_xscale('log')
@@ -2846,16 +2943,16 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
         if not spectraData.graphData.empty:
 
-            self.ax.plot(
+            self.artists.add(label, 'line', plotDecimated(
+                self.ax,
                 spectraData.graphData.iloc[:, 0],
                 spectraData.graphData.iloc[:, 1],
-                "-",
-                c=spectraData.graphColour,
+                color=spectraData.graphColour,
                 alpha=0.6,
                 linewidth=1.0,
                 label=label,
                 gid=spectraData.name if self.selectionName is None else self.selectionName,
-            )
+            ))
             spectraData.isGraphDrawn = True
 
             spectraData.isUpdating = False
@@ -2873,7 +2970,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         self.ax.autoscale()  # Tidying up
 
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.canvas.requestDraw()
 
     def plotDerivatives(self, spectraData: SpectraData) -> None:
         """
@@ -2903,56 +3000,56 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             right = 2e7
         ax: matplotlib.axes.Axes = self.axPD if self.axPD is not None else self.ax
 
-        for line in [line for line in ax.get_lines() if 'Der' in line.get_gid() and spectraData.name in line.get_gid()]:
-            line.remove()
+        title = f"{spectraData.name}{'-ToF' if spectraData.isToF else '-Energy'}"
+        self.artists.remove(title, ['derivative'])
         smoothGraph = spectraData.peakDetector.smoothGraph
         graphData = spectraData.peakDetector.secDerivative
-        label = f"{spectraData.name}{'-ToF' if spectraData.isToF else '-Energy'}-Smoothed"
+        label = f"{title}-Smoothed"
         if params['show_smoothed']:
 
-            ax.plot(smoothGraph.iloc[:, 0],
-                    smoothGraph.iloc[:, 1],
-                    "-",
-                    alpha=0.6,
-                    color='#00F',
-                    linewidth=1.0,
-                    label=label,
-                    gid=f"{spectraData.name}-Der"
-                    )
+            self.artists.add(title, 'derivative', ax.plot(smoothGraph.iloc[:, 0],
+                                                          smoothGraph.iloc[:, 1],
+                                                          "-",
+                                                          alpha=0.6,
+                                                          color='#00F',
+                                                          linewidth=1.0,
+                                                          label=label,
+                                                          gid=f"{spectraData.name}-Der"
+                                                          )[0])
         if params['show_first_der']:
             dips = spectraData.peakDetector.dips
             flats = spectraData.peakDetector.flats
             for x in graphData.iloc[flats[np.where(flats < right)]].iloc[:, 0]:
-                ax.axvline(x,
-                           color='#00ff00aa',
-                           linewidth=0.7,
-                           alpha=0.8,
-                           gid=f"{label}-{x}-Flats-Der")
+                self.artists.add(title, 'derivative', ax.axvline(x,
+                                                                 color='#00ff00aa',
+                                                                 linewidth=0.7,
+                                                                 alpha=0.8,
+                                                                 gid=f"{label}-{x}-Flats-Der"))
 
             for x in graphData.iloc[dips[np.where(dips < right)]].iloc[:, 0]:
-                ax.axvline(x,
-                           color='#F0F',
-                           linewidth=0.7,
-                           alpha=0.8,
-                           gid=f"{label}-{x}-Dips-Der")
+                self.artists.add(title, 'derivative', ax.axvline(x,
+                                                                 color='#F0F',
+                                                                 linewidth=0.7,
+                                                                 alpha=0.8,
+                                                                 gid=f"{label}-{x}-Dips-Der"))
 
         if params['show_second_der']:
             infls = spectraData.peakDetector.infls
             for x in graphData.iloc[infls[np.where((infls > left) & (infls < right))]].iloc[:, 0]:
-                ax.axvline(x,
-                           color='#00F',
-                           linewidth=0.7,
-                           alpha=0.8,
-                           gid=f"{label}-{x}-Inflection-Der")
+                self.artists.add(title, 'derivative', ax.axvline(x,
+                                                                 color='#00F',
+                                                                 linewidth=0.7,
+                                                                 alpha=0.8,
+                                                                 gid=f"{label}-{x}-Inflection-Der"))
         if params['show_smoothed']:
-            ax.plot(spectraData.peakDetector.normalised.iloc[:, 0],
-                    spectraData.peakDetector.normalised.iloc[:, 1],
-                    gid=f"{spectraData.name}-normal-Der",
-                    label=f"{label}-normal")
-            ax.plot(spectraData.peakDetector.baselineGraph.iloc[:, 0],
-                    spectraData.peakDetector.baselineGraph.iloc[:, 1],
-                    gid=f"{spectraData.name}-baseline-Der",
-                    label=f"{label}-baseline")
+            self.artists.add(title, 'derivative', ax.plot(spectraData.peakDetector.normalised.iloc[:, 0],
+                                                          spectraData.peakDetector.normalised.iloc[:, 1],
+                                                          gid=f"{spectraData.name}-normal-Der",
+                                                          label=f"{label}-normal")[0])
+            self.artists.add(title, 'derivative', ax.plot(spectraData.peakDetector.baselineGraph.iloc[:, 0],
+                                                          spectraData.peakDetector.baselineGraph.iloc[:, 1],
+                                                          gid=f"{spectraData.name}-baseline-Der",
+                                                          label=f"{label}-baseline")[0])
 
         # widths, h_eval, left_ips, right_ips = spectraData.peakDetector.widths
         # ax.hlines(h_eval, left_ips, right_ips, color='green', linewidth=1.5)
@@ -3007,16 +3104,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         # ! Add a way to change length at runtime per spectra
         if length is None:
             length = 22.804
-        neutronMass = float(1.68e-27)
-        electronCharge = float(1.60e-19)
-
-        tofX = list(
-            map(
-                lambda x: length * 1e6 * (0.5 * neutronMass / (x * electronCharge)) ** 0.5,
-                xData
-            )
-        )
-        return tofX
+        return list(energyToTOF(np.atleast_1d(xData), length))
 
     def hideGraph(self, event) -> None:
         """
@@ -3031,10 +3119,10 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
         legline = event.artist
         if self.ax.get_visible():
-            axis, legOrigLines = self.ax, self.legOrigLines
+            roles, legOrigLines = ['threshold', 'derivative'], self.legOrigLines
         if self.axPD is not None:
             if self.axPD.get_visible():
-                axis, legOrigLines = self.axPD, self.legOrigLinesPD
+                roles, legOrigLines = ['pdThreshold', 'derivative', 'max', 'min'], self.legOrigLinesPD
 
         if legline not in legOrigLines:
             return
@@ -3050,21 +3138,10 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         spectraData = self.spectraData[orgline_name.replace("-Smoothed", "")]
         spectraData.isGraphHidden = not newVisible
         spectraData.hideAnnotations(self.peakLabelCheck.isChecked())
-        for line in axis.lines:
-            if line.get_gid() == f"pd_threshold-{orgline_name}":
-                line.set_visible(newVisible)
-                continue
-            if f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-max" in line.get_gid():
-                line.set_visible(newVisible)
-                continue
-            if f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-min" in line.get_gid():
-                line.set_visible(newVisible)
-                continue
-            if spectraData.name in line.get_gid() and "Der" in line.get_gid():
-                line.set_visible(newVisible)
-                continue
+        title = f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}"
+        self.artists.setVisible(title, newVisible, roles)
 
-        self.canvas.draw()
+        self.canvas.requestDraw()
 
     def clear(self) -> None:
         """
@@ -3077,7 +3154,8 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             self.figure.clear()
             self.ax.clear()
             self.axPD = None
-            self.canvas.draw()
+            self.artists.clear()
+            self.canvas.requestDraw()
         except AttributeError:
             pass
 
@@ -3148,7 +3226,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 self.axPD.grid(visible=visible, which="both")
         except AttributeError:
             pass
-        self.canvas.draw()
+        self.canvas.requestDraw()
 
     def toggleThreshold(self) -> None:
         """
@@ -3158,50 +3236,34 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         """
         checked = self.thresholdCheck.isChecked()
 
-        for line in self.ax.get_lines():
-            if line is None:
-                continue
-            if line.get_gid() is None:
-                continue
-            if "pd_threshold" in line.get_gid():
-                line.remove()
-        try:
-            for line in self.axPD.get_lines():
-                if line is None:
-                    continue
-                if line.get_gid() is None:
-                    continue
-                if "pd_threshold" in line.get_gid():
-                    line.remove()
-        except AttributeError:
-            pass
-        self.canvas.draw()
+        self.artists.remove(roles=['threshold', 'pdThreshold'])
+        self.canvas.requestDraw()
         if checked:
             for name, element in self.spectraData.items():
                 self.figure.add_subplot(self.ax)
                 if self.ax.get_visible():
-                    line = self.ax.axhline(
+                    line = self.artists.add(name, 'threshold', self.ax.axhline(
                         y=element.threshold,
                         linestyle="--",
                         color=element.graphColour,
                         linewidth=0.5,
                         gid=f"pd_threshold-{name}"
-                    )
+                    ))
                 try:
                     if self.axPD.get_visible() and (element.isMaxDrawn or element.isMinDrawn):
-                        line = self.axPD.axhline(
+                        line = self.artists.add(name, 'pdThreshold', self.axPD.axhline(
                             y=element.threshold,
                             linestyle="--",
                             color=element.graphColour,
                             linewidth=0.5,
                             gid=f"pd_threshold-{name}"
-                        )
+                        ))
                 except AttributeError:
                     pass
                 if element.isGraphHidden:
                     line.set_visible(False)
 
-                self.canvas.draw()
+                self.canvas.requestDraw()
 
     def onPeakOrderChange(self) -> None:
         """
@@ -3270,17 +3332,17 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             maxDraw = spectra.maxima.shape[1] if which == 'max' else spectra.minima.shape[1]
             maxDraw = spectra.maxPeaks if maxDraw > spectra.maxPeaks else maxDraw
         t1 = perf_counter()
-        spectra.annotations = [self.ax.annotate(text=f'{i}',
-                                                xy=xy[i],
-                                                xytext=xy[i],
-                                                xycoords="data",
-                                                textcoords="data",
-                                                va="center",
-                                                size=7,
-                                                gid=gid,
-                                                annotation_clip=True,
-                                                alpha=0.8
-                                                )
+        spectra.annotations = [self.annotationLayer.annotate(text=f'{i}',
+                                                             xy=xy[i],
+                                                             xytext=xy[i],
+                                                             xycoords="data",
+                                                             textcoords="data",
+                                                             va="center",
+                                                             size=7,
+                                                             gid=gid,
+                                                             annotation_clip=True,
+                                                             alpha=0.8
+                                                             )
                                for i in
                                (range(0, maxDraw) if type(xy) is np.ndarray else xy.keys())
                                if i < maxDraw]
@@ -3291,7 +3353,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                 annotation.set_visible(False)
             spectra.isAnnotationsHidden = True
         spectra.isAnnotationsDrawn = True
-        self.canvas.draw()
+        self.annotationLayer.update()
 
     def toggleAnnotations(self) -> None:
         """
@@ -3303,7 +3365,8 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             element.hideAnnotations(self.peakLabelCheck.isChecked())
             element.isAnnotationsHidden = not element.isAnnotationsHidden
 
-        self.canvas.draw()
+        if self.annotationLayer is not None:
+            self.annotationLayer.update()
 
     def plotPeakWindow(self, index: QModelIndex) -> None:
         """
@@ -3561,6 +3624,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
                     self.axPD.clear()
                     self.axPD.remove()
                     self.axPD = None
+                    self.artists.remove(roles=['pdLine', 'pdThreshold', 'max', 'min'])
 
                 self.ax.set_visible(True)
                 for element in self.spectraData.values():
@@ -3571,7 +3635,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
             self.toggleThreshold()
             self.toggleGridlines(self.gridCheck.isChecked(), *self.gridSettings.values())
             self.toolbar.update()
-            self.canvas.draw()
+            self.canvas.requestDraw()
         resetBtn.clicked.connect(ResetPDPlots)
 
     def plottingPD(self, spectraData: SpectraData, isMax: bool) -> None:
@@ -3644,114 +3708,42 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
         label = f"{spectraData.name}-ToF" if spectraData.isToF else f"{spectraData.name}-Energy"
         if not spectraData.isMaxDrawn and not spectraData.isMinDrawn and not spectraData.isUpdating:
-            self.axPD.plot(
+            self.artists.add(label, 'pdLine', plotDecimated(
+                self.axPD,
                 spectraData.graphData[0],
                 spectraData.graphData[1],
-                "-",
                 color=spectraData.graphColour,
                 alpha=0.6,
                 linewidth=1.0,
                 label=label,
                 gid=f"{spectraData.name}-PD"
-            )
+            ))
         self.toggleThreshold()
         self.drawAnnotations(spectraData, which='max' if self.maxTableOptionRadio.isChecked() else 'min')
 
-        if isMax:
-            title = f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}"
-            pdPoints = [
-                a for a in self.axPD.get_lines() if "max" in a.get_gid() and title in a.get_gid()
-            ]
-            pdPointsXY = [(point.get_xdata()[0], point.get_ydata()[0])
-                          for point in pdPoints]
-            peaks = list(zip(peaksX, peaksY))
-            removeIds = []
-            for point in pdPoints:
-                if "max-p" not in point.get_gid():
-                    continue
-                xy = (point.get_xdata()[0], point.get_ydata()[0])
-                if xy not in peaks and title in point.get_gid():
-                    removeIds.append(point.get_gid().split('-')[-1])
-            if removeIds != []:
-                for point in pdPoints:
-                    if point.get_gid().split('-')[-1] in removeIds:
-                        point.remove()
-
-            # Plot Maxima / minima points and its integration limits
-
-            for i, (x, y) in enumerate(zip(peaksX, peaksY)):
-                if (x, y) in pdPointsXY:
-                    continue
-                self.axPD.plot(x,
-                               y,
-                               "x",
-                               color="black",
-                               markersize=3,
-                               alpha=0.6,
-                               gid=f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-max-p-{i}")
+        # Plot Maxima / minima points and its integration limits
+        which = 'max' if isMax else 'min'
+        title = f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}"
+        limitsX, limitsY = (spectraData.maxPeakLimitsX, spectraData.maxPeakLimitsY) if isMax else (
+            spectraData.minPeakLimitsX, spectraData.minPeakLimitsY)
+        markers = self.artists.first(title, which)
+        if markers is None or markers.axes is not self.axPD:
+            self.artists.remove(title, [which])
+            markers = self.artists.add(title, which, PeakMarkers(self.axPD, f"{title}-{which}"))
+        markers.update(peaksX, peaksY, limitsX, limitsY)
+        markers.set_visible(not spectraData.isGraphHidden)
+        if len(peaksX):
+            if isMax:
                 spectraData.isMaxDrawn = True
-                if spectraData.maxPeakLimitsX.get(x, False):
-                    limitXFirst = spectraData.maxPeakLimitsX[x][0]
-                    limitXSecond = spectraData.maxPeakLimitsX[x][1]
-                else:
-                    continue
-                if spectraData.maxPeakLimitsY.get(x, False):
-                    limitYFirst = spectraData.maxPeakLimitsY[x][0]
-                    limitYSecond = spectraData.maxPeakLimitsY[x][1]
-                else:
-                    continue
-
-                self.axPD.plot(limitXFirst,
-                               limitYFirst,
-                               marker=2,
-                               color="r",
-                               markersize=8,
-                               gid=f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-max-limL-{i}")
-                self.axPD.plot(limitXSecond,
-                               limitYSecond,
-                               marker=2,
-                               color="r",
-                               markersize=8,
-                               gid=f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-max-limR-{i}")
-
-        else:
-            for i, (x, y) in enumerate(zip(peaksX, peaksY)):
-                self.axPD.plot(x,
-                               y,
-                               "x",
-                               color="black",
-                               markersize=3,
-                               alpha=0.6,
-                               gid=f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-min-p-{i}")
+            else:
                 spectraData.isMinDrawn = True
-                if spectraData.minPeakLimitsX.get(x, False):
-                    limitXFirst = spectraData.minPeakLimitsX[x][0]
-                    limitXSecond = spectraData.minPeakLimitsX[x][1]
-                else:
-                    continue
-                if spectraData.minPeakLimitsY.get(x, False):
-                    limitYFirst = spectraData.minPeakLimitsY[x][0]
-                    limitYSecond = spectraData.minPeakLimitsY[x][1]
-                else:
-                    continue
-
-                self.axPD.plot(limitXFirst,
-                               limitYFirst,
-                               marker=2,
-                               color="r",
-                               markersize=8,
-                               gid=f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-min-limL-{i}")
-                self.axPD.plot(limitXSecond,
-                               limitYSecond,
-                               marker=2,
-                               color="r",
-                               markersize=8,
-                               gid=f"{spectraData.name}-{'ToF' if spectraData.isToF else 'Energy'}-min-limR-{i}")
 
         legendPD: matplotlib.legend.DraggableLegend = self.axPD.legend(fancybox=True, shadow=True, draggable=True)
         self.legOrigLinesPD = {}
-        origlines = [line for line in self.axPD.get_lines() if not ('max' in line.get_gid() or 'min' in line.get_gid())]
-        for legLine, origLine in zip(legendPD.get_lines(), origlines):
+        for legLine in legendPD.get_lines():
+            origLine = self.artists.first(legLine.get_label(), 'pdLine')
+            if origLine is None:
+                continue
             legLine.set_picker(True)
             legLine.set_linewidth(1.5)
             legLine.set_pickradius(7)
@@ -3763,7 +3755,7 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
         self.toolbar.update()
         self.toolbar.push_current()
         spectraData.isUpdating = False
-        self.canvas.draw()
+        self.canvas.requestDraw()
 
     def openPeriodicTable(self) -> None:
         self.periodicTable = QtPeriodicTable(self)
@@ -3771,6 +3763,8 @@ class ExplorerGUI(QWidget):  # Acts just like QWidget class (like a template)
 
 
 def main() -> None:
+    # Workers of the batch detection process pool start from the frozen executable, rather than the GUI again.
+    multiprocessing.freeze_support()
 
     app = QtWidgets.QApplication(sys.argv)
     app.setObjectName('MainWindow')
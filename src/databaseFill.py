@@ -1,13 +1,20 @@
+import hashlib
 import os
+import sys
 import pandas as pd
+from project.spectra.BatchDetection import batchDetect, getThreshold
+from project.spectra.PeakDatabase import PeakDatabase, getPeakDatabase, tableColumns
+from project.spectra.SpectraCatalog import getCatalog
 from project.spectra.SpectraDataStructure import SpectraData
+from project.spectra.SpectrumRepository import spectrumRepository
 from project.helpers.resourcePath import resource_path
 from project.settings import params
 from time import perf_counter
 
-from multiprocessing import Pool
+# Bumped whenever the tables built from the same inputs change, forcing a full rebuild.
+BUILD_VERSION = 3
 
-dist_filePaths: list[str] = [f for f in os.listdir(params['dir_distribution']) if f.endswith(".csv")]
+dist_filePaths: list[str] = [f for f in os.listdir(resource_path(params['dir_distribution'])) if f.endswith(".csv")]
 defaultDistributions: dict = {}
 for filepath in dist_filePaths:
     name = filepath[:-4]
@@ -15,52 +22,55 @@ for filepath in dist_filePaths:
     defaultDistributions[name] = dict({d[0]: d[1] for d in dist.values})
 
 
-spectraNames: list = []
-for file in os.listdir(f"{params['dir_graphData']}"):
-    filename = os.fsdecode(file)
-    if ".csv" not in filename[-4:]:
-        continue
-    filename = filename[:-4]
-    spectraNames.append(filename)
+spectraNames: list = getCatalog().names()
 
 thresholds = params['threshold_exceptions']
-exportDir = r'C:\Users\Ryanh\Desktop\Test DataBase'
 
 
-def exportDatabaseValues(name):
-    print(f"Starting - {name}")
-    filepath = f"{params['dir_graphData']}{name}.csv"
-    try:
-        graphData = pd.read_csv(resource_path(filepath), header=None)
-    except pd.errors.EmptyDataError:
-        return
+def getThresholds(name: str) -> tuple[float] | dict[str, float]:
     split = name.split("-")
     if name.startswith("e"):
         dataSymbolSort = split[1]
         dataSymbol = dataSymbolSort[:-2]
     else:
         dataSymbol = split[1]
+    return thresholds.get(dataSymbol, {'n-tot': 100, 'n-g': 100})
+
+
+def getGraphData(name: str) -> pd.DataFrame:
+    # Graph data as SpectraData holds it, so the batch detection sees the same points.
+    try:
+        graphData = spectrumRepository.getGraphData(name)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+    graphData = graphData.drop_duplicates(0).dropna()
+    return graphData.sort_values(0, ignore_index=True)
+
 
-    threshold = thresholds.get(dataSymbol, {'n-tot': 100, 'n-g': 100})
+def exportDatabaseValues(name: str, graphData: pd.DataFrame, detectedPeaks: dict) -> dict:
+    """
+    ``exportDatabaseValues``
+    ------------------------
 
+    Args:
+        ``name`` (str): Spectra name.
+        ``graphData`` (DataFrame): Graph data of the spectra, from ``getGraphData``.
+        ``detectedPeaks`` (dict): Result of ``batchDetect`` for the graph data.
+
+    Returns:
+        dict: Energy and ToF tables keyed by (isToF, which), and the energy limits keyed by which.
+    """
+    threshold = getThresholds(name)
+
+    results = {}
+    energyResults = None
     for tof in [False, True]:
-        tableData = pd.DataFrame(
-            columns=[
-                "Rank by Integral",
-                "TOF (us)" if tof else "Energy (eV)",
-                "Rank by " + ("TOF" if tof else "Energy"),
-                "Integral",
-                "Peak Width",
-                "Rank by Peak Width",
-                "Peak Height",
-                "Rank by Peak Height",
-                "Relevant Isotope"
-            ])
+        tableData = pd.DataFrame(columns=tableColumns(tof))
         spectra = SpectraData(name=name,
                               numPeaks=None,
                               tableDataMax=tableData,
                               tableDataMin=tableData,
-                              graphData=graphData,
+                              graphData=graphData.copy(),
                               graphColour=(0, 0, 0),
                               isToF=tof,
                               defaultDist=defaultDistributions.get(name, None),
@@ -68,32 +78,137 @@ def exportDatabaseValues(name):
                               isCompound=False,
                               isAnnotationsHidden=True,
                               thresholds=threshold,
-                              updatingDatabase=True
+                              updatingDatabase=True,
+                              energyResults=energyResults,
+                              detectedPeaks=None if tof else detectedPeaks
                               )
-        name = name.replace("element_", "").replace("-Energy", "").replace("-ToF", "")
-        spectra.maxTableData[1:].to_csv(
-            f'{exportDir}/Peak Information/{'TOF' if tof else 'Energy'}/{name}_tableData_max.csv', index=False)
-        spectra.minTableData[1:].to_csv(
-            f'{exportDir}/Peak Information/{'TOF' if tof else 'Energy'}/{name}_tableData_min.csv', index=False)
-
-        pd.DataFrame(spectra.maxPeakLimitsX.values()
-                     ).to_csv(f'{exportDir}/Peak Limit Information/{name}_max.csv',
-                              header=False,
-                              index=False)
-        pd.DataFrame(spectra.minPeakLimitsX.values()
-                     ).to_csv(f'{exportDir}/Peak Limit Information/{name}_min.csv',
-                              header=False,
-                              index=False)
-    print(f"Finished - {name}\n")
+        results[(tof, 'max')] = spectra.maxTableData[1:]
+        results[(tof, 'min')] = spectra.minTableData[1:]
+        if not tof:
+            # Limits are stored in the energy domain, SpectraData converts them when plotting ToF.
+            results['max'] = list(spectra.maxPeakLimitsX.values())
+            results['min'] = list(spectra.minPeakLimitsX.values())
+            # The ToF tables are derived from the energy results rather than analysing the spectra again.
+            energyResults = spectra.derivedResults() if spectra.peakDetector is not None else None
+    return results
+
+
+def writeDatabaseValues(name: str, results: dict, database: PeakDatabase, manifest: dict = None) -> None:
+    # Every table, the limits and the manifest entry of a spectra are written in one transaction.
+    results = results or {}
+    database.setResults(name,
+                        {key: table for key, table in results.items() if isinstance(key, tuple)},
+                        {which: results[which] for which in ['max', 'min'] if which in results},
+                        manifest)
+
+
+def sourceState(name: str, previous: dict = None) -> dict:
+    """
+    ``sourceState``
+    ---------------
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``previous`` (dict, optional): Manifest entry of the last build, its hash is reused if the source file has
+        not been modified since. Defaults to None.
+
+    Returns:
+        dict: Modification time and content hash of the spectra's graph data file.
+    """
+    filepath = resource_path(f"{params['dir_graphData']}{name}.csv")
+    mtime = os.stat(filepath).st_mtime
+    if previous is not None and previous['sourceMtime'] == mtime:
+        return {'sourceMtime': mtime, 'sourceHash': previous['sourceHash']}
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return {'sourceMtime': mtime, 'sourceHash': digest.hexdigest()}
+
+
+def buildKey(name: str, sources: dict[str, dict]) -> str:
+    """
+    ``buildKey``
+    ------------
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``sources`` (dict[str, dict]): ``sourceState`` of every spectra, keyed by name.
+
+    Returns:
+        str: Hash of every input of the spectra's tables. Its graph data, that of the isotopes it is integrated over,
+        its distribution, its threshold and the peak detector settings.
+    """
+    mode = name.split('_')[-1]
+    distributions = defaultDistributions.get(name, None) or {}
+    isotopeSources = sorted((isotope, sources.get(f"{isotope}_{mode}", {}).get('sourceHash'))
+                            for isotope, dist in distributions.items() if dist != 0)
+    inputs = (BUILD_VERSION,
+              sources[name]['sourceHash'],
+              isotopeSources,
+              sorted(distributions.items()),
+              getThreshold(name),
+              params['length'][mode],
+              params['min_prominence'],
+              params['detection_mode'],
+              params['pyramid_block'],
+              params['pyramid_margin'],
+              params['pyramid_min_points'])
+    return hashlib.blake2b(repr(inputs).encode(), digest_size=20).hexdigest()
+
+
+def rebuild(names: list[str] = None, force: bool = False, database: PeakDatabase = None,
+            processes: int = None) -> list[str]:
+    """
+    ``rebuild``
+    -----------
+
+    Rebuilds the peak tables and limits of every spectra whose inputs have changed since it was last built, see
+    ``buildKey``. Peaks and limits are found across a process pool by ``batchDetect``, the tables of each spectra are
+    then calculated and written from this process as its peaks arrive. Each spectra is recorded in the database's
+    build manifest as it is written, so an interrupted rebuild resumes from where it stopped.
+
+    Args:
+        ``names`` (list[str], optional): Spectra to consider, defaults to every spectra of the catalog.
+        ``force`` (bool, optional): Whether to rebuild regardless of the manifest. Defaults to False.
+        ``database`` (PeakDatabase, optional): Database to write into. Defaults to the shared peak database.
+        ``processes`` (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        list[str]: Names of the spectra rebuilt.
+    """
+    database = getPeakDatabase() if database is None else database
+    names = spectraNames if names is None else names
+    manifest = database.getManifest()
+    # Sources of the spectra and of the isotopes they are integrated over.
+    sourceNames = set(names)
+    for name in names:
+        mode = name.split('_')[-1]
+        sourceNames.update(f"{isotope}_{mode}" for isotope in (defaultDistributions.get(name, None) or {}))
+    sources = {name: sourceState(name, manifest.get(name)) for name in sourceNames.intersection(spectraNames)}
+    keys = {name: buildKey(name, sources) for name in names}
+    stale = [name for name in names if force or manifest.get(name, {}).get('buildKey') != keys[name]]
+    if not stale:
+        return []
+    graphData = {name: getGraphData(name) for name in stale}
+
+    def write(name: str, detectedPeaks: dict = None) -> None:
+        # Workers only detect peaks, the tables and the peak database are written from this process alone.
+        results = None if detectedPeaks is None else exportDatabaseValues(name, graphData.pop(name), detectedPeaks)
+        writeDatabaseValues(name, results, database, {'buildKey': keys[name], **sources[name]})
+
+    detected = batchDetect({name: data.to_numpy() for name, data in graphData.items()},
+                           {name: getThreshold(name) for name in stale}, workers=processes, callback=write)
+    # Spectra without graph data are recorded with no tables.
+    for name in stale:
+        if name not in detected:
+            write(name)
+    return stale
 
 
 if __name__ == "__main__":
-    # for name in [name for name in spectraNames if 'Te' in name]:
-    #     exportDatabaseValues(name)
+    # python databaseFill.py [--force] [names...]
     t1 = perf_counter()
-    with Pool() as p:
-        map = p.map(exportDatabaseValues, spectraNames)
-        for item in map:
-            pass
+    rebuilt = rebuild([arg for arg in sys.argv[1:] if arg != '--force'] or None, force='--force' in sys.argv)
     t2 = perf_counter()
-    print(f'\n\nFinished All - Elapsed Time: {t2 - t1}')
+    print(f'\n\nFinished All - Rebuilt {len(rebuilt)} Spectra - Elapsed Time: {t2 - t1}')
@@ -1,50 +1,94 @@
 from __future__ import annotations
 
-from pandas import DataFrame
+import numpy as np
+from numpy import ndarray
+from pandas import Series
 from pyparsing import Literal
-from scipy.integrate import simpson
 
-from project.helpers.nearestNumber import nearestnumber
 
-
-def integrate_simps(graphData: DataFrame,
-                    leftLimit: tuple[float],
-                    rightLimit: tuple[float],
-                    which: Literal['max, min'] = 'max') -> float:
+class CumulativeIntegral:
+    """
+    Prefix-sum index of a spectra's integral. The trapezoidal integral of the graph data is accumulated once, the
+    integral over any [left, right] window is then the difference of two lookups, each a ``searchsorted`` plus a linear
+    interpolation into the partial interval at the limit. Windows are integrated exactly over the linearly
+    interpolated spectra, so limits need not coincide with data points.
     """
-    integrate_simps Integrates the graphdata about the given limits, using the simpsons rule.
 
-    Args:
-        - ``graphData`` (DataFrame): graphs xy data.
+    def __init__(self, x: ndarray | Series, y: ndarray | Series) -> None:
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.size > 1 and np.any(x[1:] < x[:-1]):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+        self.x: ndarray = x
+        self.y: ndarray = y
+        self.cumulative: ndarray = np.concatenate(([0.0], np.cumsum(np.diff(x) * (y[1:] + y[:-1]) / 2)))
 
-        - ``leftLimit`` (tuple[float]): coordinates for the left limit.
+    @property
+    def nbytes(self) -> int:
+        return self.x.nbytes + self.y.nbytes + self.cumulative.nbytes
 
-        - ``rightLimit`` (tuple[float]): coordinates for the right limit.
+    def _locate(self, xq: ndarray) -> tuple[ndarray, ndarray, ndarray]:
+        xq = np.clip(xq, self.x[0], self.x[-1])
+        i = np.clip(np.searchsorted(self.x, xq, side='right') - 1, 0, self.x.size - 2)
+        dx = xq - self.x[i]
+        width = self.x[i + 1] - self.x[i]
+        slope = np.divide(self.y[i + 1] - self.y[i], width, out=np.zeros_like(dx), where=width != 0)
+        return i, dx, self.y[i] + slope * dx
 
-    Returns:
-        float: Integral value.
-    """
+    def valueAt(self, xq: float | ndarray) -> ndarray:
+        """
+        ``valueAt``
+        -----------
+
+        Args:
+            - ``xq`` (float | ndarray): X-Coords, clipped to the range of the graph data.
+
+        Returns:
+            ndarray: Linearly interpolated y-values.
+        """
+        return self._locate(np.asarray(xq, dtype=float))[2]
+
+    def areaTo(self, xq: float | ndarray) -> ndarray:
+        """
+        ``areaTo``
+        ----------
+
+        Args:
+            - ``xq`` (float | ndarray): X-Coords, clipped to the range of the graph data.
+
+        Returns:
+            ndarray: Integral from the first data point up to each x-coord.
+        """
+        i, dx, yq = self._locate(np.asarray(xq, dtype=float))
+        return self.cumulative[i] + dx * (self.y[i] + yq) / 2
+
+    def integrate(self, leftLimit: float | ndarray, rightLimit: float | ndarray,
+                  which: Literal['max', 'min'] = 'max') -> ndarray:
+        """
+        ``integrate``
+        -------------
+
+        Peak integral over each window, with the trapezium between the limits and the axis removed. Non peak
+        contributions are clamped to zero.
+
+        Args:
+            - ``leftLimit`` (float | ndarray): X-Coords of the left limits of integration.
+
+            - ``rightLimit`` (float | ndarray): X-Coords of the right limits of integration.
+
+            - ``which`` (Literal['max', 'min'], optional): Whether integrating maxima or minima. Defaults to 'max'.
 
-    if graphData[(graphData.iloc[:, 0] >= leftLimit) & (graphData.iloc[:, 0] <= rightLimit)].empty:
-        left = nearestnumber(graphData.iloc[:, 0], leftLimit)
-        right = nearestnumber(graphData.iloc[:, 0], rightLimit)
-        graphData = graphData[(graphData.iloc[:, 0] >= left) & (graphData.iloc[:, 0] <= right)]
-    else:
-        graphData = graphData[(graphData.iloc[:, 0] >= leftLimit) & (graphData.iloc[:, 0] <= rightLimit)]
-    peakL = (graphData.iloc[0, 0], graphData.iloc[0, 1])
-    peakR = (graphData.iloc[-1, 0], graphData.iloc[-1, 1])
-    if peakL == peakR:
-        return 0
-    x, y = graphData.iloc[:, 0], graphData.iloc[:, 1]
-
-    result = simpson(y, x=x, dx=0.05)
-    excess = (peakR[0] - peakL[0]) * (peakL[1] + peakR[1]) / 2
-
-    if which == 'max':
-        if result - excess <= 0:  # Catches non peak contibution for isotopes.
-            return 0
-        return result - excess
-    else:
-        if excess - result <= 0:
-            return 0
-        return excess - result
+        Returns:
+            ndarray: Integral of each window.
+        """
+        leftLimit = np.asarray(leftLimit, dtype=float)
+        rightLimit = np.asarray(rightLimit, dtype=float)
+        if self.x.size < 2:
+            return np.zeros(np.broadcast(leftLimit, rightLimit).shape)
+        leftLimit = np.clip(leftLimit, self.x[0], self.x[-1])
+        rightLimit = np.clip(rightLimit, self.x[0], self.x[-1])
+        result = self.areaTo(rightLimit) - self.areaTo(leftLimit)
+        excess = (rightLimit - leftLimit) * (self.valueAt(leftLimit) + self.valueAt(rightLimit)) / 2
+        integral = result - excess if which == 'max' else excess - result
+        return np.where((rightLimit > leftLimit) & (integral > 0), integral, 0.0)
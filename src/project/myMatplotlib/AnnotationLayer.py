@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from matplotlib.axes import Axes
+from matplotlib.text import Annotation
+
+
+class AnnotationLayer:
+    """
+    Peak labels of an axes drawn as animated artists, blitted over a copy of the rendered figure taken after each full
+    draw. Showing, hiding, reordering or replacing the labels only redraws the labels, not the spectra lines under them.
+    """
+
+    def __init__(self, ax: Axes) -> None:
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.background = None
+        self.drawEvent = self.canvas.mpl_connect('draw_event', self.onDraw)
+
+    def annotate(self, text: str, xy, **kwargs) -> Annotation:
+        """
+        ``annotate``
+        ------------
+
+        Args:
+            - ``text`` (str): Text of the label.
+
+            - ``xy`` (ArrayLike): Point to label.
+
+            - ``kwargs``: Annotation properties, as for ``ax.annotate``.
+
+        Returns:
+            Annotation: Label added to the layer.
+        """
+        return self.ax.annotate(text, xy, animated=True, **kwargs)
+
+    def visibleAnnotations(self) -> list[Annotation]:
+        if not self.ax.get_visible():
+            return []
+        return [text for text in self.ax.texts if text.get_animated() and text.get_visible()]
+
+    def onDraw(self, event) -> None:
+        # Animated artists are left out of a full draw, the labels are drawn on top of the copy of the rest.
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.drawAnnotations()
+
+    def drawAnnotations(self) -> None:
+        for annotation in self.visibleAnnotations():
+            self.ax.draw_artist(annotation)
+
+    def update(self) -> None:
+        """
+        ``update``
+        ----------
+
+        Redraws the labels over the background. Requests a full draw instead if none has been rendered yet, or if one is
+        already pending, as the background no longer matches the figure.
+        """
+        if self.background is None or self.canvas.drawPending:
+            self.canvas.requestDraw()
+            return
+        self.canvas.restore_region(self.background)
+        self.drawAnnotations()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def disconnect(self) -> None:
+        self.canvas.mpl_disconnect(self.drawEvent)
+        self.background = None
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import Iterable
+
+from matplotlib.artist import Artist
+
+
+class ArtistRegistry:
+    """
+    Index of the artists drawn for each plotted spectra, keyed by the spectra title and the role of the artist, e.g.
+    ('29-Cu_n-g-Energy', 'threshold'). Showing, hiding or removing the artists of one spectra only touches those
+    artists, however many other spectra are plotted.
+    """
+
+    def __init__(self) -> None:
+        self._artists: dict[str, dict[str, list[Artist]]] = {}
+
+    def add(self, title: str, role: str, artist: Artist) -> Artist:
+        """
+        ``add``
+        -------
+
+        Args:
+            - ``title`` (str): Title of the spectra the artist belongs to.
+
+            - ``role`` (str): Role of the artist, e.g. 'line', 'threshold' or 'max'.
+
+            - ``artist`` (Artist): Artist to register.
+
+        Returns:
+            Artist: The registered artist.
+        """
+        self._artists.setdefault(title, {}).setdefault(role, []).append(artist)
+        return artist
+
+    def get(self, title: str, role: str) -> list[Artist]:
+        return self._artists.get(title, {}).get(role, [])
+
+    def first(self, title: str, role: str) -> Artist | None:
+        artists = self.get(title, role)
+        return artists[0] if artists else None
+
+    def hasRole(self, role: str) -> bool:
+        return any(roles.get(role) for roles in self._artists.values())
+
+    def _select(self, title: str | None, roles: Iterable[str] | None) -> list[tuple[str, str]]:
+        titles = list(self._artists) if title is None else [title] if title in self._artists else []
+        return [(title, role) for title in titles for role in (list(self._artists[title]) if roles is None else roles)
+                if role in self._artists[title]]
+
+    def setVisible(self, title: str, visible: bool, roles: Iterable[str] | None = None) -> None:
+        """
+        ``setVisible``
+        --------------
+
+        Args:
+            - ``title`` (str): Title of the spectra.
+
+            - ``visible`` (bool): Whether to show or hide its artists.
+
+            - ``roles`` (Iterable[str] | None, optional): Roles to show or hide. Defaults to None, all roles.
+        """
+        for title, role in self._select(title, roles):
+            for artist in self._artists[title][role]:
+                artist.set_visible(visible)
+
+    def remove(self, title: str | None = None, roles: Iterable[str] | None = None) -> None:
+        """
+        ``remove``
+        ----------
+
+        Removes the artists from their axes and from the registry.
+
+        Args:
+            - ``title`` (str | None, optional): Title of the spectra. Defaults to None, every spectra.
+
+            - ``roles`` (Iterable[str] | None, optional): Roles to remove. Defaults to None, all roles.
+        """
+        for title, role in self._select(title, roles):
+            for artist in self._artists[title].pop(role):
+                # Artists of a cleared axes are already detached.
+                if artist.axes is not None:
+                    artist.remove()
+            if not self._artists[title]:
+                del self._artists[title]
+
+    def clear(self) -> None:
+        """
+        ``clear``
+        ---------
+
+        Forgets every artist, for when their axes have been cleared.
+        """
+        self._artists = {}
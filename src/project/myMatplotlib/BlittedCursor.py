@@ -91,6 +91,6 @@ class BlittedCursor:
         for artist in zip(self.ax.get_lines(), self.ax.texts):
             if 'cursor' in artist.get_gid():
                 artist.remove()
-        self.ax.figure.canvas.draw()
+        self.ax.figure.canvas.draw_idle()
         self.ax.figure.canvas.mpl_disconnect(self.drawEvent)
         self.ax.figure.canvas.flush_events()
@@ -5,12 +5,47 @@ from matplotlib.figure import Figure
 from PyQt6.QtWidgets import QMenu
 from PyQt6.QtGui import QAction, QIcon
 
+from project.settings import params
+
 
 class FigureCanvas(FigureCanvasQTAgg):
     def __init__(self, figure: Figure = None, widgetParent=None, contextConnect: bool = True):
         super(FigureCanvasQTAgg, self).__init__(figure)
         self.widgetParent = widgetParent
         self.contextConnect = contextConnect
+        self.drawsRequested: int = 0
+        self.drawsExecuted: int = 0
+        # Whether a requested draw has not been executed yet.
+        self.drawPending: bool = False
+
+    def requestDraw(self) -> None:
+        """
+        ``requestDraw``
+        ---------------
+
+        Marks the figure as needing a redraw. Every request made before control returns to the event loop is served by
+        a single draw, rather than rendering the whole figure once per request.
+        """
+        self.drawsRequested += 1
+        self.drawPending = True
+        self.draw_idle()
+
+    def draw(self) -> None:
+        self.drawsExecuted += 1
+        self.drawPending = False
+        super().draw()
+        if params['show_draw_stats']:
+            print(f"Draws - {self.drawsRequested} requested, {self.drawsExecuted} executed")
+
+    def drawStats(self) -> dict[str, int]:
+        """
+        ``drawStats``
+        -------------
+
+        Returns:
+            dict[str, int]: Number of draws requested and executed since the canvas was created.
+        """
+        return {'requested': self.drawsRequested, 'executed': self.drawsExecuted}
 
     def contextMenuEvent(self, event):
         if not self.contextConnect:
@@ -30,6 +65,7 @@ class FigureCanvas(FigureCanvasQTAgg):
         if res is not None:
             graphLine = graphDict[res.text()][0]
             graphLine.remove()
+            self.widgetParent.artists.remove(res.text())
 
             self.widgetParent.plottedSpectra.remove((graphDict[res.text()][0].get_gid(), 'ToF' in res.text()))
 
@@ -40,7 +76,7 @@ class FigureCanvas(FigureCanvasQTAgg):
             for row in self.widgetParent.titleRows:
                 self.widgetParent.table.setItemDelegateForRow(row, None)
             self.widgetParent.updateLegend()
-            axis.figure.canvas.draw()
+            self.requestDraw()
             self.widgetParent.addTableData()
             if len(self.widgetParent.plottedSpectra) == 0:
                 self.widgetParent.clear()
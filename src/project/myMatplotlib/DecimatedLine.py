@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy import ndarray
+from matplotlib.axes import Axes
+from matplotlib.lines import Line2D
+
+
+def decimationIndices(x: ndarray, y: ndarray, pixels: int) -> ndarray:
+    """
+    ``decimationIndices``
+    ---------------------
+
+    Args:
+        - ``x`` (ndarray): Sorted x-coords of the samples, in the scaled coordinates of the axis (log10 on a log axis).
+
+        - ``y`` (ndarray): y-coords of the samples.
+
+        - ``pixels`` (int): Number of pixel columns ``x`` is spread across.
+
+    Returns:
+        ndarray: Sorted indices of the first, last, lowest and highest sample of each pixel column, drawing only these
+        gives the same line as drawing every sample.
+    """
+    if x.size == 0:
+        return np.zeros(0, dtype=int)
+    span = x[-1] - x[0]
+    buckets = (x - x[0]) * (pixels / span) if span > 0 else np.zeros(x.size)
+    buckets[~np.isfinite(buckets)] = 0
+    buckets = np.clip(buckets, 0, pixels - 1).astype(int)
+    starts = np.flatnonzero(np.diff(buckets)) + 1
+    starts = np.concatenate([[0], starts])
+    counts = np.diff(np.concatenate([starts, [x.size]]))
+    segments = np.repeat(np.arange(starts.size), counts)
+    indices = [starts, starts + counts - 1]
+    for extreme in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        positions = np.flatnonzero(y == np.repeat(extreme, counts))
+        _, first = np.unique(segments[positions], return_index=True)
+        indices.append(positions[first])
+    return np.unique(np.concatenate(indices))
+
+
+class DecimatedLine2D(Line2D):
+    """
+    Line drawing at most four samples per pixel column of the current view, the first, last, lowest and highest, so no
+    resonance peak or dip is lost however far the view is zoomed out. The samples are chosen again whenever the x-limits
+    of its axes change, through zooming, panning or the navigation toolbar, or its canvas is resized. ``set_data``,
+    ``set_xdata`` and ``set_ydata`` replace the full resolution data.
+    """
+
+    _fullX: ndarray = np.zeros(0)
+    _fullY: ndarray = np.zeros(0)
+    _extremes: ndarray = np.zeros(0, dtype=int)
+    _view: tuple = None
+    _connections: list = None
+
+    def __init__(self, xdata, ydata, **kwargs) -> None:
+        super().__init__(xdata, ydata, **kwargs)
+        self._connections = []
+
+    @property
+    def fullData(self) -> tuple[ndarray, ndarray]:
+        return self._fullX, self._fullY
+
+    def set_data(self, *args) -> None:
+        x, y = args if len(args) == 2 else args[0]
+        self._setFullData(x, y)
+
+    def set_xdata(self, x) -> None:
+        self._setFullData(x, self._fullY)
+
+    def set_ydata(self, y) -> None:
+        self._setFullData(self._fullX, y)
+
+    def _setFullData(self, x, y) -> None:
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        if x.shape == y.shape and x.size > 1 and np.any(x[1:] < x[:-1]):
+            order = np.argsort(x, kind='stable')
+            x, y = x[order], y[order]
+        self._fullX, self._fullY = x, y
+        if x.shape != y.shape:
+            # Mid-update of one coordinate, drawn once both match.
+            self._setDrawnData(x, y)
+            return
+        # Global extremes are always kept, so the data limits of the axes still span the full data.
+        finite = np.flatnonzero(np.isfinite(y))
+        self._extremes = np.unique([0, x.size - 1] + ([finite[y[finite].argmin()], finite[y[finite].argmax()]]
+                                                      if finite.size else [])) if x.size else np.zeros(0, dtype=int)
+        self._view = None
+        self.decimate()
+
+    def viewKey(self) -> tuple | None:
+        ax = self.axes
+        if ax is None:
+            return None
+        return (*ax.get_xlim(), ax.get_xscale(), max(int(ax.bbox.width), 1))
+
+    def decimate(self, *args) -> None:
+        """
+        ``decimate``
+        ------------
+
+        Chooses the samples drawn for the current view of the axes, only the full data is drawn before the line is
+        added to an axes.
+        """
+        x, y = self._fullX, self._fullY
+        key = self.viewKey()
+        if key is None or x.shape != y.shape or x.size == 0:
+            self._setDrawnData(x, y)
+            return
+        if key == self._view:
+            return
+        self._view = key
+        left, right, _, pixels = key
+        left, right = min(left, right), max(left, right)
+        start = max(np.searchsorted(x, left, side='left') - 1, 0)
+        stop = min(np.searchsorted(x, right, side='right') + 1, x.size)
+        if stop - start > 4 * pixels:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scaled = self.axes.xaxis.get_transform().transform(x[start:stop])
+            visible = decimationIndices(scaled, y[start:stop], pixels) + start
+        else:
+            visible = np.arange(start, stop)
+        indices = np.union1d(visible, self._extremes)
+        self._setDrawnData(x[indices], y[indices])
+
+    def _setDrawnData(self, x: ndarray, y: ndarray) -> None:
+        # Line2D.set_data sets each coordinate through the overridden setters.
+        Line2D.set_xdata(self, x)
+        Line2D.set_ydata(self, y)
+
+    def connect(self, ax: Axes) -> None:
+        """
+        ``connect``
+        -----------
+
+        Args:
+            ``ax`` (Axes): Axes the line was added to, re-decimated on each change of its x-limits.
+        """
+        self._connections = [(ax.callbacks, ax.callbacks.connect('xlim_changed', self.decimate))]
+        if ax.figure is not None and ax.figure.canvas is not None:
+            canvas = ax.figure.canvas
+            self._connections.append((canvas, canvas.mpl_connect('resize_event', self.decimate)))
+        self.decimate()
+
+    def draw(self, renderer) -> None:
+        # Axis scale changes emit no callback, check the view again before drawing.
+        self.decimate()
+        super().draw(renderer)
+
+    def remove(self) -> None:
+        for registry, cid in self._connections or []:
+            if hasattr(registry, 'mpl_disconnect'):
+                registry.mpl_disconnect(cid)
+            else:
+                registry.disconnect(cid)
+        self._connections = []
+        super().remove()
+
+
+def plotDecimated(ax: Axes, x, y, **kwargs) -> DecimatedLine2D:
+    """
+    ``plotDecimated``
+    -----------------
+
+    Args:
+        - ``ax`` (Axes): Axes to plot on.
+
+        - ``x`` (ArrayLike): x-coords of the line.
+
+        - ``y`` (ArrayLike): y-coords of the line.
+
+        - ``kwargs``: Line2D properties, as for ``ax.plot``.
+
+    Returns:
+        DecimatedLine2D: Line added to the axes.
+    """
+    kwargs.setdefault('linestyle', '-')
+    line = DecimatedLine2D(x, y, **kwargs)
+    ax.add_line(line)
+    ax.autoscale_view()
+    line.connect(ax)
+    return line
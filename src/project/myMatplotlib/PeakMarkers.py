@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy import ndarray
+from matplotlib.axes import Axes
+
+
+class PeakMarkers:
+    """
+    Peak markers and integration limit ticks of one spectra, drawn as two collections whose offsets are updated in
+    place, rather than one line artist for every peak and limit.
+    """
+
+    def __init__(self, ax: Axes, gid: str) -> None:
+        self.ax = ax
+        self.peaks = ax.scatter([], [], marker="x", color="black", s=3 ** 2, alpha=0.6, linewidths=1.0,
+                                gid=f"{gid}-p")
+        self.limits = ax.scatter([], [], marker=2, color="r", s=8 ** 2, linewidths=1.0, gid=f"{gid}-lim")
+        # Row of each peak's left limit in the limit offsets, its right limit is the following row.
+        self.limitRows: dict[float, int] = {}
+
+    def update(self, peaksX: ndarray, peaksY: ndarray, limitsX: dict[float, tuple[float]],
+               limitsY: dict[float, tuple[float]]) -> None:
+        """
+        ``update``
+        ----------
+
+        Args:
+            - ``peaksX`` (ndarray): x-coords of the peaks.
+
+            - ``peaksY`` (ndarray): y-coords of the peaks.
+
+            - ``limitsX`` (dict[float, tuple[float]]): Left and right x-coords of the limits of each peak.
+
+            - ``limitsY`` (dict[float, tuple[float]]): Left and right y-coords of the limits of each peak.
+        """
+        self.peaks.set_offsets(np.column_stack([peaksX, peaksY]).reshape(-1, 2))
+        limits = []
+        self.limitRows = {}
+        for x in peaksX:
+            if limitsX.get(x) is None or limitsY.get(x) is None:
+                continue
+            self.limitRows[x] = len(limits)
+            limits += list(zip(limitsX[x], limitsY[x]))
+        self.limits.set_offsets(np.array(limits, dtype=float).reshape(-1, 2))
+
+    def setPeakLimits(self, peakX: float, left: tuple[float] = None, right: tuple[float] = None) -> None:
+        """
+        ``setPeakLimits``
+        -----------------
+
+        Args:
+            - ``peakX`` (float): x-coord of the peak.
+
+            - ``left`` (tuple[float], optional): New (x, y) of the left limit. Defaults to None, unchanged.
+
+            - ``right`` (tuple[float], optional): New (x, y) of the right limit. Defaults to None, unchanged.
+        """
+        row = self.limitRows.get(peakX)
+        if row is None:
+            return
+        offsets = np.array(self.limits.get_offsets())
+        if left is not None:
+            offsets[row] = left
+        if right is not None:
+            offsets[row + 1] = right
+        self.limits.set_offsets(offsets)
+
+    @property
+    def axes(self) -> Axes | None:
+        return self.peaks.axes
+
+    def set_visible(self, visible: bool) -> None:
+        self.peaks.set_visible(visible)
+        self.limits.set_visible(visible)
+
+    def remove(self) -> None:
+        for collection in (self.peaks, self.limits):
+            if collection.axes is not None:
+                collection.remove()
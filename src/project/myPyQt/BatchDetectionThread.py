@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from project.spectra.BatchDetection import batchDetect
+
+
+class BatchDetectionThread(QThread):
+    """
+    Runs ``batchDetect`` off the GUI thread, so the window stays responsive while the process pool starts and works.
+    Each spectra's result is posted back through ``progress`` as it completes, and every result through ``detected``.
+    """
+
+    progress = pyqtSignal(str, dict)
+    detected = pyqtSignal(dict)
+
+    def __init__(self, spectra: list[str] | dict[str, np.ndarray], thresholds: float | dict[str, float] = 100,
+                 workers: int = None, parent=None) -> None:
+        super().__init__(parent)
+        self.spectra = spectra
+        self.thresholds = thresholds
+        self.workers = workers
+
+    def run(self) -> None:
+        results = batchDetect(self.spectra, self.thresholds, workers=self.workers,
+                              callback=lambda name, result: self.progress.emit(name, result))
+        self.detected.emit(results)
@@ -23,6 +23,7 @@ import pandas as pd
 
 from project.helpers.nearestNumber import nearestnumber
 from project.myMatplotlib.CustomFigureCanvas import FigureCanvas
+from project.myMatplotlib.DecimatedLine import plotDecimated
 from project.myPyQt.ExtendedTableModel import ExtendedQTableModel
 from project.myPyQt.InputSpectraDialog import InputSpectraDialog
 
@@ -220,13 +221,14 @@ class PeakWindow(QMainWindow):
                                  fontsize='small'
                                  )
 
-        self.peakAxis.plot(graphData[0],
-                           graphData[1],
-                           color=element.graphColour,
-                           linewidth=0.8,
-                           label=elementTitle,
-                           gid=f"{elementTitle}-PeakWindow"
-                           )
+        plotDecimated(self.peakAxis,
+                      graphData[0],
+                      graphData[1],
+                      color=element.graphColour,
+                      linewidth=0.8,
+                      label=elementTitle,
+                      gid=f"{elementTitle}-PeakWindow"
+                      )
 
         self.peakAxis.plot(peak[0],
                            peak[1],
@@ -260,10 +262,10 @@ class PeakWindow(QMainWindow):
                                   color=element.graphColour,
                                   linewidth=0.5,
                                   gid=f"PeakWindow-Threshold-{element.name}")
-        self.peakAxis.figure.canvas.draw()
+        self.peakAxis.figure.canvas.requestDraw()
 
     def togglePeakLimits(self) -> None:
         for line in self.peakAxis.get_lines():
             if "PeakWindow-lim" in line.get_gid():
                 line.set_visible(self.limitsCheck.isChecked())
-        self.peakAxis.figure.canvas.draw()
+        self.peakAxis.figure.canvas.requestDraw()
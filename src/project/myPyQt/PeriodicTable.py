@@ -1,4 +1,3 @@
-from os import listdir, fsdecode
 from PyQt6.QtWidgets import (
     QMainWindow,
     QLabel,
@@ -11,28 +10,12 @@ from PyQt6.QtCore import Qt, QModelIndex
 
 from project.myPyQt.PeriodicCell import ElementCell
 from project.myPyQt.SquareGrid import SquareGrid
-from project.helpers.resourcePath import resource_path
-from project.helpers.interpName import interpName, constructName
+from project.helpers.interpName import constructName
 from project.helpers.getWidgets import getLayoutWidgets
-from project.settings import params
+from project.spectra.SpectraCatalog import getCatalog
 
 from math import floor
 
-isotopes = []
-elements = []
-for file in listdir(resource_path(f"{params['dir_graphData']}")):
-    filename = fsdecode(file)
-    if ".csv" not in filename[-4:]:
-        continue
-    filename = filename[:-4]
-    info = interpName(filename)
-    if info['nNum'] is None:
-        elements.append(filename.removeprefix('element_'))
-    else:
-        isotopes.append(filename)
-
-pass
-
 periodic_table = {
     "H": {
         "symbol": "H",
@@ -1093,8 +1076,9 @@ class QtPeriodicTable(QMainWindow):
         if cell.nNum is None:
             return
 
-        spectraList: list[dict] = [interpName(item) for item in self.gui.spectraNames[1:]
-                                   if f'{str(cell.nNum).rjust(2, "0")}-{cell.symbol}' in item]
+        catalog = getCatalog()
+        spectraList: list[dict] = [catalog[name]
+                                   for name in catalog.names(nNum=str(cell.nNum).rjust(2, "0"), symbol=cell.symbol)]
 
         for item in [item for item in getLayoutWidgets(self.grid, ElementCell)
                      if item.objectName() == 'iso']:
@@ -22,9 +22,17 @@ params = {
     # Filepath for the distribution directory
     'dir_distribution': f"{path.dirname(__file__)}\\data\\Distribution Information\\",
     # Filepath for the Peak Information directory
-    'dir_peakInfo': f"{path.dirname(__file__)}\\data\\Peak Information\\",
+    'dir_peakInfo': f"{path.dirname(__file__)}\\data\\Peak information\\",
     # Filepath for the Peak Limit Information directory
     'dir_peakLimitInfo': f"{path.dirname(__file__)}\\data\\Peak Limit Information\\",
+    # Filepath for the peak database, peak tables and limits of every spectra
+    'file_peakDatabase': f"{path.dirname(__file__)}\\data\\Peak Database.sqlite",
+    # Filepath for the spectra catalog, manifest of the spectra in each graph data directory
+    'file_catalog': f"{path.dirname(__file__)}\\data\\Spectra Catalog.json",
+    # Filepath for the binary spectrum store, memory-mapped copies of the Graph Data
+    'dir_binaryData': f"{path.dirname(__file__)}\\data\\Binary Data\\",
+    # Filepath for the result cache, derived peak detection results of previously analysed spectra
+    'dir_resultCache': f"{path.dirname(__file__)}\\data\\Result Cache\\",
 
     # ? ------------------------------------------------------------------------------------------------------------
     # ?                                                Length
@@ -59,6 +67,34 @@ params = {
     'min_prominence': 0.1,
     # Height Threshold,
     'min_required_height': -99999999.0,
+    # Baseline method of the peak detector, one of 'peakutils', 'polynomial', 'als' or 'rolling_min'.
+    'baseline_method': 'polynomial',
+    # Number of evenly spaced points the decimated baseline methods are fitted on.
+    'baseline_points': 4096,
+    # Peak detection mode, 'full' searches the whole spectra at full resolution, 'pyramid' first finds candidate
+    # windows on a max decimation of the data and only searches those for maxima at full resolution. Minima are always
+    # searched at full resolution. Maxima and limits match the full search over the database, 1.57x faster.
+    'detection_mode': 'full',
+    # Number of points per block of the decimated level.
+    'pyramid_block': 64,
+    # Number of blocks added either side of each candidate block.
+    'pyramid_margin': 16,
+    # Spectra with fewer points are always searched at full resolution.
+    'pyramid_min_points': 100000,
+
+    # ? ------------------------------------------------------------------------------------------------------------
+    # ?                                                 Memory
+    # ? ------------------------------------------------------------------------------------------------------------
+    # Bytes of graph data the spectrum repository keeps in memory before evicting the least recently used spectra.
+    'spectrum_memory_budget': 512 * 1024 ** 2,
+    # Bytes of derived results the on-disk result cache keeps before evicting the least recently used, 0 disables it.
+    'result_cache_size': 256 * 1024 ** 2,
+    # Bytes of time of flight axes kept in memory, each with the energy axis it was converted from.
+    'axis_cache_budget': 128 * 1024 ** 2,
+    # Bytes of isotopes resampled onto the union grid of their element, kept for distribution editing.
+    'mixer_cache_budget': 256 * 1024 ** 2,
+    # Bytes of isotope cumulative integrals kept in memory, shared by every distribution of their element.
+    'integral_cache_budget': 128 * 1024 ** 2,
 
     # ? ------------------------------------------------------------------------------------------------------------
     # ?                                             Graph Settings
@@ -82,4 +118,6 @@ params = {
     'show_first_der': False,
     # Draws vertical lines where the graph has a point of inflection, zero second derivative, in blue
     'show_second_der': False,
+    # Prints the number of draws requested and executed by the main canvas after each draw.
+    'show_draw_stats': False,
 }
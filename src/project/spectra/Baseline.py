@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from numpy import ndarray
+from peakutils.baseline import baseline as peakutilsBaseline
+from scipy import sparse
+from scipy.ndimage import minimum_filter1d, uniform_filter1d
+from scipy.sparse.linalg import spsolve
+
+from project.settings import params
+
+
+def _decimate(size: int, points: int) -> ndarray:
+    # Evenly spaced indices over the data, always including both ends.
+    if points is None or size <= points:
+        return np.arange(size)
+    return np.unique(np.linspace(0, size - 1, points).round().astype(int))
+
+
+def polynomialBaseline(y: ndarray, deg: int = 5, points: int = None, max_it: int = 100,
+                       tol: float = 1e-3) -> ndarray:
+    """
+    ``polynomialBaseline``
+    ----------------------
+
+    The iterative polynomial fit of ``peakutils.baseline``, fitted on ``points`` evenly spaced samples of the data and
+    evaluated back at every point. Without ``points`` it is the full resolution fit.
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``deg`` (int, optional): Degree of the polynomial. Defaults to 5.
+
+        - ``points`` (int, optional): Number of samples the polynomial is fitted to. Defaults to None.
+
+        - ``max_it`` (int, optional): Maximum number of iterations. Defaults to 100.
+
+        - ``tol`` (float, optional): Relative change of the coefficients at which the fit stops. Defaults to 1e-3.
+
+    Returns:
+        ndarray: Baseline at every point of the data.
+    """
+    y = np.asarray(y, dtype=float)
+    if y.size == 0:
+        return y.copy()
+    if points is None:
+        return peakutilsBaseline(y, deg, max_it, tol)
+    order = deg + 1
+    coeffs = np.ones(order)
+    # Same domain as peakutils, so the coefficients and stopping condition match the full resolution fit.
+    x = np.linspace(0., math.pow(abs(y).max(), 1. / order), y.size)
+    indices = _decimate(y.size, points)
+    vander = np.vander(x[indices], order)
+    vanderPinv = np.linalg.pinv(vander)
+    sample = y[indices]
+    for _ in range(max_it):
+        coeffsNew = vanderPinv @ sample
+        if np.linalg.norm(coeffsNew - coeffs) / np.linalg.norm(coeffs) < tol:
+            break
+        coeffs = coeffsNew
+        sample = np.minimum(sample, vander @ coeffs)
+    return np.vander(x, order) @ coeffs
+
+
+def alsBaseline(y: ndarray, lam: float = 1e5, p: float = 0.01, niter: int = 10, points: int = 2048) -> ndarray:
+    """
+    ``alsBaseline``
+    ---------------
+
+    Asymmetric least squares smoothing (Eilers & Boelens), solved with sparse matrices on ``points`` evenly spaced
+    samples of the data and linearly interpolated back to every point.
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``lam`` (float, optional): Smoothness penalty. Defaults to 1e5.
+
+        - ``p`` (float, optional): Weight of points above the baseline. Defaults to 0.01.
+
+        - ``niter`` (int, optional): Number of reweighting iterations. Defaults to 10.
+
+        - ``points`` (int, optional): Number of samples the baseline is solved on. Defaults to 2048.
+
+    Returns:
+        ndarray: Baseline at every point of the data.
+    """
+    y = np.asarray(y, dtype=float)
+    if y.size < 3:
+        return y.copy()
+    indices = _decimate(y.size, points)
+    sample = y[indices]
+    size = sample.size
+    difference = sparse.diags([1, -2, 1], [0, -1, -2], shape=(size, size - 2))
+    penalty = lam * difference.dot(difference.transpose())
+    weights = np.ones(size)
+    for _ in range(niter):
+        solution = spsolve(sparse.csc_matrix(sparse.diags(weights) + penalty), weights * sample)
+        weights = p * (sample > solution) + (1 - p) * (sample < solution)
+    return np.interp(np.arange(y.size), indices, solution)
+
+
+def rollingMinimumBaseline(y: ndarray, window: int = None) -> ndarray:
+    """
+    ``rollingMinimumBaseline``
+    --------------------------
+
+    Rolling minimum of the data, smoothed by a rolling mean of the same window.
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``window`` (int, optional): Window size in points, defaults to 2% of the data.
+
+    Returns:
+        ndarray: Baseline at every point of the data.
+    """
+    y = np.asarray(y, dtype=float)
+    if y.size == 0:
+        return y.copy()
+    window = max(int(window or y.size // 50), 1)
+    return uniform_filter1d(minimum_filter1d(y, window, mode='nearest'), window, mode='nearest')
+
+
+baselineMethods: dict[str, Callable[..., ndarray]] = {
+    'peakutils': lambda y: polynomialBaseline(y, 5),
+    'polynomial': lambda y: polynomialBaseline(y, 5, points=params['baseline_points']),
+    'als': lambda y: alsBaseline(y, points=params['baseline_points']),
+    'rolling_min': rollingMinimumBaseline,
+}
+
+
+def getBaseline(y: ndarray, method: str = None) -> ndarray:
+    """
+    ``getBaseline``
+    ---------------
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``method`` (str, optional): Name of the method in ``baselineMethods``. Defaults to
+        params['baseline_method'].
+
+    Raises:
+        ``ValueError``: The method is not registered.
+
+    Returns:
+        ndarray: Baseline at every point of the data.
+    """
+    method = params['baseline_method'] if method is None else method
+    if method not in baselineMethods:
+        raise ValueError(f"Unknown baseline method '{method}', expected one of {list(baselineMethods)}")
+    return baselineMethods[method](y)
+
+
+if __name__ == '__main__':
+    # Benchmark of every method against the full resolution peakutils baseline.
+    import os
+    from project.helpers.resourcePath import resource_path
+    from project.spectra.SpectrumRepository import spectrumRepository
+
+    names = sorted(filename[:-4] for filename in os.listdir(resource_path(params['dir_graphData']))
+                   if filename.endswith('.csv'))[::25]
+    elapsed = {method: 0.0 for method in baselineMethods}
+    deviation = {method: [] for method in baselineMethods}
+    for name in names:
+        y = spectrumRepository.get(name)[:, 1]
+        if y.size == 0:
+            continue
+        reference = None
+        for method in baselineMethods:
+            t1 = perf_counter()
+            result = getBaseline(y, method)
+            elapsed[method] += perf_counter() - t1
+            reference = result if reference is None else reference
+            # RMS deviation from the peakutils baseline, relative to the range of the data.
+            deviation[method].append(np.sqrt(np.mean((result - reference) ** 2)) / max(np.ptp(y), 1e-300))
+    for method in baselineMethods:
+        print(f"{method:<12} Elapsed Time: {elapsed[method]:.3f}s - Median Relative RMS Deviation: "
+              f"{np.median(deviation[method]):.2e}")
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from pandas import DataFrame
+
+from project.helpers.interpName import interpName
+from project.settings import params
+from project.spectra.PeakDetection import PeakDetector
+from project.spectra.SpectrumRepository import spectrumRepository
+
+# Settings read by the peak detector, copied into every worker so they match this process.
+detectionParams: tuple[str] = ('min_prominence', 'detection_mode', 'pyramid_block', 'pyramid_margin',
+                               'pyramid_min_points')
+
+_sharedMemory: shared_memory.SharedMemory = None
+
+
+def getThreshold(name: str) -> float:
+    """
+    ``getThreshold``
+    ----------------
+
+    Args:
+        - ``name`` (str): Spectra name.
+
+    Returns:
+        float: Threshold of the spectra's maxima, from ``params['threshold_exceptions']`` for its element and mode.
+        Defaults to 100.
+    """
+    info = interpName(name)
+    threshold = params['threshold_exceptions'].get(info['symbol'], {'n-tot': 100, 'n-g': 100})
+    return threshold[info['mode']] if isinstance(threshold, dict) else threshold[0 if info['mode'] == 'n-tot' else 1]
+
+
+def detectPeaks(name: str, data: np.ndarray, threshold: float = 100,
+                smoothCoeff: float = 12.0) -> dict[str, np.ndarray]:
+    """
+    ``detectPeaks``
+    ---------------
+
+    Args:
+        - ``name`` (str): Spectra name.
+
+        - ``data`` (np.ndarray): (N, 2) graph data, sorted by x.
+
+        - ``threshold`` (float, optional): Threshold of the maxima. Defaults to 100.
+
+        - ``smoothCoeff`` (float, optional): Smoothing coefficient of the peak detector. Defaults to 12.0.
+
+    Returns:
+        dict[str, np.ndarray]: (2, P) coordinates of the 'maxima' and 'minima', (P, 2) left and right x limit of
+        each of them as 'maxLimits' and 'minLimits', and the y-coords of those limits as 'maxLimitsY' and
+        'minLimitsY', NaN where a peak has no limits.
+    """
+    result = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        peakDetector = PeakDetector(name, DataFrame(data), smoothCoeff=smoothCoeff)
+        for which, peaks in [('max', lambda: peakDetector.maxima(threshold)), ('min', peakDetector.minima)]:
+            peaksX, peaksY = peaks()
+            peakDetector.definePeakLimits(which)
+            result[f"{which}ima"] = np.array((peaksX, peaksY), dtype=float).reshape(2, -1)
+            for key, limits in [('Limits', getattr(peakDetector, f"{which}PeakLimitsX")),
+                                ('LimitsY', getattr(peakDetector, f"{which}PeakLimitsY"))]:
+                result[f"{which}{key}"] = np.array([limits.get(peakX, (np.nan, np.nan)) for peakX in peaksX],
+                                                   dtype=float).reshape(-1, 2)
+    return result
+
+
+def _attach(sharedName: str, settings: dict) -> None:
+    # Worker initializer, attaches to the shared graph data once and takes on the settings of the parent process.
+    global _sharedMemory
+    _sharedMemory = shared_memory.SharedMemory(name=sharedName)
+    params.update(settings)
+
+
+def _detectShared(name: str, offset: int, rows: int, threshold: float,
+                  smoothCoeff: float) -> tuple[str, dict[str, np.ndarray]]:
+    data = np.ndarray((rows, 2), dtype=np.float64, buffer=_sharedMemory.buf, offset=offset)
+    return name, detectPeaks(name, data, threshold, smoothCoeff)
+
+
+def batchDetect(spectra: list[str] | dict[str, np.ndarray], thresholds: float | dict[str, float] = 100,
+                smoothCoeff: float = 12.0, workers: int = None,
+                callback: Callable[[str, dict[str, np.ndarray]], None] = None) -> dict[str, dict[str, np.ndarray]]:
+    """
+    ``batchDetect``
+    ---------------
+
+    Finds the maxima, minima and their limits of many spectra across a process pool. The graph data of every spectra
+    is placed once in a single shared memory block which each worker reads in place, spectra are handed out largest
+    first so the longest ones do not finish last.
+
+    Args:
+        - ``spectra`` (list[str] | dict[str, np.ndarray]): Spectra names, loaded from the spectrum repository, or
+        (N, 2) graph data keyed by name.
+
+        - ``thresholds`` (float | dict[str, float], optional): Threshold of the maxima, for all or for each spectra.
+        Defaults to 100.
+
+        - ``smoothCoeff`` (float, optional): Smoothing coefficient of the peak detector. Defaults to 12.0.
+
+        - ``workers`` (int, optional): Number of processes, 1 to run in this process. Defaults to the number of CPUs.
+
+        - ``callback`` (Callable[[str, dict[str, np.ndarray]], None], optional): Called in this process with the name
+        and result of each spectra as it completes, i.e. to report progress. Defaults to None.
+
+    Returns:
+        dict[str, dict[str, np.ndarray]]: Result of ``detectPeaks`` keyed by spectra name, in the given order. Empty
+        spectra are omitted.
+    """
+    if not isinstance(spectra, dict):
+        spectra = {name: spectrumRepository.get(name) for name in spectra}
+    spectra = {name: np.asarray(data, dtype=np.float64) for name, data in spectra.items() if len(data) != 0}
+    if not isinstance(thresholds, dict):
+        thresholds = dict.fromkeys(spectra, thresholds)
+    order = sorted(spectra, key=lambda name: spectra[name].shape[0], reverse=True)
+    workers = min(workers or os.cpu_count() or 1, len(order))
+
+    results = {}
+    if workers <= 1:
+        for name in order:
+            data = spectra[name]
+            results[name] = detectPeaks(name, data[np.argsort(data[:, 0], kind='stable')],
+                                        thresholds.get(name, 100), smoothCoeff)
+            if callback is not None:
+                callback(name, results[name])
+        return {name: results[name] for name in spectra}
+
+    offsets = np.cumsum([0] + [spectra[name].nbytes for name in order])
+    sharedMemory = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+    try:
+        for name, offset in zip(order, offsets):
+            data = spectra[name]
+            shared = np.ndarray(data.shape, dtype=np.float64, buffer=sharedMemory.buf, offset=offset)
+            shared[:] = data[np.argsort(data[:, 0], kind='stable')]
+        del shared
+        settings = {key: params[key] for key in detectionParams}
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(sharedMemory.name, settings)) as executor:
+            futures = [executor.submit(_detectShared, name, int(offset), spectra[name].shape[0],
+                                       thresholds.get(name, 100), smoothCoeff)
+                       for name, offset in zip(order, offsets)]
+            for future in as_completed(futures):
+                name, result = future.result()
+                results[name] = result
+                if callback is not None:
+                    callback(name, result)
+    finally:
+        sharedMemory.close()
+        sharedMemory.unlink()
+    return {name: results[name] for name in spectra}
+
+
+if __name__ == '__main__':
+    # Benchmark of the process pool against detecting every spectra of the database in turn.
+    from project.spectra.SpectraCatalog import getCatalog
+
+    names = [name for name, info in getCatalog().spectra.items() if info['rows']]
+    for name in names:
+        spectrumRepository.get(name)
+    t1 = perf_counter()
+    batchDetect(names, workers=1)
+    t2 = perf_counter()
+    batchDetect(names)
+    t3 = perf_counter()
+    print(f"{len(names)} Spectra - Serial Elapsed Time: {t2 - t1:.3f}s - Pool Elapsed Time ({os.cpu_count()} "
+          f"Processes): {t3 - t2:.3f}s")
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from decimal import Decimal, localcontext
+
+import numpy as np
+from numpy import ndarray
+
+from project.settings import params
+
+NEUTRON_MASS = Decimal('1.68e-27')
+ELECTRON_CHARGE = Decimal('1.60e-19')
+
+# Veltkamp splitting factor, 2^27 + 1, splits a float64 into two halves whose products are exact.
+_SPLITTER = 134217729.0
+
+
+def _flightCoefficient(length: float) -> tuple[float, float]:
+    # length * 1e6 * sqrt(m / 2e) in 50 digit precision, as an unevaluated sum of two floats.
+    with localcontext() as context:
+        context.prec = 50
+        coefficient = Decimal(str(length)) * Decimal('1e6') * (Decimal('0.5') * NEUTRON_MASS / ELECTRON_CHARGE).sqrt()
+        high = float(coefficient)
+        low = float(coefficient - Decimal(high))
+    return high, low
+
+
+def _productError(a: ndarray, b: ndarray, product: ndarray) -> ndarray:
+    # Rounding error of a * b, such that a * b == product + error exactly (Dekker).
+    aSplit = _SPLITTER * a
+    aHigh = aSplit - (aSplit - a)
+    aLow = a - aHigh
+    bSplit = _SPLITTER * b
+    bHigh = bSplit - (bSplit - b)
+    bLow = b - bHigh
+    return ((aHigh * bHigh - product) + aHigh * bLow + aLow * bHigh) + aLow * bLow
+
+
+def energyToTOF(energy: float | ndarray | list[float], length: float) -> float | ndarray:
+    """
+    ``energyToTOF``
+    ---------------
+
+    Maps energies to times of flight, ``length * 1e6 * sqrt(m / (2 * e * energy))``. The coefficient and the square
+    root are carried in double-float arithmetic, so results are correctly rounded in all but the rarest ties, as a 50
+    digit ``Decimal`` evaluation would be.
+
+    Args:
+        - ``energy`` (float | ndarray | list[float]): Energies (eV).
+
+        - ``length`` (float): Flight path length (m).
+
+    Returns:
+        float | ndarray: Times of flight (us), a float if given a scalar.
+    """
+    x = np.asarray(energy, dtype=np.float64)
+    high, low = _flightCoefficient(length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = np.sqrt(x)
+        # sqrt(x) ~ root + rootLow
+        rootLow = ((x - root * root) - _productError(root, root, root * root)) / (2 * root)
+        quotient = high / root
+        remainder = (high - quotient * root) - _productError(quotient, root, quotient * root)
+        tof = quotient + (remainder + low - quotient * rootLow) / root
+    tof = np.where(np.isfinite(tof) | ~np.isfinite(quotient), tof, quotient)
+    return float(tof) if tof.ndim == 0 else tof
+
+
+def tofToEnergy(tof: float | ndarray | list[float], length: float) -> float | ndarray:
+    """
+    ``tofToEnergy``
+    ---------------
+
+    Maps times of flight to energies, the inverse of ``energyToTOF``.
+
+    Args:
+        - ``tof`` (float | ndarray | list[float]): Times of flight (us).
+
+        - ``length`` (float): Flight path length (m).
+
+    Returns:
+        float | ndarray: Energies (eV), a float if given a scalar.
+    """
+    t = np.asarray(tof, dtype=np.float64)
+    high, low = _flightCoefficient(length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quotient = high / t
+        remainder = (high - quotient * t) - _productError(quotient, t, quotient * t)
+        # coefficient / t ~ quotient + quotientLow
+        quotientLow = (remainder + low) / t
+        square = quotient * quotient
+        energy = square + (_productError(quotient, quotient, square) + 2 * quotient * quotientLow)
+    energy = np.where(np.isfinite(energy) | ~np.isfinite(square), energy, square)
+    return float(energy) if energy.ndim == 0 else energy
+
+
+def rescaleTOF(tof: float | ndarray | list[float], oldLength: float, newLength: float) -> float | ndarray:
+    """
+    ``rescaleTOF``
+    --------------
+
+    Times of flight scale linearly with the flight path length, so they are rescaled directly rather than converted
+    back to energy and out again.
+
+    Args:
+        - ``tof`` (float | ndarray | list[float]): Times of flight (us) over the old length.
+
+        - ``oldLength`` (float): Flight path length (m) the times were converted with.
+
+        - ``newLength`` (float): New flight path length (m).
+
+    Returns:
+        float | ndarray: Times of flight (us) over the new length.
+    """
+    t = np.asarray(tof, dtype=np.float64)
+    with localcontext() as context:
+        context.prec = 50
+        ratio = Decimal(str(newLength)) / Decimal(str(oldLength))
+        high = float(ratio)
+        low = float(ratio - Decimal(high))
+    product = t * high
+    rescaled = product + (_productError(t, np.float64(high), product) + t * low)
+    return float(rescaled) if rescaled.ndim == 0 else rescaled
+
+
+class AxisCache:
+    """
+    Process-wide cache of time of flight axes, keyed by spectra and flight path length. Each entry keeps the energy
+    axis it was converted from, so an axis is only reused for the same data. Axes are handed out read-only and evicted
+    in least recently used order once the resident bytes exceed the budget.
+    """
+
+    def __init__(self, budget: int = params['axis_cache_budget']) -> None:
+        self.budget: int = budget
+        self.residentBytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._axes: OrderedDict[tuple[str, float], tuple[ndarray, ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, energy: ndarray | list[float], length: float) -> ndarray:
+        """
+        ``get``
+        -------
+
+        Args:
+            - ``name`` (str): Spectra name.
+
+            - ``energy`` (ndarray | list[float]): Energy axis of the spectra.
+
+            - ``length`` (float): Flight path length (m).
+
+        Returns:
+            ndarray: Read-only time of flight axis, see ``energyToTOF``.
+        """
+        energy = np.asarray(energy, dtype=np.float64)
+        key = (name, float(length))
+        with self._lock:
+            entry = self._axes.get(key)
+            if entry is not None and (entry[0] is energy or np.array_equal(entry[0], energy)):
+                self._axes.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        source = energy.copy()
+        tof = energyToTOF(source, length)
+        source.flags.writeable = False
+        tof.flags.writeable = False
+        with self._lock:
+            previous = self._axes.pop(key, None)
+            if previous is not None:
+                self.residentBytes -= previous[0].nbytes + previous[1].nbytes
+            if source.nbytes + tof.nbytes <= self.budget:
+                self._axes[key] = (source, tof)
+                self.residentBytes += source.nbytes + tof.nbytes
+                self._evict()
+        return tof
+
+    def invalidate(self, name: str = None) -> None:
+        with self._lock:
+            for key in [key for key in self._axes if name is None or key[0] == name]:
+                source, tof = self._axes.pop(key)
+                self.residentBytes -= source.nbytes + tof.nbytes
+
+    def _evict(self) -> None:
+        while self.residentBytes > self.budget and self._axes:
+            _, (source, tof) = self._axes.popitem(last=False)
+            self.residentBytes -= source.nbytes + tof.nbytes
+
+    def stats(self) -> dict[str, int]:
+        """
+        ``stats``
+        ---------
+
+        Returns:
+            dict[str, int]: Number of resident axes, resident bytes, budget, hits and misses.
+        """
+        with self._lock:
+            return {'axes': len(self._axes),
+                    'residentBytes': self.residentBytes,
+                    'budget': self.budget,
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+axisCache = AxisCache()
+
+
+def convertedAxis(name: str, energy: ndarray | list[float], length: float) -> ndarray:
+    """
+    ``convertedAxis``
+    -----------------
+
+    Args:
+        - ``name`` (str): Spectra name.
+
+        - ``energy`` (ndarray | list[float]): Energy axis of the spectra.
+
+        - ``length`` (float): Flight path length (m).
+
+    Returns:
+        ndarray: Read-only time of flight axis of the spectra, from the shared axis cache.
+    """
+    return axisCache.get(name, energy, length)
+
+
+if __name__ == '__main__':
+    # Precision against a 60 digit Decimal evaluation of the exact binary inputs, and speed against mapping each
+    # point in turn.
+    from time import perf_counter
+
+    rng = np.random.default_rng(0)
+    energy = np.sort(10 ** rng.uniform(-5, 7, 1_000_000))
+    length = params['length']['n-tot']
+    sample = energy[::1000]
+    with localcontext() as context:
+        context.prec = 60
+        coefficient = Decimal(str(length)) * Decimal('1e6') * (Decimal('0.5') * NEUTRON_MASS / ELECTRON_CHARGE).sqrt()
+        expectedTof = np.array([float(coefficient / Decimal(x).sqrt()) for x in sample])
+        expectedEnergy = np.array([float(coefficient ** 2 / Decimal(t) ** 2) for t in expectedTof])
+    naive = length * 1e6 * (0.5 * 1.68e-27 / (sample * 1.60e-19)) ** 0.5
+    print(f"energyToTOF - {np.sum(energyToTOF(sample, length) != expectedTof)} / {sample.size} not correctly rounded, "
+          f"{np.sum(naive != expectedTof)} mapping each point")
+    print(f"tofToEnergy - {np.sum(tofToEnergy(expectedTof, length) != expectedEnergy)} / {sample.size} not correctly "
+          f"rounded")
+
+    t1 = perf_counter()
+    list(map(lambda x: length * 1e6 * (0.5 * 1.68e-27 / (x * 1.60e-19)) ** 0.5, energy))
+    t2 = perf_counter()
+    energyToTOF(energy, length)
+    t3 = perf_counter()
+    convertedAxis('benchmark', energy, length)
+    t4 = perf_counter()
+    convertedAxis('benchmark', energy, length)
+    t5 = perf_counter()
+    print(f"{energy.size} Points - Map Elapsed Time: {t2 - t1:.3f}s - Vectorised Elapsed Time: {t3 - t2:.3f}s - "
+          f"Cached Elapsed Time: {t5 - t4:.3f}s")
@@ -1,73 +1,167 @@
 from __future__ import annotations
+import threading
+from collections import OrderedDict
 from pyparsing import Literal
 
-import concurrent.futures
-from pandas import DataFrame, read_csv
-from scipy.interpolate import interp1d
-from numpy import arange
+import numpy as np
+from numpy import ndarray
 
-from project.helpers.integration import integrate_simps
-from project.helpers.resourcePath import resource_path
+from project.helpers.integration import CumulativeIntegral
 from project.settings import params
+from project.spectra.Conversion import convertedAxis
+from project.spectra.SpectrumRepository import spectrumRepository
+
+
+class IntegralCache:
+    """
+    Process-wide cache of isotope cumulative integrals, keyed by graph data directory, spectra, axis and flight path
+    length. Integrals are evicted in least recently used order once their resident bytes exceed the budget, and
+    dropped whenever the spectrum repository invalidates their spectra.
+    """
+
+    def __init__(self, budget: int = params['integral_cache_budget']) -> None:
+        self.budget: int = budget
+        self.residentBytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._integrals: OrderedDict[tuple, CumulativeIntegral] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, spectraName: str, directory: str = params['dir_graphData'], isToF: bool = False,
+            length: float = None) -> CumulativeIntegral:
+        """
+        ``get``
+        -------
+
+        Args:
+            - ``spectraName`` (str): Name of the isotope spectra.
+
+            - ``directory`` (str, optional): Directory of the source CSV file. Defaults to params['dir_graphData'].
+
+            - ``isToF`` (bool, optional): Whether to integrate over time of flight. Defaults to False.
+
+            - ``length`` (float, optional): Flight length of the time of flight axis. Defaults to None.
+
+        Returns:
+            CumulativeIntegral: Integral index of the isotope, shared by every distribution of its element.
+        """
+        key = (directory, spectraName, isToF, length if isToF else None)
+        with self._lock:
+            integral = self._integrals.get(key)
+            if integral is not None:
+                self._integrals.move_to_end(key)
+                self.hits += 1
+                return integral
+            self.misses += 1
+        data = spectrumRepository.get(spectraName, directory)
+        x = data[:, 0]
+        if isToF:
+            x = convertedAxis(spectraName, x, length)
+        integral = CumulativeIntegral(x, data[:, 1])
+        with self._lock:
+            if key not in self._integrals and integral.nbytes <= self.budget:
+                self._integrals[key] = integral
+                self.residentBytes += integral.nbytes
+                while self.residentBytes > self.budget:
+                    _, evicted = self._integrals.popitem(last=False)
+                    self.residentBytes -= evicted.nbytes
+        return integral
+
+    def invalidate(self, name: str = None) -> None:
+        with self._lock:
+            for key in [key for key in self._integrals if name is None or key[1] == name]:
+                self.residentBytes -= self._integrals.pop(key).nbytes
+
+    def stats(self) -> dict[str, int]:
+        """
+        ``stats``
+        ---------
+
+        Returns:
+            dict[str, int]: Number of resident integrals, resident bytes, budget, hits and misses.
+        """
+        with self._lock:
+            return {'integrals': len(self._integrals),
+                    'residentBytes': self.residentBytes,
+                    'budget': self.budget,
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+integralCache = IntegralCache()
+spectrumRepository.onInvalidate(integralCache.invalidate)
 
 
 class IsotopeIntegrator:
+    """
+    Isotope contribution engine for element spectra. Each isotope's graph data is loaded once and indexed by its
+    cumulative integral, peak integrals for every isotope over every peak window are then evaluated together as an
+    (isotopes x peaks) matrix scaled by the distribution weights.
+    """
+
     def __init__(self, parent):
         self.parent = parent
         self.name = parent.name
         self.distributions = parent.distributions
         self.plotType = parent.plotType
         self.isToF = parent.isToF
-        self.isoGraphData: dict = self._load_and_preprocess_data()
-
-    def _load_and_preprocess_data(self) -> dict[str: DataFrame]:
-        # Load and preprocess data for all isotopes here
-        # Store the preprocessed data in a dictionary or class variable
-        isoTempGraphData = {
-            name: read_csv(
-                resource_path(f"{params['dir_graphData']}{name}_{self.name.split('_')[-1]}.csv"),
-                names=['x', 'y'],
-                header=None)
-            for name, dist in self.distributions.items() if dist != 0}
-        if self.isToF:
-            isoGraphData = {}
-            for name, data in isoTempGraphData.items():
-                data['x'] = self.parent.energyToTOF(data['x'], length=self.parent.length)
-                data.sort_values('x', ignore_index=True, inplace=True)
-                isoGraphData[name] = data
-        else:
-            isoGraphData = isoTempGraphData
-        return isoGraphData
-
-    def _integrate_isotope(self, name, left_limit, right_limit, which):
-        graph_data = self.isoGraphData[name]
-        if left_limit == right_limit:
-            return '[]', 0
-
-        graph_data_interp = interp1d(graph_data.iloc[:, 0], graph_data.iloc[:, 1])
-        x_range = arange(left_limit, right_limit, (right_limit - left_limit) / 100)
-
-        integral = integrate_simps(DataFrame(list(zip(x_range, graph_data_interp(x_range))),
-                                             columns=['x', 'y']),
-                                   left_limit,
-                                   right_limit,
-                                   which) * self.distributions[name]
-
-        return f"['{name}_{self.plotType}']", integral
+        self.graphDataDir = parent.graphDataDir
+        self.isotopes: list[str] = [name for name, dist in self.distributions.items() if dist != 0]
+        self.weights: ndarray = np.array([self.distributions[name] for name in self.isotopes], dtype=float)
+        self.isoIntegrals: dict[str, CumulativeIntegral] = self._load_and_preprocess_data()
+
+    def _load_and_preprocess_data(self) -> dict[str, CumulativeIntegral]:
+        # Each isotope of the same plot type is indexed once, so a new distribution only changes the weights.
+        length = self.parent.flightLength() if self.isToF else None
+        return {name: integralCache.get(f"{name}_{self.name.split('_')[-1]}", self.graphDataDir, self.isToF, length)
+                for name in self.isotopes}
+
+    def integral_matrix(self, limits: ndarray | list[tuple[float]],
+                        which: Literal['max', 'min'] = 'max') -> ndarray:
+        """
+        ``integral_matrix``
+        -------------------
+
+        Args:
+            - ``limits`` (ndarray | list[tuple[float]]): (P, 2) array of the left and right limit of each peak.
+
+            - ``which`` (Literal['max', 'min'], optional): Whether integrating maxima or minima. Defaults to 'max'.
+
+        Returns:
+            ndarray: (isotopes x peaks) matrix of each isotope's weighted contribution to each peak, rows ordered as
+            ``self.isotopes``.
+        """
+        limits = np.array(limits, dtype=float).reshape(-1, 2)
+        matrix = np.zeros((len(self.isotopes), limits.shape[0]))
+        for i, name in enumerate(self.isotopes):
+            matrix[i] = self.isoIntegrals[name].integrate(limits[:, 0], limits[:, 1], which)
+        return matrix * self.weights[:, np.newaxis]
 
     def peak_integral(self, left_limit: float, right_limit: float,
                       which: Literal['max', 'min'] = 'max') -> tuple[float, str]:
-        if not hasattr(self, 'isoGraphData'):
-            self._load_and_preprocess_data()
+        totals, relevant_isotopes = self.peak_integrals([(left_limit, right_limit)], which)
+        return (float(totals[0]), relevant_isotopes[0])
+
+    def peak_integrals(self, limits: ndarray | list[tuple[float]],
+                       which: Literal['max', 'min'] = 'max') -> tuple[ndarray, list[str]]:
+        """
+        ``peak_integrals``
+        ------------------
+
+        Integrates every isotope over every peak window using the isotope data loaded once for this session.
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            integrals = executor.map(self._integrate_isotope, self.isoGraphData.keys(),
-                                     [left_limit] * len(self.isoGraphData),
-                                     [right_limit] * len(self.isoGraphData),
-                                     [which] * len(self.isoGraphData))
+        Args:
+            - ``limits`` (ndarray | list[tuple[float]]): (P, 2) array of the left and right limit of each peak.
 
-        integrals_dict = dict(integrals)
-        total_integral = sum(integrals_dict.values())
-        relevant_isotope = f"{max(integrals_dict, key=integrals_dict.get)}"
+            - ``which`` (Literal['max', 'min'], optional): Whether integrating maxima or minima. Defaults to 'max'.
 
-        return (total_integral, relevant_isotope)
+        Returns:
+            tuple[ndarray, list[str]]: Total integral of each peak, and the isotope contributing most to each peak.
+        """
+        limits = np.array(limits, dtype=float).reshape(-1, 2)
+        matrix = self.integral_matrix(limits, which)
+        totals = matrix.sum(axis=0)
+        relevant_isotopes = [f"['{self.isotopes[i]}_{self.plotType}']" for i in matrix.argmax(axis=0)]
+        for i in np.where(limits[:, 0] == limits[:, 1])[0]:
+            relevant_isotopes[i] = '[]'
+        return totals, relevant_isotopes
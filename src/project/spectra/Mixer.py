@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from numpy import ndarray
+from pandas import DataFrame
+
+from project.helpers.getSpacedElements import getSpacedElements
+from project.settings import params
+from project.spectra.PeakDetection import PeakDetector
+from project.spectra.SpectrumRepository import spectrumRepository
+
+
+def isotopeSpectraName(name: str, isotope: str, isCompound: bool = False) -> str:
+    # Compounds are weighted over whole spectra names, elements over isotopes of their own plot type.
+    return isotope if isCompound else f"{isotope}_{'n-tot' if 'n-tot' in name else 'n-g'}"
+
+
+def unionGrid(spectra: dict[str, ndarray], threshold: float = 100) -> ndarray:
+    """
+    ``unionGrid``
+    -------------
+
+    Args:
+        - ``spectra`` (dict[str, ndarray]): (N, 2) graph data of each spectra, sorted by x.
+
+        - ``threshold`` (float, optional): Threshold of the maxima kept on the grid. Defaults to 100.
+
+    Returns:
+        ndarray: Sorted union of every other point of each spectra, along with the x-coords of all their maxima and
+        minima so no peak is lost when resampling onto the grid.
+    """
+    points = []
+    for name, data in spectra.items():
+        peakDetector = PeakDetector(name, DataFrame(data))
+        points += [peakDetector.maxima(threshold)[0], peakDetector.minima()[0]]
+        points.append(getSpacedElements(data[:, 0], data.shape[0] // 2))
+    return np.unique(np.concatenate(points)) if points else np.zeros(0)
+
+
+class DistributionMixer:
+    """
+    Weighted sum engine over the isotopes of an element, or the elements of a compound. Every isotope is resampled
+    once onto the union grid of them all, after which the graph data of any distribution is a single matrix-vector
+    product of the weights and the resampled isotopes.
+    """
+
+    def __init__(self, name: str, isotopes: list[str], isCompound: bool = False, threshold: float = 100) -> None:
+        self.name: str = name
+        self.isotopes: list[str] = []
+        spectra = {}
+        for isotope in isotopes:
+            data = spectrumRepository.get(isotopeSpectraName(name, isotope, isCompound))
+            if data.shape[0] == 0:
+                continue
+            self.isotopes.append(isotope)
+            spectra[isotope] = data[np.argsort(data[:, 0], kind='stable')]
+        # Energy range of each isotope, the grid of a distribution spans only the isotopes it weights.
+        self.ranges: ndarray = np.array([[data[0, 0], data[-1, 0]] for data in spectra.values()]).reshape(-1, 2)
+        self.grid: ndarray = unionGrid(spectra, threshold)
+        self.grid.flags.writeable = False
+        self.matrix: ndarray = np.zeros((len(self.isotopes), self.grid.size))
+        for i, data in enumerate(spectra.values()):
+            self.matrix[i] = np.interp(self.grid, data[:, 0], data[:, 1])
+        self.matrix.flags.writeable = False
+
+    @property
+    def nbytes(self) -> int:
+        return self.grid.nbytes + self.matrix.nbytes
+
+    def weights(self, distributions: dict[str, float]) -> ndarray:
+        """
+        ``weights``
+        -----------
+
+        Args:
+            ``distributions`` (dict[str, float]): Weight of each isotope, those missing are weighted 0.
+
+        Returns:
+            ndarray: Weights ordered as ``self.isotopes``.
+        """
+        return np.array([distributions.get(isotope, 0) for isotope in self.isotopes], dtype=float)
+
+    def mix(self, distributions: dict[str, float]) -> ndarray:
+        """
+        ``mix``
+        -------
+
+        Args:
+            ``distributions`` (dict[str, float]): Weight of each isotope.
+
+        Returns:
+            ndarray: Weighted sum of the isotopes at every point of ``self.grid``.
+        """
+        return self.weights(distributions) @ self.matrix
+
+    def graphData(self, distributions: dict[str, float]) -> ndarray:
+        """
+        ``graphData``
+        -------------
+
+        Args:
+            ``distributions`` (dict[str, float]): Weight of each isotope.
+
+        Returns:
+            ndarray: (N, 2) graph data of the distribution, over the grid points within the range of the isotopes with
+            a non-zero weight.
+        """
+        weights = self.weights(distributions)
+        active = weights != 0
+        if not active.any():
+            return np.zeros((0, 2))
+        lo, hi = self.ranges[active, 0].min(), self.ranges[active, 1].max()
+        start, stop = np.searchsorted(self.grid, lo, side='left'), np.searchsorted(self.grid, hi, side='right')
+        return np.column_stack([self.grid[start:stop], weights[active] @ self.matrix[active, start:stop]])
+
+
+class MixerCache:
+    """
+    Process-wide cache of distribution mixers, keyed by spectra, isotopes and threshold. Mixers are evicted in least
+    recently used order once their resident bytes exceed the budget.
+    """
+
+    def __init__(self, budget: int = params['mixer_cache_budget']) -> None:
+        self.budget: int = budget
+        self.residentBytes: int = 0
+        self._mixers: OrderedDict[tuple, DistributionMixer] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, isotopes: list[str], isCompound: bool = False,
+            threshold: float = 100) -> DistributionMixer:
+        """
+        ``get``
+        -------
+
+        Args:
+            - ``name`` (str): Spectra name.
+
+            - ``isotopes`` (list[str]): Isotopes, or elements of a compound, to mix.
+
+            - ``isCompound`` (bool, optional): Whether the spectra is a compound. Defaults to False.
+
+            - ``threshold`` (float, optional): Threshold of the maxima kept on the grid. Defaults to 100.
+
+        Returns:
+            DistributionMixer: Mixer of the spectra, created on first use.
+        """
+        key = (name, tuple(isotopes), isCompound, threshold)
+        with self._lock:
+            mixer = self._mixers.get(key)
+            if mixer is not None:
+                self._mixers.move_to_end(key)
+                return mixer
+        mixer = DistributionMixer(name, isotopes, isCompound, threshold)
+        with self._lock:
+            if key not in self._mixers and mixer.nbytes <= self.budget:
+                self._mixers[key] = mixer
+                self.residentBytes += mixer.nbytes
+                while self.residentBytes > self.budget:
+                    _, evicted = self._mixers.popitem(last=False)
+                    self.residentBytes -= evicted.nbytes
+        return mixer
+
+    def invalidate(self, name: str = None) -> None:
+        with self._lock:
+            for key in [key for key in self._mixers if name is None or key[0] == name]:
+                self.residentBytes -= self._mixers.pop(key).nbytes
+
+
+mixerCache = MixerCache()
@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from time import perf_counter
+
+from pandas import DataFrame, read_csv
+from pandas.errors import EmptyDataError
+from pyparsing import Literal
+
+from project.helpers.resourcePath import resource_path
+from project.settings import params
+
+
+def peakKey(name: str) -> str:
+    """
+    ``peakKey``
+    -----------
+
+    Peak tables and limits are stored without the 'element_' prefix of the spectra name.
+
+    Args:
+        ``name`` (str): Spectra name, i.e. 'element_29-Cu_n-g'.
+
+    Returns:
+        str: Key of the spectra within the peak database, i.e. '29-Cu_n-g'.
+    """
+    return name.replace('element_', '')
+
+
+def tableColumns(isToF: bool) -> list[str]:
+    """
+    ``tableColumns``
+    ----------------
+
+    Args:
+        ``isToF`` (bool): Whether the table is of the time of flight domain.
+
+    Returns:
+        list[str]: Column headers of a peak table.
+    """
+    return ["Rank by Integral",
+            "TOF (us)" if isToF else "Energy (eV)",
+            "Rank by " + ("TOF" if isToF else "Energy"),
+            "Integral",
+            "Peak Width",
+            "Rank by Peak Width",
+            "Peak Height",
+            "Rank by Peak Height",
+            "Relevant Isotope"]
+
+
+class PeakDatabase:
+    """
+    Single SQLite file holding the peak tables and peak limits of every spectra in the database. Tables are keyed by
+    (spectrum, domain, which) and stored clustered on that key, so retrieving a spectra's table is a single index seek.
+    Peaks are additionally indexed by position, allowing range queries by energy or time of flight across all spectra.
+    """
+
+    schema: str = """
+        CREATE TABLE IF NOT EXISTS peakTables (
+            spectrum TEXT NOT NULL,
+            domain TEXT NOT NULL,
+            which TEXT NOT NULL,
+            PRIMARY KEY (spectrum, domain, which)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS peaks (
+            spectrum TEXT NOT NULL,
+            domain TEXT NOT NULL,
+            which TEXT NOT NULL,
+            row INTEGER NOT NULL,
+            rankIntegral INTEGER,
+            position REAL,
+            rankPosition TEXT,
+            integral REAL,
+            width REAL,
+            rankWidth TEXT,
+            height REAL,
+            rankHeight TEXT,
+            isotope TEXT,
+            PRIMARY KEY (spectrum, domain, which, row)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS peakPosition ON peaks (domain, which, position);
+        CREATE TABLE IF NOT EXISTS peakLimitSets (
+            spectrum TEXT NOT NULL,
+            which TEXT NOT NULL,
+            PRIMARY KEY (spectrum, which)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS peakLimits (
+            spectrum TEXT NOT NULL,
+            which TEXT NOT NULL,
+            row INTEGER NOT NULL,
+            left REAL,
+            right REAL,
+            PRIMARY KEY (spectrum, which, row)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS buildManifest (
+            name TEXT PRIMARY KEY,
+            buildKey TEXT NOT NULL,
+            sourceMtime REAL,
+            sourceHash TEXT
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, filepath: str = params['file_peakDatabase']) -> None:
+        self.filepath: str = resource_path(filepath)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.filepath)
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        ``connect``
+        -----------
+
+        Opens the database, creating the file and schema if required.
+
+        Returns:
+            sqlite3.Connection: Connection shared by all calls on this instance.
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            self._connection = sqlite3.connect(self.filepath, check_same_thread=False, timeout=30)
+            self._connection.executescript(self.schema)
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def getTable(self, name: str, isToF: bool, which: Literal['max', 'min']) -> DataFrame | None:
+        """
+        ``getTable``
+        ------------
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``isToF`` (bool): Whether to retrieve the time of flight table rather than the energy table.
+            ``which`` (Literal['max', 'min']): Peak type.
+
+        Returns:
+            DataFrame | None: Peak table of the spectra, None if the database holds no such table.
+        """
+        if not self.exists:
+            return None
+        key = (peakKey(name), 'TOF' if isToF else 'Energy', which)
+        with self._lock:
+            connection = self.connect()
+            if connection.execute("SELECT 1 FROM peakTables WHERE spectrum = ? AND domain = ? AND which = ?",
+                                  key).fetchone() is None:
+                return None
+            rows = connection.execute(
+                """SELECT rankIntegral, position, rankPosition, integral, width, rankWidth, height, rankHeight, isotope
+                   FROM peaks WHERE spectrum = ? AND domain = ? AND which = ? ORDER BY row""", key).fetchall()
+        return DataFrame(rows, columns=tableColumns(isToF))
+
+    def setTable(self, name: str, isToF: bool, which: Literal['max', 'min'], table: DataFrame) -> None:
+        """
+        ``setTable``
+        ------------
+
+        Replaces the stored peak table of a spectra.
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``isToF`` (bool): Whether the table is of the time of flight domain.
+            ``which`` (Literal['max', 'min']): Peak type.
+            ``table`` (DataFrame): Peak table, without title row, in the column order of ``tableColumns``.
+        """
+        with self._lock:
+            connection = self.connect()
+            with connection:
+                self._writeTable(connection, name, isToF, which, table)
+
+    @staticmethod
+    def _writeTable(connection: sqlite3.Connection, name: str, isToF: bool, which: Literal['max', 'min'],
+                    table: DataFrame) -> None:
+        key = (peakKey(name), 'TOF' if isToF else 'Energy', which)
+        rows = [(*key, i, *row) for i, row in enumerate(table.iloc[:, :9].itertuples(index=False, name=None))]
+        connection.execute("DELETE FROM peaks WHERE spectrum = ? AND domain = ? AND which = ?", key)
+        connection.execute("INSERT OR REPLACE INTO peakTables VALUES (?, ?, ?)", key)
+        connection.executemany("INSERT INTO peaks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def getLimits(self, name: str, which: Literal['max', 'min']) -> DataFrame | None:
+        """
+        ``getLimits``
+        -------------
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``which`` (Literal['max', 'min']): Peak type.
+
+        Returns:
+            DataFrame | None: Energy domain peak limits with columns 'left' and 'right', None if the database holds no
+            limits for the spectra.
+        """
+        if not self.exists:
+            return None
+        key = (peakKey(name), which)
+        with self._lock:
+            connection = self.connect()
+            if connection.execute("SELECT 1 FROM peakLimitSets WHERE spectrum = ? AND which = ?",
+                                  key).fetchone() is None:
+                return None
+            rows = connection.execute(
+                "SELECT left, right FROM peakLimits WHERE spectrum = ? AND which = ? ORDER BY row", key).fetchall()
+        return DataFrame(rows, columns=['left', 'right'], dtype=float)
+
+    def setLimits(self, name: str, which: Literal['max', 'min'], limits: DataFrame | list[tuple[float]]) -> None:
+        """
+        ``setLimits``
+        -------------
+
+        Replaces the stored peak limits of a spectra.
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``which`` (Literal['max', 'min']): Peak type.
+            ``limits`` (DataFrame | list[tuple[float]]): Energy domain (left, right) limit pairs.
+        """
+        with self._lock:
+            connection = self.connect()
+            with connection:
+                self._writeLimits(connection, name, which, limits)
+
+    @staticmethod
+    def _writeLimits(connection: sqlite3.Connection, name: str, which: Literal['max', 'min'],
+                     limits: DataFrame | list[tuple[float]]) -> None:
+        key = (peakKey(name), which)
+        limits = DataFrame(limits)
+        rows = [(*key, i, float(left), float(right))
+                for i, (left, right) in enumerate(limits.iloc[:, :2].itertuples(index=False, name=None))
+                ] if not limits.empty else []
+        connection.execute("DELETE FROM peakLimits WHERE spectrum = ? AND which = ?", key)
+        connection.execute("INSERT OR REPLACE INTO peakLimitSets VALUES (?, ?)", key)
+        connection.executemany("INSERT INTO peakLimits VALUES (?, ?, ?, ?, ?)", rows)
+
+    def setResults(self, name: str, tables: dict[tuple[bool, str], DataFrame],
+                   limits: dict[str, DataFrame | list[tuple[float]]], manifest: dict = None) -> None:
+        """
+        ``setResults``
+        --------------
+
+        Replaces every stored table and limits of a spectra, along with its build manifest entry, in a single
+        transaction. A build interrupted at any point leaves each spectra either fully rebuilt or untouched.
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``tables`` (dict[tuple[bool, str], DataFrame]): Peak tables keyed by (isToF, which).
+            ``limits`` (dict[str, DataFrame | list[tuple[float]]]): Energy domain peak limits keyed by which.
+            ``manifest`` (dict, optional): Build manifest entry, with keys 'buildKey', 'sourceMtime' and
+            'sourceHash'. Defaults to None.
+        """
+        with self._lock:
+            connection = self.connect()
+            with connection:
+                for (isToF, which), table in tables.items():
+                    self._writeTable(connection, name, isToF, which, table)
+                for which, whichLimits in limits.items():
+                    self._writeLimits(connection, name, which, whichLimits)
+                if manifest is not None:
+                    connection.execute("INSERT OR REPLACE INTO buildManifest VALUES (?, ?, ?, ?)",
+                                       (name, manifest['buildKey'], manifest['sourceMtime'], manifest['sourceHash']))
+
+    def getManifest(self) -> dict[str, dict]:
+        """
+        ``getManifest``
+        ---------------
+
+        Returns:
+            dict[str, dict]: Build manifest entry of every spectra built so far, keyed by spectra name.
+        """
+        if not self.exists:
+            return {}
+        with self._lock:
+            rows = self.connect().execute(
+                "SELECT name, buildKey, sourceMtime, sourceHash FROM buildManifest").fetchall()
+        return {name: {'buildKey': buildKey, 'sourceMtime': sourceMtime, 'sourceHash': sourceHash}
+                for name, buildKey, sourceMtime, sourceHash in rows}
+
+    def getBuildKey(self, name: str) -> str | None:
+        """
+        ``getBuildKey``
+        ---------------
+
+        Args:
+            ``name`` (str): Spectra name.
+
+        Returns:
+            str | None: Build key the spectra's tables and limits were last written with, None if it was never built.
+        """
+        if not self.exists:
+            return None
+        with self._lock:
+            row = self.connect().execute("SELECT buildKey FROM buildManifest WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def peaksInRange(self, low: float, high: float, isToF: bool = False,
+                     which: Literal['max', 'min'] = 'max') -> DataFrame:
+        """
+        ``peaksInRange``
+        ----------------
+
+        Retrieves every peak of the database positioned within [low, high].
+
+        Args:
+            ``low`` (float): Lower bound of the energy or time of flight range.
+            ``high`` (float): Upper bound of the energy or time of flight range.
+            ``isToF`` (bool, optional): Whether the range is of time of flight. Defaults to False.
+            ``which`` (Literal['max', 'min'], optional): Peak type. Defaults to 'max'.
+
+        Returns:
+            DataFrame: Peak table rows ordered by position, with an added leading 'Spectrum' column.
+        """
+        if not self.exists:
+            return DataFrame(columns=['Spectrum', *tableColumns(isToF)])
+        with self._lock:
+            rows = self.connect().execute(
+                """SELECT spectrum, rankIntegral, position, rankPosition, integral, width, rankWidth, height,
+                          rankHeight, isotope
+                   FROM peaks WHERE domain = ? AND which = ? AND position BETWEEN ? AND ? ORDER BY position""",
+                ('TOF' if isToF else 'Energy', which, low, high)).fetchall()
+        return DataFrame(rows, columns=['Spectrum', *tableColumns(isToF)])
+
+    def build(self, peakInfoDir: str = params['dir_peakInfo'],
+              peakLimitDir: str = params['dir_peakLimitInfo']) -> int:
+        """
+        ``build``
+        ---------
+
+        Imports the per-spectra peak table and peak limit CSV files into the database.
+
+        Args:
+            ``peakInfoDir`` (str, optional): Directory holding the Energy and TOF peak table directories.
+            Defaults to params['dir_peakInfo'].
+            ``peakLimitDir`` (str, optional): Directory holding the peak limit files.
+            Defaults to params['dir_peakLimitInfo'].
+
+        Returns:
+            int: Number of files imported.
+        """
+        count = 0
+        for domain in ['Energy', 'TOF']:
+            directory = resource_path(f"{peakInfoDir}{domain}/")
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                name, sep, which = filename[:-4].rpartition('_tableData_')
+                if not filename.endswith('.csv') or not sep:
+                    continue
+                self.setTable(name, domain == 'TOF', which, read_csv(f"{directory}{filename}"))
+                count += 1
+        directory = resource_path(peakLimitDir)
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                name, sep, which = filename[:-4].rpartition('_')
+                if not filename.endswith('.csv') or which not in ['max', 'min']:
+                    continue
+                try:
+                    limits = read_csv(f"{directory}{filename}", header=None)
+                except EmptyDataError:
+                    limits = DataFrame()
+                self.setLimits(name, which, limits)
+                count += 1
+        return count
+
+
+_databases: dict[str, PeakDatabase] = {}
+
+
+def getPeakDatabase(filepath: str = params['file_peakDatabase']) -> PeakDatabase:
+    """
+    ``getPeakDatabase``
+    -------------------
+
+    Args:
+        ``filepath`` (str, optional): Filepath of the database. Defaults to params['file_peakDatabase'].
+
+    Returns:
+        PeakDatabase: Shared instance for the given database file.
+    """
+    if filepath not in _databases:
+        _databases[filepath] = PeakDatabase(filepath)
+    return _databases[filepath]
+
+
+def loadPeakTable(name: str, isToF: bool, which: Literal['max', 'min'],
+                  peakInfoDir: str = params['dir_peakInfo']) -> DataFrame:
+    """
+    ``loadPeakTable``
+    -----------------
+
+    Retrieves the peak table of a spectra from the peak database, falling back to its CSV file.
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``isToF`` (bool): Whether to retrieve the time of flight table rather than the energy table.
+        ``which`` (Literal['max', 'min']): Peak type.
+        ``peakInfoDir`` (str, optional): Directory of the CSV peak tables. Defaults to params['dir_peakInfo'].
+
+    Raises:
+        ``FileNotFoundError``: Neither the database nor a CSV file holds the table.
+
+    Returns:
+        DataFrame: Peak table of the spectra.
+    """
+    table = getPeakDatabase().getTable(name, isToF, which)
+    if table is not None:
+        return table
+    return read_csv(resource_path(
+        f"{peakInfoDir}{'TOF' if isToF else 'Energy'}/{peakKey(name)}_tableData_{which}.csv"))
+
+
+def loadPeakLimits(name: str, which: Literal['max', 'min'],
+                   peakLimitDir: str = params['dir_peakLimitInfo']) -> DataFrame:
+    """
+    ``loadPeakLimits``
+    ------------------
+
+    Retrieves the energy domain peak limits of a spectra from the peak database, falling back to its CSV file.
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``which`` (Literal['max', 'min']): Peak type.
+        ``peakLimitDir`` (str, optional): Directory of the CSV peak limits. Defaults to params['dir_peakLimitInfo'].
+
+    Raises:
+        ``FileNotFoundError``: Neither the database nor a CSV file holds the limits.
+
+    Returns:
+        DataFrame: Peak limits with columns 'left' and 'right'.
+    """
+    limits = getPeakDatabase().getLimits(name, which)
+    if limits is not None:
+        return limits
+    return read_csv(resource_path(f"{peakLimitDir}{peakKey(name)}_{which}.csv"), names=['left', 'right'])
+
+
+if __name__ == '__main__':
+    t1 = perf_counter()
+    numFiles = getPeakDatabase().build()
+    t2 = perf_counter()
+    print(f"Imported {numFiles} files - Elapsed Time: {t2 - t1}")
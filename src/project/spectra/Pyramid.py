@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy import ndarray
+from scipy import signal
+from scipy.ndimage import gaussian_filter1d, maximum_filter1d
+
+from project.settings import params
+
+
+def pyramidLevel(y: ndarray, block: int) -> ndarray:
+    """
+    ``pyramidLevel``
+    ----------------
+
+    Decimates the data by a factor of ``block`` keeping the maximum of every block, so no peak is lost at the coarse
+    level.
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``block`` (int): Number of points per block.
+
+    Returns:
+        ndarray: Maximum of each block.
+    """
+    padded = np.concatenate((y, np.full((-y.size) % block, y[-1])))
+    return padded.reshape(-1, block).max(axis=1)
+
+
+def candidateWindows(mask: ndarray, block: int, margin: int, size: int) -> tuple[ndarray, ndarray]:
+    """
+    ``candidateWindows``
+    --------------------
+
+    Args:
+        - ``mask`` (ndarray): Whether each block of the coarse level may hold a peak.
+
+        - ``block`` (int): Number of points per block.
+
+        - ``margin`` (int): Number of neighbouring blocks added either side of each candidate block.
+
+        - ``size`` (int): Number of points of the full resolution data.
+
+    Returns:
+        tuple[ndarray, ndarray]: Start and stop index of each merged window at full resolution.
+    """
+    mask = maximum_filter1d(mask.astype(np.int8), 2 * margin + 1) > 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return edges[::2] * block, np.minimum(edges[1::2] * block, size)
+
+
+def windowIndices(starts: ndarray, stops: ndarray) -> ndarray:
+    # Full resolution index of every point of the windows, concatenated.
+    lengths = stops - starts
+    return np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+
+
+def findPeaksInWindows(y: ndarray, starts: ndarray, stops: ndarray, **kwargs) -> tuple[ndarray, dict[str, ndarray]]:
+    """
+    ``findPeaksInWindows``
+    ----------------------
+
+    ``signal.find_peaks`` over the windows only, in a single call. The windows are joined by a separator higher than
+    any point, which bounds the prominence and width of a peak exactly as the edge of the window would.
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``starts`` (ndarray): Start index of each window.
+
+        - ``stops`` (ndarray): Stop index of each window.
+
+        - ``kwargs``: Conditions passed to ``signal.find_peaks``.
+
+    Returns:
+        tuple[ndarray, dict[str, ndarray]]: Full resolution peak indices and their properties.
+    """
+    if starts.size == 0:
+        return signal.find_peaks(y[:0], **kwargs)
+    if starts.size == 1 and starts[0] == 0 and stops[0] == y.size:
+        return signal.find_peaks(y, **kwargs)
+    indices = windowIndices(starts, stops)
+    lengths = stops - starts
+    separators = np.cumsum(lengths)[:-1]
+    indices = np.insert(indices, separators, -1)
+    values = np.where(indices >= 0, y[indices], y.max() + 1)
+    peaks, properties = signal.find_peaks(values, **kwargs)
+    keep = indices[peaks] >= 0
+    peaks = peaks[keep]
+    properties = {key: value[keep] for key, value in properties.items()}
+    for key in ['left_bases', 'right_bases']:
+        if key in properties:
+            properties[key] = indices[properties[key]]
+    for key in ['left_ips', 'right_ips']:
+        if key in properties:
+            whole = np.floor(properties[key]).astype(int)
+            properties[key] = indices[whole] + (properties[key] - whole)
+    return indices[peaks], properties
+
+
+def zeroDerivatives(y: ndarray, starts: ndarray, stops: ndarray, smoothCoeff: float = None) -> tuple[ndarray, ndarray]:
+    """
+    ``zeroDerivatives``
+    -------------------
+
+    Flats and dips of the smoothed data within the windows. Each window is smoothed with a padding of the filter
+    radius, so the derivative inside the windows matches the full resolution derivative.
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``starts`` (ndarray): Start index of each window.
+
+        - ``stops`` (ndarray): Stop index of each window.
+
+        - ``smoothCoeff`` (float, optional): Standard deviation of the gaussian smoothing, None for no smoothing.
+        Defaults to None.
+
+    Returns:
+        tuple[ndarray, ndarray]: Full resolution indices of the flats and of the dips.
+    """
+    if starts.size == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    pad = 2 if smoothCoeff is None else int(4 * smoothCoeff + 0.5) + 2
+    paddedStarts, paddedStops = np.maximum(starts - pad, 0), np.minimum(stops + pad, y.size)
+    # Merge windows overlapping once padded.
+    merged = np.concatenate(([True], paddedStarts[1:] > paddedStops[:-1]))
+    paddedStarts = paddedStarts[merged]
+    paddedStops = np.maximum.reduceat(paddedStops, np.flatnonzero(merged))
+    indices = windowIndices(paddedStarts, paddedStops)
+    values = y[indices]
+    smooth = values if smoothCoeff is None else gaussian_filter1d(values, smoothCoeff)
+    signChange = np.diff(np.sign(np.gradient(smooth)))
+
+    # Only sign changes clear of the joins between windows, where the smoothing is exact.
+    window = np.repeat(np.arange(paddedStarts.size), paddedStops - paddedStarts)
+    validStart = np.where(paddedStarts > 0, paddedStarts + pad, 0)[window]
+    validStop = np.where(paddedStops < y.size, paddedStops - pad, y.size)[window]
+    valid = (indices[:-1] >= validStart[:-1]) & (indices[:-1] + 1 < validStop[:-1]) & (window[:-1] == window[1:])
+    return indices[:-1][valid & (signChange < 0)], indices[:-1][valid & (signChange > 0)]
+
+
+def maximaWindows(y: ndarray, floor: float) -> tuple[ndarray, ndarray]:
+    """
+    ``maximaWindows``
+    -----------------
+
+    Args:
+        - ``y`` (ndarray): y data.
+
+        - ``floor`` (float): Lowest threshold peaks are searched for.
+
+    Returns:
+        tuple[ndarray, ndarray]: Windows around every block whose maximum reaches the floor.
+    """
+    block, margin = params['pyramid_block'], params['pyramid_margin']
+    return candidateWindows(pyramidLevel(y, block) >= floor, block, margin, y.size)
+
+
+if __name__ == '__main__':
+    # Benchmark of the pyramid against the full resolution detection of the maxima, over every spectra of the database.
+    import contextlib
+    import io
+    import os
+    from time import perf_counter
+    from pandas import DataFrame
+    from project.helpers.resourcePath import resource_path
+    from project.spectra.PeakDetection import PeakDetector
+    from project.spectra.SpectrumRepository import spectrumRepository
+
+    names = sorted(filename[:-4] for filename in os.listdir(resource_path(params['dir_graphData']))
+                   if filename.endswith('.csv'))
+    elapsed = {'full': 0.0, 'pyramid': 0.0}
+    peaks = [0, 0, 0]
+    limits = [0, 0]
+    for name in names:
+        data = spectrumRepository.get(name)
+        if data.shape[0] < params['pyramid_min_points']:
+            continue
+        graphData = DataFrame(data[np.argsort(data[:, 0], kind='stable')])
+        results = {}
+        for mode in elapsed:
+            params['detection_mode'] = mode
+            with contextlib.redirect_stdout(io.StringIO()):
+                peakDetector = PeakDetector(name, graphData)
+                t1 = perf_counter()
+                peakDetector.maxima(100)
+                peakDetector.definePeakLimits('max')
+                elapsed[mode] += perf_counter() - t1
+            results[mode] = peakDetector
+        full, pyramid = results['full'], results['pyramid']
+        fullPeaks, pyramidPeaks = set(full.maximaIndices), set(pyramid.maximaIndices)
+        peaks[0] += len(fullPeaks)
+        peaks[1] += len(fullPeaks - pyramidPeaks)
+        peaks[2] += len(pyramidPeaks - fullPeaks)
+        limits[0] += len(full.maxPeakLimitsX)
+        limits[1] += sum(full.maxPeakLimitsX[peak] == pyramid.maxPeakLimitsX.get(peak) for peak in full.maxPeakLimitsX)
+    params['detection_mode'] = 'full'
+    print(f"Full Resolution Elapsed Time: {elapsed['full']:.3f}s - Pyramid Elapsed Time: {elapsed['pyramid']:.3f}s - "
+          f"Speedup: {elapsed['full'] / max(elapsed['pyramid'], 1e-12):.2f}x - {peaks[0]} peaks, {peaks[1]} missed, "
+          f"{peaks[2]} extra")
+    print(f"Identical limits: {limits[1]} / {limits[0]}")
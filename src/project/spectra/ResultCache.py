@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from typing import Any
+
+import numpy as np
+from pandas import DataFrame
+
+from project.helpers.resourcePath import resource_path
+from project.settings import params
+
+# Bumped whenever the derived results change shape or the algorithms producing them change.
+CACHE_VERSION = 2
+
+
+def cacheKey(graphData: np.ndarray | DataFrame, **parameters) -> str:
+    """
+    ``cacheKey``
+    ------------
+
+    Args:
+        ``graphData`` (np.ndarray | DataFrame): Graph data the results are derived from.
+        ``parameters``: Every other input of the analysis, i.e. smoothing coefficient, threshold, prominence, length.
+
+    Returns:
+        str: Hex digest of the graph data content and the parameters.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((CACHE_VERSION, sorted(parameters.items()))).encode())
+    digest.update(np.ascontiguousarray(np.asarray(graphData, dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of analysis results, one pickle file per key. Files are written atomically and the least recently
+    used are evicted once the directory exceeds its size cap, reading a result marks it as used.
+    """
+
+    def __init__(self, directory: str = params['dir_resultCache'],
+                 maxBytes: int = params['result_cache_size']) -> None:
+        self.directory: str = resource_path(directory)
+        self.maxBytes: int = maxBytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Any:
+        """
+        ``get``
+        -------
+
+        Args:
+            ``key`` (str): Key from ``cacheKey``.
+
+        Returns:
+            Any: Cached result, None if there is none or it cannot be read.
+        """
+        if self.maxBytes <= 0:
+            return None
+        filepath = self._path(key)
+        try:
+            with open(filepath, 'rb') as file:
+                result = pickle.load(file)
+            os.utime(filepath)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Unreadable or stale entry, dropped so it is rewritten.
+            self.remove(key)
+            return None
+        return result
+
+    def set(self, key: str, result: Any) -> None:
+        """
+        ``set``
+        -------
+
+        Args:
+            ``key`` (str): Key from ``cacheKey``.
+            ``result`` (Any): Picklable result.
+        """
+        if self.maxBytes <= 0:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        filepath = self._path(key)
+        tempPath = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tempPath, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tempPath, filepath)
+        self._evict()
+
+    def remove(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        for filename in self._entries():
+            self.remove(filename[:-4])
+
+    def _entries(self) -> list[str]:
+        try:
+            return [filename for filename in os.listdir(self.directory) if filename.endswith('.pkl')]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for filename in self._entries():
+                try:
+                    stat = os.stat(os.path.join(self.directory, filename))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, filename))
+            totalBytes = sum(size for _, size, _ in entries)
+            for _, size, filename in sorted(entries):
+                if totalBytes <= self.maxBytes:
+                    break
+                self.remove(filename[:-4])
+                totalBytes -= size
+
+
+resultCache = ResultCache()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+from time import perf_counter
+
+from pandas.errors import EmptyDataError
+
+from project.helpers.interpName import interpName
+from project.helpers.resourcePath import resource_path
+from project.settings import params
+from project.spectra.SpectrumStore import loadSpectrum
+
+
+class SpectraCatalog:
+    """
+    Manifest of the spectra held in a graph data directory, storing the parsed name fields, row count, x-range and
+    modification time of each file. The manifest is persisted as JSON and only rescanned when the directory itself
+    has changed, in which case only new or modified files are read.
+    """
+
+    def __init__(self, directory: str = params['dir_graphData'], manifestPath: str = params['file_catalog'],
+                 storeDir: str = params['dir_binaryData']) -> None:
+        self.directory: str = directory
+        self.storeDir: str = storeDir
+        self.manifestPath: str = resource_path(manifestPath)
+        self.key: str = os.path.basename(os.path.normpath(resource_path(directory)))
+        self.spectra: dict[str, dict] = {}
+        self.directoryMtime: float = None
+        self.refresh()
+
+    def _readManifest(self) -> dict:
+        try:
+            with open(self.manifestPath, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _writeManifest(self) -> None:
+        manifest = self._readManifest()
+        manifest[self.key] = {'mtime': self.directoryMtime, 'spectra': self.spectra}
+        os.makedirs(os.path.dirname(self.manifestPath), exist_ok=True)
+        tempPath = f"{self.manifestPath}.tmp"
+        with open(tempPath, 'w') as file:
+            json.dump(manifest, file)
+        os.replace(tempPath, self.manifestPath)
+
+    def _describe(self, name: str, mtime: float) -> dict:
+        info = interpName(name)
+        try:
+            data = loadSpectrum(name, self.directory, self.storeDir)
+            rows = int(data.shape[0])
+            xMin, xMax = (float(data[:, 0].min()), float(data[:, 0].max())) if rows else (None, None)
+        except (EmptyDataError, ValueError):
+            rows, xMin, xMax = 0, None, None
+        return {**info,
+                'isElement': info['zNum'] is None,
+                'rows': rows,
+                'xMin': xMin,
+                'xMax': xMax,
+                'mtime': mtime}
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        ``refresh``
+        -----------
+
+        Loads the manifest, rescanning the directory only if its modification time differs from the one recorded.
+        Files whose modification time is unchanged keep their recorded entry.
+
+        Args:
+            ``force`` (bool, optional): Whether to rescan the directory regardless. Defaults to False.
+
+        Returns:
+            bool: Whether the directory was rescanned.
+        """
+        directoryPath = resource_path(self.directory)
+        try:
+            directoryMtime = os.stat(directoryPath).st_mtime
+        except OSError:
+            self.spectra, self.directoryMtime = {}, None
+            return False
+        if not force and self.directoryMtime == directoryMtime:
+            return False
+        entry = self._readManifest().get(self.key, {})
+        self.spectra = entry.get('spectra', {})
+        self.directoryMtime = entry.get('mtime', None)
+        if not force and self.directoryMtime == directoryMtime:
+            return False
+
+        spectra = {}
+        for filename in os.listdir(directoryPath):
+            filename = os.fsdecode(filename)
+            if not filename.endswith('.csv'):
+                continue
+            name = filename[:-4]
+            mtime = os.stat(os.path.join(directoryPath, filename)).st_mtime
+            previous = self.spectra.get(name)
+            spectra[name] = previous if previous is not None and previous['mtime'] == mtime and not force \
+                else self._describe(name, mtime)
+        self.spectra = dict(sorted(spectra.items()))
+        self.directoryMtime = directoryMtime
+        self._writeManifest()
+        return True
+
+    def names(self, **fields) -> list[str]:
+        """
+        ``names``
+        ---------
+
+        Args:
+            ``fields``: Optional filters on the catalog fields, i.e. ``symbol='Cu'``, ``mode='n-g'``,
+            ``isElement=False``.
+
+        Returns:
+            list[str]: Names of the spectra matching every given field.
+        """
+        return [name for name, info in self.spectra.items()
+                if all(info.get(field) == value for field, value in fields.items())]
+
+    def __getitem__(self, name: str) -> dict:
+        return self.spectra[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.spectra
+
+    def __len__(self) -> int:
+        return len(self.spectra)
+
+
+_catalogs: dict[str, SpectraCatalog] = {}
+
+
+def getCatalog(directory: str = params['dir_graphData']) -> SpectraCatalog:
+    """
+    ``getCatalog``
+    --------------
+
+    Args:
+        ``directory`` (str, optional): Graph data directory. Defaults to params['dir_graphData'].
+
+    Returns:
+        SpectraCatalog: Shared catalog of the given directory, refreshed if the directory has changed since.
+    """
+    if directory not in _catalogs:
+        _catalogs[directory] = SpectraCatalog(directory)
+    else:
+        _catalogs[directory].refresh()
+    return _catalogs[directory]
+
+
+if __name__ == '__main__':
+    t1 = perf_counter()
+    catalogs = [SpectraCatalog(directory) for directory in [params['dir_graphData'], params['dir_compoundGraphData']]]
+    t2 = perf_counter()
+    print(f"Catalogued {sum(len(catalog) for catalog in catalogs)} spectra - Elapsed Time: {t2 - t1}")
@@ -5,22 +5,22 @@ from pyparsing import Literal
 from scipy.interpolate import interp1d
 import pandas
 from pandas import DataFrame
-from decimal import Decimal, getcontext
-import concurrent.futures
 
+from project.spectra.Conversion import convertedAxis, energyToTOF, rescaleTOF, tofToEnergy
 from project.spectra.PeakDetection import PeakDetector
-from project.helpers.getSpacedElements import getSpacedElements
-from project.helpers.integration import integrate_simps
+from project.helpers.integration import CumulativeIntegral
 from project.helpers.nearestNumber import nearestnumber
-from project.helpers.resourcePath import resource_path
 from project.helpers.smartRound import smart_round
 from project.spectra.Integrator import IsotopeIntegrator
+from project.spectra.Mixer import DistributionMixer, isotopeSpectraName, mixerCache, unionGrid
+from project.spectra.PeakDatabase import getPeakDatabase, loadPeakLimits
+from project.spectra.ResultCache import cacheKey, resultCache
+from project.spectra.SpectrumStore import sourceKey
 from time import perf_counter
 from project.settings import params
 
 
 dataFilepath = params['dir_graphData']
-peakLimitFilepath = params['dir_peakLimitInfo']
 
 
 class SpectraData:
@@ -71,6 +71,12 @@ class SpectraData:
     isMinDrawn: bool = False
     isToF: bool = False
 
+    _integrator: IsotopeIntegrator = None
+    _cumulativeIntegral: CumulativeIntegral = None
+    _cumulativeIntegralSource: DataFrame = None
+    _integralCache: dict[tuple, tuple[float, str]] = None
+    _integralCacheSource: DataFrame = None
+
     def __init__(self,
                  name: str,
                  numPeaks: int,
@@ -87,7 +93,10 @@ class SpectraData:
                  thresholds: float = 100,
                  length: dict[float] = params['length'],
                  isImported: bool = False,
-                 updatingDatabase: bool = False) -> None:
+                 updatingDatabase: bool = False,
+                 energyResults: dict = None,
+                 detectedPeaks: dict = None,
+                 graphDataDir: str = params['dir_graphData']) -> None:
 
         t1 = perf_counter()
 
@@ -102,6 +111,7 @@ class SpectraData:
         self.isAnnotationsHidden: bool = isAnnotationsHidden
         self.isCompound: bool = isCompound
         self.isImported: bool = isImported
+        self.graphDataDir: str = graphDataDir
         self.annotations: list = []
         self.maxAnnotationOrder: dict[int] = {}
         self.minAnnotationOrder: dict[int] = {}
@@ -144,7 +154,13 @@ class SpectraData:
             self.onDistChange()
 
         if self.isToF and not self.graphData.empty and not distChanging:
-            self.graphData[0] = self.energyToTOF(graphData[0], length=self.length)
+            if energyResults is None and not updatingDatabase:
+                # Results of the same spectra analysed in the energy domain.
+                energyResults = resultCache.get(self.resultCacheKey(self.graphData.sort_values(0, ignore_index=True),
+                                                                    isToF=False))
+            self.graphData[0] = convertedAxis(self.name, graphData[0], self.flightLength())
+        else:
+            energyResults = None
         if self.graphData.empty:
             self.peakDetector = None
         else:
@@ -155,6 +171,47 @@ class SpectraData:
         t4 = perf_counter()
 
         print(f"Elapsed Time - Start Init - {t4 - t3}")
+        key = None if updatingDatabase or self.peakDetector is None else self.resultCacheKey()
+        results = None if key is None else resultCache.get(key)
+        if results is not None:
+            self.restoreResults(results)
+        elif energyResults is not None and self.peakDetector is not None and energyResults['maxima'] is not None \
+                and energyResults['minima'] is not None:
+            if self.deriveResults(energyResults) and key is not None:
+                resultCache.set(key, self.derivedResults())
+        elif detectedPeaks is not None and self.peakDetector is not None:
+            if self.applyDetectedPeaks(detectedPeaks) and key is not None:
+                resultCache.set(key, self.derivedResults())
+        elif self.analysePeaks(graphData, updatingDatabase, dataChanged) and key is not None:
+            resultCache.set(key, self.derivedResults())
+
+        if self.numPeaks is None:
+            self.numPeaks = None if self.maxima is None else len(self.maxima[0])
+        self.changePeakTableData()
+
+        t2 = perf_counter()
+        self.isUpdating = False
+        print(f"Elapsed Time - {self.name} Init - {t2 - t1}")
+
+    def analysePeaks(self, graphData: DataFrame, updatingDatabase: bool = False, dataChanged: bool = False) -> bool:
+        """
+        ``analysePeaks``
+        ----------------
+
+        Finds the maxima and minima of the graph data, then either retrieves their limits from the peak database or
+        calculates the limits and peak table data.
+
+        Args:
+            - ``graphData`` (DataFrame): Graph data of the instance.
+
+            - ``updatingDatabase`` (bool, optional): Whether to always recalculate limits and tables. Defaults to False.
+
+            - ``dataChanged`` (bool, optional): Whether the graph data differs from the database. Defaults to False.
+
+        Returns:
+            bool: Whether any limits and tables were calculated rather than retrieved.
+        """
+        analysed = False
         t3 = perf_counter()
         try:
             if self.peakDetector is not None:
@@ -165,15 +222,14 @@ class SpectraData:
             pass
         t4 = perf_counter()
         print(f"Elapsed Time - Peak Detector - {t4 - t3}")
+        name = self.name[8:] if 'element' in self.name else self.name
         # Grab Peak Limits for max from file, otherwise calculate
         t3 = perf_counter()
         try:
             if updatingDatabase or dataChanged:
                 raise FileNotFoundError
             if not self.distChanging:
-                name = self.name[8:] if 'element' in self.name else self.name
-                maxLimits = pandas.read_csv(resource_path(
-                    f"{peakLimitFilepath}{name}_max.csv"), names=['left', 'right'])
+                maxLimits = loadPeakLimits(name, 'max')
                 if self.isToF:
                     # Convert Limit coords to TOF
                     maxLimits['left'] = self.energyToTOF(maxLimits['left'], self.length)
@@ -199,6 +255,7 @@ class SpectraData:
             if self.maxima is not None:
                 if self.maxima.size != 0:
 
+                    analysed = True
                     self.peakDetector.definePeakLimits(which='max')
                     self.maxPeakLimitsX = self.peakDetector.maxPeakLimitsX.copy()
                     self.maxPeakLimitsY = self.peakDetector.maxPeakLimitsY.copy()
@@ -207,11 +264,10 @@ class SpectraData:
         print(f"Elapsed Time - Max Peak Limits - {t4 - t3}")
         t3 = perf_counter()
         try:
-            if updatingDatabase:
+            if updatingDatabase or dataChanged:
                 raise FileNotFoundError
-            if not distChanging:
-                minLimits = pandas.read_csv(resource_path(
-                    f"{peakLimitFilepath}{name}_min.csv"), names=['left', 'right'])
+            if not self.distChanging:
+                minLimits = loadPeakLimits(name, 'min')
                 if self.isToF:
                     minLimits['left'] = self.energyToTOF(minLimits['left'], self.length)
                     minLimits['right'] = self.energyToTOF(minLimits['right'], self.length)
@@ -235,6 +291,7 @@ class SpectraData:
             if self.minima is not None:
                 if self.minima.size != 0:
 
+                    analysed = True
                     self.peakDetector.definePeakLimits(which='min')
                     self.minPeakLimitsX = self.peakDetector.minPeakLimitsX.copy()
                     self.minPeakLimitsY = self.peakDetector.minPeakLimitsY.copy()
@@ -242,14 +299,153 @@ class SpectraData:
 
         t4 = perf_counter()
         print(f"Elapsed Time - Max Peak Limits - {t4 - t3}")
+        return analysed
 
-        if self.numPeaks is None:
-            self.numPeaks = None if self.maxima is None else len(self.maxima[0])
-        self.changePeakTableData()
+    def resultCacheKey(self, graphData: DataFrame = None, isToF: bool = None) -> str:
+        """
+        ``resultCacheKey``
+        ------------------
 
-        t2 = perf_counter()
-        self.isUpdating = False
-        print(f"Elapsed Time - {self.name} Init - {t2 - t1}")
+        Args:
+            - ``graphData`` (DataFrame, optional): Sorted graph data to key, defaults to that of the instance.
+
+            - ``isToF`` (bool, optional): Domain of the graph data, defaults to that of the instance.
+
+        Returns:
+            str: Key of the derived results of this instance, a hash of its graph data and every analysis parameter.
+            Limits may be read from the peak database and integrals are taken over the isotopes, so the build key of
+            the spectra in the database and the source files of its isotopes are part of the key.
+        """
+        graphData = self.graphData if graphData is None else graphData
+        usePyramid = params['detection_mode'] == 'pyramid' and graphData.shape[0] >= params['pyramid_min_points']
+        isotopeSources = None if self.distributions is None else sorted(
+            (isotope, sourceKey(isotopeSpectraName(self.name, isotope, self.isCompound), self.graphDataDir))
+            for isotope, dist in self.distributions.items() if dist != 0)
+        return cacheKey(graphData,
+                        name=self.name,
+                        isToF=self.isToF if isToF is None else isToF,
+                        isCompound=self.isCompound,
+                        smoothCoeff=1 if self.isImported else 12,
+                        threshold=self.threshold,
+                        prominence=params['min_prominence'],
+                        detection=usePyramid and (params['pyramid_block'], params['pyramid_margin']),
+                        length=None if self.length is None else self.length[self.plotType],
+                        distributions=None if self.distributions is None else sorted(self.distributions.items()),
+                        isotopeSources=isotopeSources,
+                        peakDatabase=getPeakDatabase().getBuildKey(self.name))
+
+    def derivedResults(self) -> dict:
+        """
+        ``derivedResults``
+        ------------------
+
+        Returns:
+            dict: Peaks, limits, tables and integrals of this instance, with the state of its peak detector.
+        """
+        return {'maxima': self.maxima,
+                'minima': self.minima,
+                'maxPeakLimitsX': self.maxPeakLimitsX,
+                'maxPeakLimitsY': self.maxPeakLimitsY,
+                'minPeakLimitsX': self.minPeakLimitsX,
+                'minPeakLimitsY': self.minPeakLimitsY,
+                'maxTableData': self.maxTableData,
+                'minTableData': self.minTableData,
+                'integrals': self._integralCache if self._integralCacheSource is self.graphData else None,
+                'peakDetector': self.peakDetector.getState()}
+
+    def restoreResults(self, results: dict) -> None:
+        """
+        ``restoreResults``
+        ------------------
+
+        Restores the results of ``derivedResults``, in place of any peak detection.
+
+        Args:
+            ``results`` (dict): Derived results of an instance with the same graph data and parameters.
+        """
+        self.peakDetector.setState(results['peakDetector'])
+        self.peakDetector.maxima(self.threshold)
+        self.peakDetector.minima()
+        self.maxima = results['maxima']
+        self.minima = results['minima']
+        self.maxPeakLimitsX = results['maxPeakLimitsX']
+        self.maxPeakLimitsY = results['maxPeakLimitsY']
+        self.minPeakLimitsX = results['minPeakLimitsX']
+        self.minPeakLimitsY = results['minPeakLimitsY']
+        self.maxTableData = results['maxTableData']
+        self.minTableData = results['minTableData']
+        if results['integrals'] is not None:
+            self._integralCache = results['integrals']
+            self._integralCacheSource = self.graphData
+
+    def deriveResults(self, energyResults: dict) -> bool:
+        """
+        ``deriveResults``
+        -----------------
+
+        Derives the time of flight peaks and limits from the results of the same spectra in the energy domain, in place
+        of a second peak detection. Time of flight decreases monotonically with energy, so each peak and limit maps to
+        its counterpart with the left and right limits swapped. Integrals and widths depend on the domain, so the
+        tables are recalculated unless they were given, i.e. from the peak database.
+
+        Args:
+            ``energyResults`` (dict): Results of ``derivedResults`` of the energy domain instance.
+
+        Returns:
+            bool: Whether any tables were calculated rather than given.
+        """
+        analysed = False
+        for which in ['max', 'min']:
+            peaks = energyResults['maxima' if which == 'max' else 'minima']
+            peaks = np.array((self.energyToTOF(peaks[0]), peaks[1]), dtype=float)[:, ::-1]
+            energyLimitsX = energyResults[f"{which}PeakLimitsX"]
+            energyLimitsY = energyResults[f"{which}PeakLimitsY"]
+            peaksX = dict(zip(energyLimitsX, self.energyToTOF(list(energyLimitsX)).tolist()))
+            limits = self.energyToTOF(np.ravel(list(energyLimitsX.values()))).reshape(-1, 2).tolist()
+            limitsX = {peaksX[peak]: (right, left)
+                       for peak, (left, right) in zip(reversed(energyLimitsX), limits[::-1])}
+            limitsY = {peaksX[peak]: energyLimitsY[peak][::-1] for peak in reversed(energyLimitsX)
+                       if peak in energyLimitsY}
+            table = self.maxTableData if which == 'max' else self.minTableData
+            if which == 'max':
+                self.maxima, self.maxPeakLimitsX, self.maxPeakLimitsY = peaks, limitsX, limitsY
+            else:
+                self.minima, self.minPeakLimitsX, self.minPeakLimitsY = peaks, limitsX, limitsY
+            if table.iloc[1:].empty:
+                analysed = True
+                self.recalculateAllPeakData(which=which)
+        return analysed
+
+    def applyDetectedPeaks(self, detected: dict) -> bool:
+        """
+        ``applyDetectedPeaks``
+        ----------------------
+
+        Takes the peaks and limits found by ``batchDetect`` for the graph data of this instance, in place of a peak
+        detection. The tables are recalculated unless they were given.
+
+        Args:
+            ``detected`` (dict): Result of ``detectPeaks`` for the graph data of this instance.
+
+        Returns:
+            bool: Whether any tables were calculated rather than given.
+        """
+        analysed = False
+        for which in ['max', 'min']:
+            peaks = np.array(detected[f"{which}ima"], dtype=float)
+            found = ~np.isnan(detected[f"{which}Limits"]).any(axis=1)
+            peaksX = peaks[0][found].tolist()
+            limitsX = dict(zip(peaksX, map(tuple, detected[f"{which}Limits"][found].tolist())))
+            limitsY = dict(zip(peaksX, map(tuple, detected[f"{which}LimitsY"][found].tolist())))
+            table = self.maxTableData if which == 'max' else self.minTableData
+            if which == 'max':
+                self.maxima, self.maxPeakLimitsX, self.maxPeakLimitsY = peaks, limitsX, limitsY
+            else:
+                self.minima, self.minPeakLimitsX, self.minPeakLimitsY = peaks, limitsX, limitsY
+            if table.iloc[1:].empty:
+                analysed = True
+                self.recalculateAllPeakData(which=which)
+        return analysed
 
     def __eq__(self, other) -> bool:
         """
@@ -281,9 +477,27 @@ class SpectraData:
             return self.name != other.name or self.isToF != other.isToF or self.graphData != other.graphData
         return True
 
+    def flightLength(self, length: float | dict[str, float] = None) -> float:
+        """
+        ``flightLength``
+        ----------------
+
+        Args:
+            - ``length`` (float | dict[str, float], optional): Length, or lengths keyed by plot type, used when the
+            instance has none. Defaults to params['length'].
+
+        Returns:
+            float: Flight path length of the instance's plot type.
+        """
+        if self.length is not None:
+            length = self.length
+        if length is None:
+            length = params['length']
+        return length[self.plotType] if isinstance(length, dict) else length
+
     def energyToTOF(self,
                     xData: float | list[float],
-                    length: dict[float] = {"n-g": 22.804, "n-tot": 23.404}) -> list[float]:
+                    length: dict[float] = {"n-g": 22.804, "n-tot": 23.404}) -> ndarray:
         """
         ``energyToTOF``
         ---------------
@@ -294,20 +508,9 @@ class SpectraData:
             - ``xData`` (list[float]): List of the substances x-coords of its graph data
 
         Returns:
-            list[float]: Mapped x-coords
+            ndarray: Mapped x-coords
         """
-        if self.length is not None:
-            length = self.length
-        neutronMass = float(1.68e-27)
-        electronCharge = float(1.60e-19)
-
-        tofX = list(
-            map(
-                lambda x: length[self.plotType] * 1e6 * (0.5 * neutronMass / (x * electronCharge)) ** 0.5,
-                xData
-            )
-        )
-        return tofX
+        return np.atleast_1d(energyToTOF(xData, self.flightLength(length)))
 
     def e2TOF(self, xData: float, length: dict[float] = params['length']) -> float:
         """
@@ -325,22 +528,7 @@ class SpectraData:
         Returns:
             float: Mapped x-coord
         """
-        if self.length is not None:
-            length = self.length[self.plotType]
-
-        # Set the decimal context to avoid precision errors
-        getcontext().prec = 50
-
-        neutronMass = Decimal('1.68e-27')
-        electronCharge = Decimal('1.60e-19')
-        xData = Decimal(str(xData))  # Convert xData to Decimal
-        length = Decimal(str(length))  # Convert length to Decimal
-
-        # Perform calculations using Decimal
-        result = length * Decimal('1e6') * (Decimal('0.5') * neutronMass / (xData * electronCharge)) ** Decimal('0.5')
-
-        # Convert the result back to float before returning
-        return float(result)
+        return energyToTOF(float(xData), self.flightLength(length))
 
     def tof2e(self, xData: float, length: dict[float] = params['length']) -> float:
         """
@@ -358,22 +546,7 @@ class SpectraData:
         Returns:
             float: Mapped x-coord
         """
-        if self.length is not None:
-            length = self.length[self.plotType]
-
-        # Set the decimal context to avoid precision errors
-        getcontext().prec = 50
-
-        neutronMass = Decimal('1.68e-27')
-        electronCharge = Decimal('1.60e-19')  # Corrected electronCharge value
-        xData = Decimal(str(xData))  # Convert xData to Decimal
-        length = Decimal(str(length))  # Convert length to Decimal
-
-        # Perform calculations using Decimal
-        result = (length ** 2 * Decimal('1e12') * neutronMass) / (Decimal('2') * electronCharge * xData ** 2)
-
-        # Convert the result back to float before returning
-        return float(result)
+        return tofToEnergy(float(xData), self.flightLength(length))
 
     def updatePeaks(self, which: Literal['max', 'min', 'both'], newGraphData: bool = False) -> None:
         """
@@ -381,13 +554,16 @@ class SpectraData:
         ---------------
 
         Recalculates maxima coordinates and updates associated variables.
-        Used when threshold values have been altered.
+        Used when threshold values have been altered, in which case the candidate peaks, limits and integrals found
+        previously are reused and only filtered by the new threshold.
 
         Args:
             which (Literal[&#39;max&#39;, &#39;min&#39;, &#39;both&#39;]): Update maximas or minimas or both.
         """
         t1 = perf_counter()
         if newGraphData:
+            self._integrator = None
+            self._integralCache = None
             self.peakDetector: PeakDetector = PeakDetector(self.name, self.graphData, self.isImported,
                                                            smoothCoeff=1 if self.isImported else 12)
         self.maxima = np.array(self.peakDetector.maxima(self.threshold))
@@ -408,6 +584,87 @@ class SpectraData:
         t2 = perf_counter()
         print(f"{self.name} - updatePeaks {which} - Elapsed Time: {t2 - t1}")
 
+    def rescaleLength(self, length: dict[str, float], previousLength: dict[str, float] = None) -> None:
+        """
+        ``rescaleLength``
+        -----------------
+
+        Changes the flight path length of the instance. Times of flight scale linearly with the length, so the graph
+        data, peaks, limits and peak tables of a time of flight instance are rescaled in place rather than detected and
+        integrated again, every peak and limit staying on the same data point. Integrals and widths scale by the same
+        ratio, so every rank is unchanged.
+
+        Args:
+            - ``length`` (dict[str, float]): Flight path length of each plot type.
+
+            - ``previousLength`` (dict[str, float], optional): Lengths the instance was converted with, needed when the
+            instance shares a lengths dict edited in place. Defaults to the lengths of the instance.
+        """
+        previous = self.flightLength() if previousLength is None else previousLength[self.plotType]
+        self.length = length
+        current = self.flightLength()
+        if not self.isToF or previous == current or self.graphData.empty:
+            return
+
+        def rescale(x: ndarray) -> ndarray:
+            return np.asarray(rescaleTOF(x, previous, current))
+
+        showingMin = self.tableData is not None and self.minTableData is not None \
+            and self.tableData.equals(self.minTableData)
+        graphData = self.graphData.copy()
+        graphData[0] = rescale(graphData[0].to_numpy(dtype=float))
+        self.graphData = graphData
+        if self.peakDetector is not None:
+            self.peakDetector.rescaleX(rescale)
+        self._integrator = None
+        if self._integralCache is not None:
+            limits = rescale(np.array([key[1:] for key in self._integralCache], dtype=float).reshape(-1, 2)).tolist()
+            integrals = rescale(np.array([value[0] for value in self._integralCache.values()], dtype=float)).tolist()
+            self._integralCache = {(key[0], left, right): (integral, value[1]) for key, (left, right), integral, value
+                                   in zip(self._integralCache, limits, integrals, self._integralCache.values())}
+            self._integralCacheSource = self.graphData
+
+        column = "TOF (us)"
+        for which in ['max', 'min']:
+            peakList = self.maxima if which == 'max' else self.minima
+            limitsX = self.maxPeakLimitsX if which == 'max' else self.minPeakLimitsX
+            limitsY = self.maxPeakLimitsY if which == 'max' else self.minPeakLimitsY
+            table = (self.maxTableData if which == 'max' else self.minTableData).copy()
+            if peakList is None:
+                continue
+            peaksX = rescale(peakList[0])
+            # Table values of the peaks, rounded as in ``recalculateAllPeakData``.
+            tableValues = {float(np.format_float_positional(old, 6, fractional=False)): new
+                           for old, new in zip(peakList[0], peaksX.tolist())}
+            peakList = np.array((peaksX, peakList[1]), dtype=float).reshape(2, -1)
+            if limitsX is not None:
+                limitsX, limitsY = PeakDetector.transformLimits(limitsX, limitsY or {}, rescale)
+            if which == 'max':
+                self.maxima, self.maxPeakLimitsX, self.maxPeakLimitsY = peakList, limitsX, limitsY
+            else:
+                self.minima, self.minPeakLimitsX, self.minPeakLimitsY = peakList, limitsX, limitsY
+
+            rows = table.iloc[1:]
+            if column not in table.columns or rows.empty:
+                continue
+            values, integrals, widths = [], [], []
+            for value, integral, width in zip(rows[column], rows["Integral"], rows["Peak Width"]):
+                peakX = tableValues.get(value)
+                limits = None if limitsX is None else limitsX.get(peakX)
+                exact = None if limits is None or self._integralCache is None \
+                    else self._integralCache.get((which, *limits))
+                values.append(peakX if peakX is not None else float(rescale(value)))
+                integrals.append(exact[0] if exact is not None else float(rescale(integral)))
+                widths.append(limits[1] - limits[0] if limits is not None else float(rescale(width)))
+            for name, columnValues in [(column, values), ("Integral", integrals), ("Peak Width", widths)]:
+                table.loc[rows.index, name] = [float(np.format_float_positional(value, 6, fractional=False))
+                                               for value in columnValues]
+            if which == 'max':
+                self.maxTableData = table
+            else:
+                self.minTableData = table
+        self.changePeakTableData('min' if showingMin else 'max')
+
     def onDistChange(self) -> None:
         """
         ``onDistChange``
@@ -418,13 +675,43 @@ class SpectraData:
         """
         if not self.distChanging and not ('element' in self.name or 'compound' in self.name):
             return
-        plotType = "n-tot" if 'n-tot' in self.name else "n-g"
-        self.weightedIsoGraphData = {name: pandas.read_csv(resource_path(
-            f"{params['dir_graphData']}{name}{'' if self.isCompound else '_' + plotType}.csv"),
-            header=None) * [1, dist]
-            for name, dist in self.distributions.items() if dist != 0}
+        self.graphData = self.mixedGraphData()
+        self.graphDataX = self.mixer.grid
+
+    @property
+    def mixer(self) -> DistributionMixer:
+        """
+        ``mixer``
+        ---------
+
+        Isotopes of the element, or elements of the compound, resampled once onto their union grid and shared by every
+        distribution of this spectra.
 
-        self.setGraphDataFromDist(self.weightedIsoGraphData)
+        Returns:
+            DistributionMixer: Cached mixer of this instance.
+        """
+        isotopes = list(dict.fromkeys([*(self.defaultDist or {}), *(self.distributions or {})]))
+        return mixerCache.get(self.name, isotopes, self.isCompound, self.threshold)
+
+    def mixedGraphData(self, distributions: dict[str, float] = None) -> DataFrame:
+        """
+        ``mixedGraphData``
+        ------------------
+
+        Args:
+            ``distributions`` (dict[str, float], optional): Weight of each isotope. Defaults to the distributions of
+            this instance.
+
+        Returns:
+            DataFrame: Weighted sum of the isotopes, in the domain of this instance.
+        """
+        mixer = self.mixer
+        graphData = mixer.graphData(self.distributions if distributions is None else distributions)
+        if self.isToF:
+            # Time of flight decreases with energy, so the converted grid is already sorted once reversed.
+            graphData = graphData[::-1]
+            graphData[:, 0] = convertedAxis(f"{self.name}-mixed", graphData[:, 0], self.flightLength())
+        return DataFrame(graphData)
 
     def setGraphDataFromDist(self, weightedGraphData: dict[DataFrame]) -> None:
         """
@@ -438,24 +725,18 @@ class SpectraData:
         Args:
             ``weightedGraphData`` (list[DataFrame]): List of graph data for each element or isotope to be summed.
         """
-
-        graphDataX = []
-        for name, graphData in weightedGraphData.items():
-            peakD = PeakDetector(name, graphData)
-            graphDataX += peakD.maxima(self.threshold)[0] if self.maxima is None else list(self.maxima[0])
-            graphDataX += peakD.minima()[0] if self.minima is None else list(self.minima[0])
-            graphDataX = list(getSpacedElements(np.array(graphData.iloc[:, 0]),
-                                                graphData.shape[0] // 2)) + graphDataX
-        self.graphDataX = np.unique(graphDataX)
+        weightedGraphData = {name: graphData.sort_values(0).to_numpy(dtype=float)
+                             for name, graphData in weightedGraphData.items()}
+        self.graphDataX = unionGrid(weightedGraphData, self.threshold)
 
         isoY = np.zeros(shape=(len(weightedGraphData), self.graphDataX.shape[0]))
 
         for i, graphData in enumerate(weightedGraphData.values()):
-            isoY[i] = np.interp(self.graphDataX, graphData.iloc[:, 0], graphData.iloc[:, 1])
+            isoY[i] = np.interp(self.graphDataX, graphData[:, 0], graphData[:, 1])
 
         self.graphData = pandas.DataFrame(sorted(zip(self.graphDataX, np.sum(isoY, axis=0))))
         if self.isToF:
-            self.graphData[0] = self.energyToTOF(self.graphData[0], length=self.length)
+            self.graphData[0] = convertedAxis(self.name, self.graphData[0], self.flightLength())
             self.graphData.sort_values(0, ignore_index=True, inplace=True)
 
     def hideAnnotations(self, globalHide: bool = False) -> None:
@@ -535,8 +816,8 @@ class SpectraData:
         ``peakIntegral``
         ----------------
 
-        Calculates the integral of a peak within the region specificed by the limits, uses the simpson rule and removes
-        a trapezium created between the axis and the coordinates of the limits.
+        Calculates the integral of a peak within the region specificed by the limits, using the prefix-sum integral of
+        the graph data, and removes a trapezium created between the axis and the coordinates of the limits.
 
         Args:
             - ``leftLimit`` (float): X-Coord of the left limit of integration
@@ -549,12 +830,78 @@ class SpectraData:
             tuple[float, str]: (Integral Value, Relevant Isotope)
         """
         if "element" in self.name:
-            integrator = IsotopeIntegrator(self)
-            return integrator.peak_integral(leftLimit, rightLimit, which)
+            return self.integrator.peak_integral(leftLimit, rightLimit, which)
         else:
             if leftLimit == rightLimit:
                 return (0, 'none')
-            return (integrate_simps(self.graphData, leftLimit, rightLimit, which), 'none')
+            return (float(self.cumulativeIntegral.integrate(leftLimit, rightLimit, which)), 'none')
+
+    def peakIntegrals(self, limits: ndarray | list[tuple[float]],
+                      which: Literal['max', 'min'] = 'max') -> list[tuple[float, str]]:
+        """
+        ``peakIntegrals``
+        -----------------
+
+        Batch form of ``peakIntegral``, integrating every peak in a single call. For elements the isotope data is loaded
+        once per instance and shared between all peaks. Integrals are cached by their limits until the graph data
+        changes, so only new peaks are integrated when the threshold changes.
+
+        Args:
+            - ``limits`` (ndarray | list[tuple[float]]): (P, 2) array of the left and right limit of each peak.
+
+            - ``which`` (Literal): Whether getting integrals of max or min
+
+        Returns:
+            list[tuple[float, str]]: (Integral Value, Relevant Isotope) of each peak.
+        """
+        if self._integralCache is None or self._integralCacheSource is not self.graphData:
+            self._integralCache = {}
+            self._integralCacheSource = self.graphData
+        limits = np.array(limits, dtype=float).reshape(-1, 2)
+        keys = [(which, left, right) for left, right in limits]
+        missing = [i for i, key in enumerate(keys) if key not in self._integralCache]
+        if missing:
+            newLimits = limits[missing]
+            if "element" in self.name:
+                totals, relevantIsotopes = self.integrator.peak_integrals(newLimits, which)
+                integrals = [(float(total), isotope) for total, isotope in zip(totals, relevantIsotopes)]
+            else:
+                integrals = [(float(integral), 'none') for integral in
+                             self.cumulativeIntegral.integrate(newLimits[:, 0], newLimits[:, 1], which)]
+            self._integralCache.update(zip([keys[i] for i in missing], integrals))
+        return [self._integralCache[key] for key in keys]
+
+    @property
+    def cumulativeIntegral(self) -> CumulativeIntegral:
+        """
+        ``cumulativeIntegral``
+        ----------------------
+
+        Prefix-sum integral index of the graph data, rebuilt only when the graph data is replaced.
+
+        Returns:
+            CumulativeIntegral: Integral index of this instance.
+        """
+        if self._cumulativeIntegral is None or self._cumulativeIntegralSource is not self.graphData:
+            self._cumulativeIntegral = CumulativeIntegral(self.graphData.iloc[:, 0], self.graphData.iloc[:, 1])
+            self._cumulativeIntegralSource = self.graphData
+        return self._cumulativeIntegral
+
+    @property
+    def integrator(self) -> IsotopeIntegrator:
+        """
+        ``integrator``
+        --------------
+
+        Integration session over the isotopes of an element, created on first use and reused for every peak until the
+        graph data or flight length changes.
+
+        Returns:
+            IsotopeIntegrator: Integrator of this instance.
+        """
+        if self._integrator is None:
+            self._integrator = IsotopeIntegrator(self)
+        return self._integrator
 
     def recalculatePeakData(self, peak: float, which: Literal['max', 'min'] = 'max') -> None:
         """
@@ -678,13 +1025,7 @@ class SpectraData:
             peakList = self.minima
             peakLimitsX = self.minPeakLimitsX
         t1 = perf_counter()
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {executor.submit(
-                self.peakIntegral,
-                peakLimitsX[peak][0],
-                peakLimitsX[peak][1],
-                which=which): peak for peak in peakLimitsX.keys()}
-            integrals = {peak: future.result() for future, peak in futures.items()}
+        integrals = dict(zip(peakLimitsX.keys(), self.peakIntegrals(list(peakLimitsX.values()), which=which)))
 
         t2 = perf_counter()
         print(f"Integral Calc - {t2 - t1}")
@@ -714,11 +1055,14 @@ class SpectraData:
         print(f"Peak Width Rank Calc - {t2 - t1}")
         t1 = perf_counter()
 
+        # Index of the first occurrence of each peak position.
+        valueRank = {peak: i for i, peak in reversed(list(enumerate(peakList[0])))}
+
         tableDataTemp = [
             [
                 integralRanks[x],                                                           # Rank by Integral
                 float(np.format_float_positional(x, 6, fractional=False)),                  # Value
-                f"({np.where(peakList[0] == x)[0][0]})",                                    # Rank by Value
+                f"({valueRank[x]})",                                                        # Rank by Value
                 float(np.format_float_positional(integrals[x][0], 6, fractional=False)),    # Integral
                 float(np.format_float_positional(peakWidth[x], 6, fractional=False)),       # Peak Width
                 f"({peakWidthRank[x]})",                                                    # Rank by Peak Width
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+from pandas import DataFrame
+
+from project.settings import params
+from project.spectra.SpectrumStore import loadSpectrum
+
+
+class SpectrumRepository:
+    """
+    Process-wide in-memory cache of spectra graph data. Arrays are handed out read-only so they can be shared between
+    every caller, spectra are evicted in least recently used order once the resident bytes exceed the budget.
+    """
+
+    def __init__(self, budget: int = params['spectrum_memory_budget'],
+                 storeDir: str = params['dir_binaryData']) -> None:
+        self.budget: int = budget
+        self.storeDir: str = storeDir
+        self.residentBytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._spectra: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._invalidateHooks: list[Callable[[str], None]] = []
+        self._lock = threading.RLock()
+
+    def get(self, name: str, directory: str = params['dir_graphData']) -> np.ndarray:
+        """
+        ``get``
+        -------
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``directory`` (str, optional): Directory of the source CSV file. Defaults to params['dir_graphData'].
+
+        Raises:
+            ``FileNotFoundError``: No binary or CSV copy of the spectra exists.
+            ``EmptyDataError``: The CSV file of the spectra is empty.
+
+        Returns:
+            np.ndarray: Read-only (N, 2) array of the spectra graph data.
+        """
+        key = (directory, name)
+        with self._lock:
+            data = self._spectra.get(key)
+            if data is not None:
+                self._spectra.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        data = np.array(loadSpectrum(name, directory, self.storeDir), dtype=np.float64)
+        data.flags.writeable = False
+        with self._lock:
+            if key in self._spectra:
+                return self._spectra[key]
+            if data.nbytes <= self.budget:
+                self._spectra[key] = data
+                self.residentBytes += data.nbytes
+                self._evict()
+        return data
+
+    def getGraphData(self, name: str, directory: str = params['dir_graphData']) -> DataFrame:
+        """
+        ``getGraphData``
+        ----------------
+
+        Writable DataFrame copy of the spectra graph data, matching the layout of ``read_csv(filepath, header=None)``.
+
+        Args:
+            ``name`` (str): Spectra name.
+            ``directory`` (str, optional): Directory of the source CSV file. Defaults to params['dir_graphData'].
+
+        Returns:
+            DataFrame: Graph data with columns 0 and 1.
+        """
+        return DataFrame(self.get(name, directory).copy())
+
+    def invalidate(self, name: str = None) -> None:
+        """
+        ``invalidate``
+        --------------
+
+        Drops a spectra, or every spectra, from the repository so it is reloaded on next access. Caches derived from
+        the graph data are invalidated with it, see ``onInvalidate``.
+
+        Args:
+            ``name`` (str, optional): Spectra name, if None the repository is emptied. Defaults to None.
+        """
+        with self._lock:
+            for key in [key for key in self._spectra if name is None or key[1] == name]:
+                self.residentBytes -= self._spectra.pop(key).nbytes
+            hooks = list(self._invalidateHooks)
+        for hook in hooks:
+            hook(name)
+
+    def onInvalidate(self, hook: Callable[[str], None]) -> None:
+        """
+        ``onInvalidate``
+        ----------------
+
+        Args:
+            ``hook`` (Callable[[str], None]): Called with the spectra name, or None, whenever spectra are invalidated.
+        """
+        with self._lock:
+            self._invalidateHooks.append(hook)
+
+    def setBudget(self, budget: int) -> None:
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.residentBytes > self.budget and self._spectra:
+            _, data = self._spectra.popitem(last=False)
+            self.residentBytes -= data.nbytes
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        ``stats``
+        ---------
+
+        Returns:
+            dict[str, int]: Number of resident spectra, resident bytes, budget, hits, misses and evictions.
+        """
+        with self._lock:
+            return {'spectra': len(self._spectra),
+                    'residentBytes': self.residentBytes,
+                    'budget': self.budget,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return any(key[1] == name for key in self._spectra)
+
+
+spectrumRepository = SpectrumRepository()
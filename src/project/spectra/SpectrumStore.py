@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import os
+from time import perf_counter
+
+import numpy as np
+from pandas import DataFrame, read_csv
+from pandas.errors import EmptyDataError
+
+from project.helpers.resourcePath import resource_path
+from project.settings import params
+
+
+def storePath(name: str, storeDir: str = params['dir_binaryData']) -> str:
+    """
+    ``storePath``
+    -------------
+
+    Args:
+        ``name`` (str): Spectra name, i.e. '29-Cu-63_n-g'.
+        ``storeDir`` (str, optional): Directory of the binary spectrum store. Defaults to params['dir_binaryData'].
+
+    Returns:
+        str: Filepath of the binary array for the given spectra.
+    """
+    return resource_path(f"{storeDir}{name}.npy")
+
+
+def saveSpectrum(name: str, data: np.ndarray | DataFrame, storeDir: str = params['dir_binaryData']) -> str:
+    """
+    ``saveSpectrum``
+    ----------------
+
+    Writes the first two columns of the given graph data to the binary store as a contiguous (N, 2) float64 array.
+    The array is written to a temporary file first and then moved into place, so a reader will never memory-map a
+    partially written file.
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``data`` (np.ndarray | DataFrame): Graph data, x-values in the first column, y-values in the second.
+        ``storeDir`` (str, optional): Directory of the binary spectrum store. Defaults to params['dir_binaryData'].
+
+    Returns:
+        str: Filepath of the written array.
+    """
+    filepath = storePath(name, storeDir)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    array = np.ascontiguousarray(np.asarray(data, dtype=np.float64)[:, :2])
+    tempPath = f"{filepath[:-4]}.tmp.npy"
+    np.save(tempPath, array)
+    os.replace(tempPath, filepath)
+    return filepath
+
+
+def loadSpectrum(name: str, directory: str = params['dir_graphData'],
+                 storeDir: str = params['dir_binaryData']) -> np.ndarray:
+    """
+    ``loadSpectrum``
+    ----------------
+
+    Retrieves the graph data of a spectra as a read-only (N, 2) float64 array. When the binary store holds an up to
+    date copy of the spectra it is memory-mapped, only the pages touched are read from disk. Otherwise the CSV file
+    is parsed as before.
+
+    Args:
+        ``name`` (str): Spectra name, i.e. 'element_29-Cu_n-g'.
+        ``directory`` (str, optional): Directory of the source CSV file. Defaults to params['dir_graphData'].
+        ``storeDir`` (str, optional): Directory of the binary spectrum store. Defaults to params['dir_binaryData'].
+
+    Raises:
+        ``FileNotFoundError``: Neither a binary nor a CSV copy of the spectra exists.
+        ``EmptyDataError``: The CSV file of the spectra is empty.
+
+    Returns:
+        np.ndarray: Graph data, x-values in the first column, y-values in the second.
+    """
+    csvPath = resource_path(f"{directory}{name}.csv")
+    binPath = storePath(name, storeDir)
+    try:
+        binTime = os.stat(binPath).st_mtime
+    except OSError:
+        binTime = None
+    if binTime is not None:
+        try:
+            isStale = os.stat(csvPath).st_mtime > binTime
+        except OSError:
+            isStale = False
+        if not isStale:
+            return np.load(binPath, mmap_mode='r')
+    return read_csv(csvPath, header=None).iloc[:, :2].to_numpy(dtype=np.float64)
+
+
+def sourceKey(name: str, directory: str = params['dir_graphData'],
+              storeDir: str = params['dir_binaryData']) -> tuple[float, int] | None:
+    """
+    ``sourceKey``
+    -------------
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``directory`` (str, optional): Directory of the source CSV file. Defaults to params['dir_graphData'].
+        ``storeDir`` (str, optional): Directory of the binary spectrum store. Defaults to params['dir_binaryData'].
+
+    Returns:
+        tuple[float, int] | None: Modification time and size of the CSV file of the spectra, or of its binary copy
+        when there is no CSV file, None if neither exists.
+    """
+    for filepath in [resource_path(f"{directory}{name}.csv"), storePath(name, storeDir)]:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            continue
+        return stat.st_mtime, stat.st_size
+    return None
+
+
+def loadGraphData(name: str, directory: str = params['dir_graphData'],
+                  storeDir: str = params['dir_binaryData']) -> DataFrame:
+    """
+    ``loadGraphData``
+    -----------------
+
+    DataFrame counterpart of ``loadSpectrum``, matching the layout of ``read_csv(filepath, header=None)``.
+
+    Args:
+        ``name`` (str): Spectra name.
+        ``directory`` (str, optional): Directory of the source CSV file. Defaults to params['dir_graphData'].
+        ``storeDir`` (str, optional): Directory of the binary spectrum store. Defaults to params['dir_binaryData'].
+
+    Returns:
+        DataFrame: Graph data with columns 0 and 1.
+    """
+    return DataFrame(np.array(loadSpectrum(name, directory, storeDir)))
+
+
+def buildSpectrumStore(directories: list[str] = None, storeDir: str = params['dir_binaryData'],
+                       overwrite: bool = False) -> list[str]:
+    """
+    ``buildSpectrumStore``
+    ----------------------
+
+    One-off conversion of the CSV graph data into the binary spectrum store. Files with an up to date binary copy are
+    skipped unless ``overwrite`` is set, empty CSV files are skipped so they keep raising ``EmptyDataError`` on load.
+
+    Args:
+        ``directories`` (list[str], optional): Directories of CSV files to convert. Defaults to the Graph Data and
+        Compound Data directories.
+        ``storeDir`` (str, optional): Directory of the binary spectrum store. Defaults to params['dir_binaryData'].
+        ``overwrite`` (bool, optional): Whether to reconvert files which are already up to date. Defaults to False.
+
+    Returns:
+        list[str]: Names of the converted spectra.
+    """
+    if directories is None:
+        directories = [params['dir_graphData'], params['dir_compoundGraphData']]
+    converted = []
+    for directory in directories:
+        directoryPath = resource_path(directory)
+        if not os.path.isdir(directoryPath):
+            continue
+        for filename in sorted(os.listdir(directoryPath)):
+            if not filename.endswith('.csv'):
+                continue
+            name = filename[:-4]
+            binPath = storePath(name, storeDir)
+            csvPath = os.path.join(directoryPath, filename)
+            if not overwrite and os.path.exists(binPath) and os.stat(binPath).st_mtime >= os.stat(csvPath).st_mtime:
+                continue
+            try:
+                data = read_csv(csvPath, header=None).iloc[:, :2].to_numpy(dtype=np.float64)
+            except EmptyDataError:
+                continue
+            saveSpectrum(name, data, storeDir)
+            converted.append(name)
+    return converted
+
+
+if __name__ == '__main__':
+    t1 = perf_counter()
+    convertedSpectra = buildSpectrumStore(overwrite=True)
+    t2 = perf_counter()
+    print(f"Converted {len(convertedSpectra)} spectra - Elapsed Time: {t2 - t1}")
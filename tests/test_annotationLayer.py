@@ -0,0 +1,62 @@
+import sys
+import os
+import numpy as np
+from unittest import TestCase, main
+
+from matplotlib.figure import Figure
+from PyQt6.QtWidgets import QApplication
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.myMatplotlib.AnnotationLayer import AnnotationLayer
+from project.myMatplotlib.CustomFigureCanvas import FigureCanvas
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestAnnotationLayer(TestCase):
+
+    def test_update(self):
+        figure = Figure()
+        ax = figure.add_subplot()
+        ax.plot(np.linspace(1, 10, 1000), np.linspace(1, 10, 1000))
+        canvas = FigureCanvas(figure, contextConnect=False)
+        layer = AnnotationLayer(ax)
+        annotation = layer.annotate(text='0', xy=(5, 5), size=20)
+        self.assertIsNone(layer.background)
+        layer.update()
+        app.processEvents()
+        self.assertIsNotNone(layer.background)
+        labelled = np.array(canvas.buffer_rgba())
+
+        executed = canvas.drawsExecuted
+        annotation.set_visible(False)
+        layer.update()
+        unlabelled = np.array(canvas.buffer_rgba())
+        annotation.set_visible(True)
+        layer.update()
+        app.processEvents()
+        # Labels are redrawn over the background without drawing the figure again.
+        self.assertEqual(canvas.drawsExecuted, executed)
+        self.assertFalse(np.array_equal(labelled, unlabelled))
+        np.testing.assert_array_equal(np.array(canvas.buffer_rgba()), labelled)
+
+        # The background misses changes awaiting a full draw, the labels are drawn with them instead.
+        ax.plot([1, 10], [10, 1])
+        canvas.requestDraw()
+        annotation.set_visible(False)
+        layer.update()
+        np.testing.assert_array_equal(np.array(canvas.buffer_rgba()), labelled)
+        app.processEvents()
+        self.assertEqual(canvas.drawsExecuted, executed + 1)
+        self.assertFalse(canvas.drawPending)
+
+        layer.disconnect()
+        self.assertIsNone(layer.background)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import sys
+import os
+from unittest import TestCase, main
+
+from matplotlib.figure import Figure
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.myMatplotlib.ArtistRegistry import ArtistRegistry
+
+
+class TestArtistRegistry(TestCase):
+
+    def test_registry(self):
+        ax = Figure().add_subplot()
+        artists = ArtistRegistry()
+        for title in ["29-Cu_n-g-Energy", "48-Cd_n-g-Energy"]:
+            artists.add(title, 'line', ax.plot([1, 2], [3, 4], label=title)[0])
+            artists.add(title, 'threshold', ax.axhline(3))
+        line = artists.first("29-Cu_n-g-Energy", 'line')
+        self.assertEqual(line.get_label(), "29-Cu_n-g-Energy")
+
+        artists.setVisible("29-Cu_n-g-Energy", False, ['threshold'])
+        self.assertFalse(artists.first("29-Cu_n-g-Energy", 'threshold').get_visible())
+        self.assertTrue(artists.first("48-Cd_n-g-Energy", 'threshold').get_visible())
+        self.assertTrue(line.get_visible())
+
+        # Removing one role of every spectra, then every role of one spectra.
+        artists.remove(roles=['threshold'])
+        self.assertEqual(len(ax.lines), 2)
+        self.assertFalse(artists.hasRole('threshold'))
+        artists.remove("29-Cu_n-g-Energy")
+        self.assertEqual(ax.lines[0].get_label(), "48-Cd_n-g-Energy")
+        self.assertEqual(artists.get("29-Cu_n-g-Energy", 'line'), [])
+
+        # Artists of a cleared axes are forgotten without being removed again.
+        ax.clear()
+        artists.remove()
+        self.assertFalse(artists.hasRole('line'))
+
+
+if __name__ == '__main__':
+    main()
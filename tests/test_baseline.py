@@ -0,0 +1,36 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.Baseline import baselineMethods, getBaseline
+
+filepath = f"{os.path.dirname(__file__)}"
+
+
+class TestBaseline(TestCase):
+
+    y = pd.read_csv(f"{filepath}/test_data/graphData/element_29-Cu_n-g.csv", header=None)[1].to_numpy()
+
+    def test_methods(self):
+        reference = getBaseline(self.y, 'peakutils')
+        for method in baselineMethods:
+            baseline = getBaseline(self.y, method)
+            self.assertEqual(baseline.shape, self.y.shape)
+            self.assertTrue(np.isfinite(baseline).all())
+        # The decimated polynomial fit closely follows the full resolution fit.
+        deviation = np.sqrt(np.mean((getBaseline(self.y, 'polynomial') - reference) ** 2)) / np.ptp(self.y)
+        self.assertLess(deviation, 1e-3)
+
+    def test_unknownMethod(self):
+        with self.assertRaises(ValueError):
+            getBaseline(self.y, 'unknown')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+from unittest import TestCase, main
+from PyQt6.QtWidgets import QApplication
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.BatchDetection import batchDetect, getThreshold
+from project.myPyQt.BatchDetectionThread import BatchDetectionThread
+from project.spectra.PeakDetection import PeakDetector
+
+filepath = f"{os.path.dirname(__file__)}"
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestBatchDetection(TestCase):
+
+    spectra = {name: pd.read_csv(f"{filepath}/test_data/graphData/{name}.csv", header=None).to_numpy()
+               for name in ['element_29-Cu_n-g', 'element_48-Cd_n-g']}
+
+    def test_batchDetect(self):
+        completed = []
+        results = batchDetect(self.spectra, {'element_29-Cu_n-g': 100, 'element_48-Cd_n-g': 50}, workers=2,
+                              callback=lambda name, result: completed.append(name))
+        self.assertEqual(list(results), list(self.spectra))
+        self.assertEqual(sorted(completed), sorted(self.spectra))
+        for name, threshold in [('element_29-Cu_n-g', 100), ('element_48-Cd_n-g', 50)]:
+            graphData = pd.DataFrame(self.spectra[name]).sort_values(0, ignore_index=True)
+            peakDetector = PeakDetector(name, graphData)
+            np.testing.assert_array_equal(results[name]['maxima'], np.array(peakDetector.maxima(threshold)))
+            np.testing.assert_array_equal(results[name]['minima'], np.array(peakDetector.minima()))
+            peakDetector.definePeakLimits('max')
+            np.testing.assert_array_equal(results[name]['maxLimits'], list(peakDetector.maxPeakLimitsX.values()))
+            np.testing.assert_array_equal(results[name]['maxLimitsY'], list(peakDetector.maxPeakLimitsY.values()))
+
+        # Largest spectra are handed out first.
+        completed.clear()
+        batchDetect(self.spectra, workers=1, callback=lambda name, result: completed.append(name))
+        self.assertEqual(completed, sorted(self.spectra, key=lambda name: -self.spectra[name].shape[0]))
+
+    def test_getThreshold(self):
+        self.assertEqual(getThreshold('29-Cu-63_n-tot'), 20)
+        self.assertEqual(getThreshold('element_29-Cu_n-g'), 4.3)
+        self.assertEqual(getThreshold('48-Cd-113_n-g'), 100)
+
+    def test_batchDetectionThread(self):
+        completed, detected = [], []
+        thread = BatchDetectionThread(self.spectra, 50, workers=1)
+        thread.progress.connect(lambda name, result: completed.append(name))
+        thread.detected.connect(detected.append)
+        thread.start()
+        self.assertTrue(thread.wait(60000))
+        # Results are posted back to this thread's event loop.
+        app.processEvents()
+        self.assertEqual(sorted(completed), sorted(self.spectra))
+        self.assertEqual(list(detected[0]), list(self.spectra))
+        np.testing.assert_array_equal(detected[0]['element_29-Cu_n-g']['maxima'],
+                                      batchDetect(self.spectra, 50, workers=1)['element_29-Cu_n-g']['maxima'])
+
+
+if __name__ == '__main__':
+    main()
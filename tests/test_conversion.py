@@ -0,0 +1,56 @@
+import sys
+import os
+import numpy as np
+from decimal import Decimal, localcontext
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.Conversion import (AxisCache, ELECTRON_CHARGE, NEUTRON_MASS, energyToTOF, rescaleTOF,
+                                        tofToEnergy)
+
+
+class TestConversion(TestCase):
+
+    energy = 10 ** np.random.default_rng(0).uniform(-5, 7, 500)
+    length = 23.404
+
+    def test_precision(self):
+        # Correctly rounded against a 60 digit evaluation of the exact binary inputs.
+        with localcontext() as context:
+            context.prec = 60
+            flight = (Decimal('0.5') * NEUTRON_MASS / ELECTRON_CHARGE).sqrt()
+            coefficient = Decimal(str(self.length)) * Decimal('1e6') * flight
+            expectedTof = [float(coefficient / Decimal(x).sqrt()) for x in self.energy]
+            expectedEnergy = [float(coefficient ** 2 / Decimal(t) ** 2) for t in expectedTof]
+            expectedRescaled = [float(Decimal(t) * Decimal('22.804') / Decimal('23.404')) for t in expectedTof]
+        np.testing.assert_array_equal(energyToTOF(self.energy, self.length), expectedTof)
+        np.testing.assert_array_equal(tofToEnergy(expectedTof, self.length), expectedEnergy)
+        np.testing.assert_array_equal(rescaleTOF(expectedTof, 23.404, 22.804), expectedRescaled)
+        self.assertIsInstance(energyToTOF(1.0, self.length), float)
+        self.assertEqual(energyToTOF(self.energy[0], self.length), expectedTof[0])
+
+    def test_axisCache(self):
+        cache = AxisCache()
+        tof = cache.get('29-Cu-63_n-g', self.energy, self.length)
+        self.assertFalse(tof.flags.writeable)
+        self.assertIs(cache.get('29-Cu-63_n-g', self.energy.copy(), self.length), tof)
+        self.assertEqual(cache.stats()['hits'], 1)
+        # A different length or different data for the same spectra is converted again.
+        self.assertIsNot(cache.get('29-Cu-63_n-g', self.energy, 22.804), tof)
+        changed = cache.get('29-Cu-63_n-g', self.energy * 2, self.length)
+        np.testing.assert_array_equal(changed, energyToTOF(self.energy * 2, self.length))
+        self.assertEqual(cache.stats()['axes'], 2)
+
+        cache = AxisCache(budget=self.energy.nbytes * 3)
+        cache.get('a', self.energy, self.length)
+        cache.get('b', self.energy, self.length)
+        self.assertEqual(cache.stats()['axes'], 1)
+        cache.invalidate()
+        self.assertEqual(cache.stats()['residentBytes'], 0)
+
+
+if __name__ == '__main__':
+    main()
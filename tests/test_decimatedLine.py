@@ -0,0 +1,51 @@
+import sys
+import os
+import numpy as np
+from unittest import TestCase, main
+from matplotlib.figure import Figure
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.myMatplotlib.DecimatedLine import decimationIndices, plotDecimated
+
+
+class TestDecimatedLine(TestCase):
+
+    x = np.linspace(1, 1e4, 200000)
+    y = np.random.default_rng(0).uniform(0.1, 10, x.size)
+
+    def test_decimationIndices(self):
+        indices = decimationIndices(self.x, self.y, 100)
+        self.assertLessEqual(indices.size, 400)
+        # Every pixel column keeps its lowest and highest sample.
+        buckets = np.minimum(((self.x - self.x[0]) * (100 / (self.x[-1] - self.x[0]))).astype(int), 99)
+        for bucket in range(100):
+            column = buckets == bucket
+            self.assertIn(np.flatnonzero(column)[self.y[column].argmax()], indices)
+            self.assertIn(np.flatnonzero(column)[self.y[column].argmin()], indices)
+
+    def test_redecimateOnZoom(self):
+        figure = Figure(figsize=(4, 3), dpi=100)
+        ax = figure.add_subplot()
+        line = plotDecimated(ax, self.x, self.y, color='k')
+        figure.canvas.draw()
+        pixels = int(ax.bbox.width)
+        self.assertLessEqual(line.get_xdata().size, 4 * pixels + 4)
+        self.assertEqual(ax.dataLim.x0, self.x[0])
+        self.assertEqual(ax.dataLim.y1, self.y.max())
+
+        ax.set_xlim(100, 200)
+        visible = (line.get_xdata() >= 100) & (line.get_xdata() <= 200)
+        inView = (self.x >= 100) & (self.x <= 200)
+        self.assertLessEqual(line.get_xdata().size, 4 * pixels + 6)
+        self.assertEqual(line.get_ydata()[visible].max(), self.y[inView].max())
+        self.assertEqual(line.get_ydata()[visible].min(), self.y[inView].min())
+
+        line.set_data(self.x[:100], self.y[:100])
+        np.testing.assert_array_equal(line.fullData[0], self.x[:100])
+
+
+if __name__ == '__main__':
+    main()
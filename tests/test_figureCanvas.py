@@ -0,0 +1,35 @@
+import sys
+import os
+from unittest import TestCase, main
+
+from matplotlib.figure import Figure
+from PyQt6.QtWidgets import QApplication
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.myMatplotlib.CustomFigureCanvas import FigureCanvas
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestFigureCanvas(TestCase):
+
+    def test_requestDraw(self):
+        figure = Figure()
+        figure.add_subplot().plot([1, 2, 3])
+        canvas = FigureCanvas(figure, contextConnect=False)
+        app.processEvents()
+        executed = canvas.drawsExecuted
+        for _ in range(5):
+            canvas.requestDraw()
+        self.assertEqual(canvas.drawsExecuted, executed)
+        app.processEvents()
+        # Requests made within one turn of the event loop share a single draw.
+        self.assertEqual(canvas.drawStats(), {'requested': 5, 'executed': executed + 1})
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,11 @@ sys.path.append(os.path.abspath("./src/project/myPyQt"))
 
 from project.helpers.getRandomColor import getRandomColor
 from project.helpers.interpName import interpName
+from project.helpers.integration import CumulativeIntegral
+
+import numpy as np
+from math import erf
+from scipy.integrate import simpson
 
 
 class TestHelpers(TestCase):
@@ -36,6 +41,26 @@ class TestHelpers(TestCase):
         self.assertTrue(interpName(222)['nNum'] is None)
         self.assertTrue(interpName('hbdfv -df0=f-12   \n\t  dn1klv dfs-=fa s-df=a')['nNum'] is None)
 
+    def test_cumulativeIntegral(self):
+        x = np.linspace(0, 10, 2001)
+        y = 1 + np.exp(-(x - 5) ** 2)
+        index = CumulativeIntegral(x, y)
+
+        # Area of the gaussian above the chord between the limits.
+        self.assertAlmostEqual(float(index.integrate(2, 8)), np.sqrt(np.pi) * erf(3) - 6 * np.exp(-9), places=5)
+        xw, yw = x[(x >= 3) & (x <= 7)], y[(x >= 3) & (x <= 7)]
+        self.assertAlmostEqual(float(index.integrate(xw[0], xw[-1])),
+                               simpson(yw, x=xw) - (xw[-1] - xw[0]) * (yw[0] + yw[-1]) / 2, places=5)
+        self.assertAlmostEqual(float(index.areaTo(x[-1])), np.trapz(y, x))
+
+        lefts, rights = np.array([1, 4, 6, 5]), np.array([9, 6, 4, 5])
+        integrals = index.integrate(lefts, rights)
+        self.assertEqual(integrals.shape, (4,))
+        self.assertEqual(integrals[2], 0)
+        self.assertEqual(integrals[3], 0)
+        self.assertEqual(float(index.integrate(3, 7, 'min')), 0)
+        self.assertTrue(np.allclose(integrals[:2], [float(index.integrate(1, 9)), float(index.integrate(4, 6))]))
+
 
 if __name__ == '__main__':
     main()
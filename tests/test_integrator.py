@@ -0,0 +1,98 @@
+import sys
+import os
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.helpers.integration import CumulativeIntegral
+from project.settings import params
+from project.spectra.Conversion import energyToTOF
+from project.spectra.Integrator import IntegralCache, IsotopeIntegrator, integralCache
+from project.spectra.SpectrumRepository import spectrumRepository
+
+
+class TestIsotopeIntegrator(TestCase):
+
+    distributions = {"29-Cu-63": 0.6915, "29-Cu-65": 0.3085, "29-Cu-67": 0.0}
+
+    def integrator(self, plotType: str, isToF: bool, length: float = 23.404) -> IsotopeIntegrator:
+        return IsotopeIntegrator(SimpleNamespace(name=f"element_29-Cu_{plotType}",
+                                                 distributions=self.distributions,
+                                                 plotType=plotType,
+                                                 isToF=isToF,
+                                                 graphDataDir=params['dir_graphData'],
+                                                 flightLength=lambda: length))
+
+    def test_integralMatrix(self):
+        for plotType, isToF in [('n-g', False), ('n-tot', False), ('n-g', True)]:
+            integrator = self.integrator(plotType, isToF)
+            self.assertEqual(integrator.isotopes, ["29-Cu-63", "29-Cu-65"])
+            integrals = {}
+            for name in integrator.isotopes:
+                data = spectrumRepository.get(f"{name}_{plotType}")
+                x = energyToTOF(data[:, 0], 23.404) if isToF else data[:, 0]
+                integrals[name] = CumulativeIntegral(x, data[:, 1])
+            # The window where each isotope's peak integral most exceeds the other's, and an empty window.
+            limits = []
+            for name, other in [integrator.isotopes, integrator.isotopes[::-1]]:
+                lefts, rights = integrals[name].x * 0.99, integrals[name].x * 1.01
+                excess = self.distributions[name] * integrals[name].integrate(lefts, rights) \
+                    - self.distributions[other] * integrals[other].integrate(lefts, rights)
+                limits.append((lefts[excess.argmax()], rights[excess.argmax()]))
+            limits.append((limits[0][0], limits[0][0]))
+            for which in ['max', 'min']:
+                matrix = integrator.integral_matrix(limits, which)
+                self.assertEqual(matrix.shape, (2, 3))
+                for row, name in zip(matrix, integrator.isotopes):
+                    expected = self.distributions[name] * integrals[name].integrate(*np.array(limits).T, which)
+                    np.testing.assert_allclose(row, expected, rtol=1e-12)
+
+                totals, relevant = integrator.peak_integrals(limits, which)
+                np.testing.assert_allclose(totals, matrix.sum(axis=0), rtol=1e-12)
+                self.assertEqual(relevant[:2], [f"['{integrator.isotopes[i]}_{plotType}']"
+                                                for i in matrix[:, :2].argmax(axis=0)])
+                self.assertEqual(relevant[2], '[]')
+            totals, relevant = integrator.peak_integrals(limits[:2])
+            self.assertEqual(relevant, [f"['{name}_{plotType}']" for name in integrator.isotopes])
+
+    def test_integralCache(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            directory, name = f"{tempDir}/", '29-Cu-test_n-g'
+            x = np.linspace(1, 100, 1000)
+            np.savetxt(f"{directory}{name}.csv", np.column_stack((x, x)), delimiter=',')
+            cache = IntegralCache(budget=1024 ** 3)
+            # Spectra are read from the directory given, not the default graph data directory.
+            integral = cache.get(name, directory)
+            with self.assertRaises(FileNotFoundError):
+                cache.get(name)
+            self.assertIs(cache.get(name, directory), integral)
+            self.assertIsNot(cache.get(name, directory, True, 23.404), integral)
+            self.assertEqual(cache.stats()['integrals'], 2)
+            self.assertEqual(cache.stats()['hits'], 1)
+            self.assertEqual(cache.residentBytes, sum(cache.get(name, directory, *args).nbytes
+                                                      for args in [(), (True, 23.404)]))
+
+            # Integrals beyond the budget evict the least recently used.
+            cache.budget = integral.nbytes
+            cache.invalidate()
+            cache.get(name, directory)
+            cache.get(name, directory, True, 23.404)
+            self.assertEqual(cache.stats()['integrals'], 1)
+            self.assertLessEqual(cache.residentBytes, cache.budget)
+
+            # Invalidating the spectra in the repository drops its integrals.
+            self.assertAlmostEqual(integralCache.get(name, directory).areaTo(100)[()], (100 ** 2 - 1) / 2)
+            np.savetxt(f"{directory}{name}.csv", np.column_stack((x, 2 * x)), delimiter=',')
+            spectrumRepository.invalidate(name)
+            self.assertEqual(integralCache.stats()['integrals'], 0)
+            self.assertAlmostEqual(integralCache.get(name, directory).areaTo(100)[()], 100 ** 2 - 1)
+            spectrumRepository.invalidate(name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import tempfile
+import pandas as pd
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.PeakDatabase import PeakDatabase
+
+filepath = f"{os.path.dirname(__file__)}"
+
+
+class TestPeakDatabase(TestCase):
+
+    tableData = pd.read_csv(f"{filepath}/test_data/tableData/29-Cu_n-g_tableData_max.csv")
+
+    tableData2 = pd.read_csv(f"{filepath}/test_data/tableData/48-Cd_n-g_tableData_max.csv")
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.database = PeakDatabase(f"{self.tempDir.name}/peaks.sqlite")
+
+    def tearDown(self):
+        self.database.close()
+        self.tempDir.cleanup()
+
+    def test_tableRoundTrip(self):
+        self.assertIsNone(self.database.getTable('element_29-Cu_n-g', False, 'max'))
+        self.database.setTable('element_29-Cu_n-g', False, 'max', self.tableData)
+        pd.testing.assert_frame_equal(self.database.getTable('element_29-Cu_n-g', False, 'max'), self.tableData)
+        # Stored without the element prefix, matching the CSV file names.
+        pd.testing.assert_frame_equal(self.database.getTable('29-Cu_n-g', False, 'max'), self.tableData)
+        self.assertIsNone(self.database.getTable('element_29-Cu_n-g', True, 'max'))
+        self.assertIsNone(self.database.getTable('element_29-Cu_n-g', False, 'min'))
+
+        # Empty tables are stored and distinguished from missing ones.
+        self.database.setTable('element_29-Cu_n-g', False, 'min', self.tableData.iloc[:0])
+        self.assertTrue(self.database.getTable('element_29-Cu_n-g', False, 'min').empty)
+
+    def test_limitsRoundTrip(self):
+        self.assertIsNone(self.database.getLimits('element_29-Cu_n-g', 'max'))
+        limits = [(228.022, 232.786), (572.307, 582.318)]
+        self.database.setLimits('element_29-Cu_n-g', 'max', limits)
+        self.assertEqual(list(self.database.getLimits('element_29-Cu_n-g', 'max').itertuples(index=False, name=None)),
+                         limits)
+        self.database.setLimits('element_29-Cu_n-g', 'min', [])
+        self.assertTrue(self.database.getLimits('element_29-Cu_n-g', 'min').empty)
+
+    def test_peaksInRange(self):
+        self.database.setTable('element_29-Cu_n-g', False, 'max', self.tableData)
+        self.database.setTable('element_29-Cu_n-g', False, 'min', self.tableData)
+        # The Cd test table is of the time of flight domain.
+        self.database.setTable('element_48-Cd_n-g', True, 'max', self.tableData2)
+        low, high = 100, 1000
+        peaks = self.database.peaksInRange(low, high)
+        position = self.tableData['Energy (eV)']
+        self.assertEqual(peaks.shape[0], ((position >= low) & (position <= high)).sum())
+        self.assertTrue(peaks['Energy (eV)'].is_monotonic_increasing)
+        self.assertEqual(set(peaks['Spectrum']), {'29-Cu_n-g'})
+
+        peaks = self.database.peaksInRange(low, high, isToF=True)
+        position = self.tableData2['TOF (us)']
+        self.assertEqual(peaks.shape[0], ((position >= low) & (position <= high)).sum())
+        self.assertEqual(set(peaks['Spectrum']), {'48-Cd_n-g'})
+
+    def test_setResults(self):
+        self.assertEqual(self.database.getManifest(), {})
+        limits = [(228.022, 232.786)]
+        manifest = {'buildKey': 'abc', 'sourceMtime': 1.5, 'sourceHash': 'def'}
+        self.database.setResults('element_29-Cu_n-g', {(False, 'max'): self.tableData}, {'max': limits}, manifest)
+        pd.testing.assert_frame_equal(self.database.getTable('element_29-Cu_n-g', False, 'max'), self.tableData)
+        self.assertEqual(list(self.database.getLimits('element_29-Cu_n-g', 'max').itertuples(index=False, name=None)),
+                         limits)
+        self.assertEqual(self.database.getManifest(), {'element_29-Cu_n-g': manifest})
+
+        # A failed write leaves the tables and manifest of the spectra untouched.
+        with self.assertRaises(ValueError):
+            self.database.setResults('element_29-Cu_n-g', {(False, 'max'): self.tableData.iloc[:2]},
+                                     {'max': [(1.0,)]}, {**manifest, 'buildKey': 'ghi'})
+        pd.testing.assert_frame_equal(self.database.getTable('element_29-Cu_n-g', False, 'max'), self.tableData)
+        self.assertEqual(self.database.getManifest(), {'element_29-Cu_n-g': manifest})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+from scipy import signal
+from unittest import TestCase, main
+from unittest.mock import patch
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.settings import params
+from project.spectra.PeakDetection import PeakDetector
+
+filepath = f"{os.path.dirname(__file__)}"
+
+
+class TestPeakDetection(TestCase):
+
+    graphData = pd.read_csv(f"{filepath}/test_data/graphData/element_29-Cu_n-g.csv",
+                            header=None).sort_values(0, ignore_index=True)
+
+    def test_definePeakLimits(self):
+        peakDetector = PeakDetector('element_29-Cu_n-g', self.graphData)
+        peakDetector.maxima(100)
+        peakDetector.minima()
+        x = self.graphData[0]
+        for which in ['max', 'min']:
+            peakDetector.definePeakLimits(which)
+            limitsX = getattr(peakDetector, f"{which}PeakLimitsX")
+            limitsY = getattr(peakDetector, f"{which}PeakLimitsY")
+            peakList = peakDetector.maximaList if which == 'max' else peakDetector.minimaList
+            zerosList = peakDetector.dips if which == 'max' else peakDetector.flats
+            self.assertEqual(list(limitsX.keys()), list(peakList[0]))
+            # Each limit is the elbow between the peak and its closest zero derivative.
+            for peakX, (left, right) in limitsX.items():
+                peakIndex = x[x == peakX].index[0]
+                leftFlat = zerosList[zerosList < peakIndex].max(initial=0)
+                rightFlat = zerosList[zerosList > peakIndex].min(initial=x.size - 1)
+                leftElbow = peakDetector.findElbow(self.graphData.iloc[leftFlat:peakIndex + 1])
+                rightElbow = peakDetector.findElbow(self.graphData.iloc[peakIndex:rightFlat + 1])
+                self.assertEqual((left, right), (leftElbow[0], rightElbow[0]))
+                self.assertEqual(limitsY[peakX], (leftElbow[1], rightElbow[1]))
+
+    def test_extrema(self):
+        peakDetector = PeakDetector('element_29-Cu_n-g', self.graphData)
+        maximaX, maximaY = peakDetector.maxima(100)
+        minimaX, minimaY = peakDetector.minima()
+        self.assertIsInstance(maximaX, np.ndarray)
+        np.testing.assert_array_equal(maximaX, self.graphData[0].iloc[peakDetector.maximaIndices])
+        np.testing.assert_array_equal(maximaY, self.graphData[1].iloc[peakDetector.maximaIndices])
+        np.testing.assert_array_equal(minimaY, self.graphData[1].iloc[peakDetector.minimaIndices])
+        self.assertTrue((maximaY >= 100).all())
+        for key in ['peak_heights', 'prominences', 'widths']:
+            self.assertEqual(peakDetector.maximaProperties[key].size, maximaX.size)
+            self.assertEqual(peakDetector.minimaProperties[key].size, minimaX.size)
+
+    def test_thresholdSweep(self):
+        peakDetector = PeakDetector('element_29-Cu_n-g', self.graphData)
+        for threshold in [100, 5, 1000, 0.5]:
+            # Filtering the cached candidates matches detecting the peaks afresh with the threshold.
+            expected, _ = signal.find_peaks(self.graphData[1], threshold, rel_height=1, width=10)
+            np.testing.assert_array_equal(peakDetector.maxima(threshold)[0], self.graphData[0].iloc[expected])
+
+            fresh = PeakDetector('element_29-Cu_n-g', self.graphData)
+            fresh.maxima(threshold)
+            peakDetector.definePeakLimits('max')
+            fresh.definePeakLimits('max')
+            self.assertEqual(peakDetector.maxPeakLimitsX, fresh.maxPeakLimitsX)
+            self.assertEqual(peakDetector.maxPeakLimitsY, fresh.maxPeakLimitsY)
+
+    def test_lazyProperties(self):
+        peakDetector = PeakDetector('element_29-Cu_n-g', self.graphData)
+        peakDetector.maxima(100)
+        peakDetector.minima()
+        for attribute in ['npSmoothGraph', 'npDer', 'npSecDer', 'infls', 'flats', 'dips', 'npBaseline']:
+            self.assertNotIn(attribute, peakDetector.__dict__)
+
+        np.testing.assert_array_equal(peakDetector.derivative.iloc[:, 1], np.gradient(peakDetector.npSmoothGraph))
+        np.testing.assert_array_equal(peakDetector.dips, np.where(np.diff(np.sign(peakDetector.npDer)) > 0)[0])
+        self.assertIs(peakDetector.npDer, peakDetector.npDer)
+
+    def test_findElbows(self):
+        x, y = self.graphData[0].to_numpy(), self.graphData[1].to_numpy()
+        starts, stops = np.array([0, 10, 500, 42]), np.array([100, 11, 1000, 43 + 1])
+        elbows = PeakDetector.findElbows(x, y, starts, stops)
+        for start, stop, elbow in zip(starts, stops, elbows):
+            self.assertEqual(elbow, PeakDetector.findElbow(None, self.graphData.iloc[start:stop]).name)
+
+    def test_pyramid(self):
+        full = PeakDetector('element_29-Cu_n-g', self.graphData)
+        with patch.dict(params, {'detection_mode': 'pyramid', 'pyramid_block': 16, 'pyramid_min_points': 0}):
+            pyramid = PeakDetector('element_29-Cu_n-g', self.graphData)
+            for threshold in [1000, 100]:
+                # Windows reaching the threshold hold the same peaks and limits as the whole spectra.
+                np.testing.assert_array_equal(pyramid.maxima(threshold)[0], full.maxima(threshold)[0])
+                pyramid.definePeakLimits('max')
+                full.definePeakLimits('max')
+                self.assertEqual(pyramid.maxPeakLimitsX, full.maxPeakLimitsX)
+                self.assertLess((np.diff(pyramid.windows['max'], axis=0)).sum(), self.graphData.shape[0])
+            # Minima are searched at full resolution.
+            np.testing.assert_array_equal(pyramid.minima()[0], full.minima()[0])
+            self.assertNotIn('min', pyramid.windows)
+            pyramid.definePeakLimits('min')
+            full.definePeakLimits('min')
+            self.assertEqual(pyramid.minPeakLimitsX, full.minPeakLimitsX)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import sys
+import os
+import numpy as np
+from unittest import TestCase, main
+
+from matplotlib.figure import Figure
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.myMatplotlib.PeakMarkers import PeakMarkers
+
+
+class TestPeakMarkers(TestCase):
+
+    def test_update(self):
+        ax = Figure().add_subplot()
+        markers = PeakMarkers(ax, "29-Cu-63_n-g-Energy-max")
+        peaksX, peaksY = np.array([1.0, 2.0, 3.0]), np.array([10.0, 20.0, 30.0])
+        limitsX = {1.0: (0.5, 1.5), 3.0: (2.5, 3.5)}
+        limitsY = {1.0: (5.0, 6.0), 3.0: (7.0, 8.0)}
+        markers.update(peaksX, peaksY, limitsX, limitsY)
+        # Two collections regardless of the number of peaks, limits only for peaks which have them.
+        self.assertEqual(len(ax.collections), 2)
+        np.testing.assert_array_equal(markers.peaks.get_offsets(), np.column_stack([peaksX, peaksY]))
+        np.testing.assert_array_equal(markers.limits.get_offsets(), [[0.5, 5.0], [1.5, 6.0], [2.5, 7.0], [3.5, 8.0]])
+
+        markers.setPeakLimits(3.0, right=(3.2, 9.0))
+        np.testing.assert_array_equal(markers.limits.get_offsets()[2:], [[2.5, 7.0], [3.2, 9.0]])
+
+        markers.update(peaksX[:1], peaksY[:1], limitsX, limitsY)
+        self.assertEqual(markers.limits.get_offsets().shape, (2, 2))
+        markers.remove()
+        self.assertEqual(len(ax.collections), 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.ResultCache import ResultCache, cacheKey
+
+
+class TestResultCache(TestCase):
+
+    graphData = np.column_stack((np.linspace(1, 100, 1000), np.random.default_rng(0).random(1000)))
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_cacheKey(self):
+        key = cacheKey(self.graphData, threshold=100, smoothCoeff=12)
+        self.assertEqual(key, cacheKey(self.graphData.copy(), smoothCoeff=12, threshold=100))
+        self.assertNotEqual(key, cacheKey(self.graphData, threshold=50, smoothCoeff=12))
+        changed = self.graphData.copy()
+        changed[10, 1] += 1e-9
+        self.assertNotEqual(key, cacheKey(changed, threshold=100, smoothCoeff=12))
+
+    def test_roundTrip(self):
+        cache = ResultCache(self.tempDir.name, 1024 ** 2)
+        key = cacheKey(self.graphData)
+        self.assertIsNone(cache.get(key))
+        cache.set(key, {'maxima': self.graphData[:5]})
+        np.testing.assert_array_equal(cache.get(key)['maxima'], self.graphData[:5])
+        self.assertEqual(os.listdir(self.tempDir.name), [f"{key}.pkl"])
+
+        # Unreadable entries are dropped.
+        with open(os.path.join(self.tempDir.name, f"{key}.pkl"), 'wb') as file:
+            file.write(b'partial')
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(os.listdir(self.tempDir.name), [])
+
+    def test_eviction(self):
+        cache = ResultCache(self.tempDir.name, 3 * self.graphData.nbytes)
+        keys = [cacheKey(self.graphData, index=i) for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.set(key, self.graphData)
+            os.utime(os.path.join(self.tempDir.name, f"{key}.pkl"), (time.time() - 100 + i, time.time() - 100 + i))
+        # Reading the oldest entry makes it the most recently used.
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.set(keys[2], self.graphData)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+        self.assertIsNone(ResultCache(self.tempDir.name, 0).get(keys[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import sys
+import os
+import shutil
+import tempfile
+import pandas as pd
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.SpectraCatalog import SpectraCatalog
+
+filepath = f"{os.path.dirname(__file__)}"
+
+
+class TestSpectraCatalog(TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.graphDataDir = f"{self.tempDir.name}/Graph Data/"
+        self.manifestPath = f"{self.tempDir.name}/catalog.json"
+        self.storeDir = f"{self.tempDir.name}/Binary Data/"
+        shutil.copytree(f"{filepath}/test_data/graphData", self.graphDataDir)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_catalog(self):
+        catalog = SpectraCatalog(self.graphDataDir, self.manifestPath, self.storeDir)
+        self.assertEqual(catalog.names(), ['element_29-Cu_n-g', 'element_48-Cd_n-g'])
+        self.assertEqual(catalog.names(symbol='Cu'), ['element_29-Cu_n-g'])
+        self.assertEqual(catalog.names(isElement=False), [])
+
+        graphData = pd.read_csv(f"{self.graphDataDir}element_29-Cu_n-g.csv", header=None)
+        info = catalog['element_29-Cu_n-g']
+        self.assertEqual(info['nNum'], '29')
+        self.assertEqual(info['mode'], 'n-g')
+        self.assertEqual(info['rows'], graphData.shape[0])
+        self.assertEqual(info['xMin'], graphData[0].min())
+        self.assertEqual(info['xMax'], graphData[0].max())
+
+    def test_refresh(self):
+        catalog = SpectraCatalog(self.graphDataDir, self.manifestPath, self.storeDir)
+        self.assertTrue(os.path.exists(self.manifestPath))
+        self.assertFalse(catalog.refresh())
+        # A second instance is served from the manifest.
+        self.assertEqual(SpectraCatalog(self.graphDataDir, self.manifestPath, self.storeDir).spectra, catalog.spectra)
+
+        shutil.copy(f"{self.graphDataDir}element_29-Cu_n-g.csv", f"{self.graphDataDir}29-Cu-63_n-g.csv")
+        os.utime(self.graphDataDir, (0, 0))
+        self.assertTrue(catalog.refresh())
+        self.assertEqual(catalog.names(isElement=False), ['29-Cu-63_n-g'])
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 import sys
 import os
+import tempfile
+import numpy as np
 import pandas as pd
 from unittest import TestCase, main
+from unittest.mock import patch
 
 
 sys.path.append(os.path.dirname(__file__))
@@ -9,7 +12,11 @@ sys.path.append(os.path.abspath("./src/"))
 sys.path.append(os.path.abspath("./src/project/"))
 sys.path.append(os.path.abspath("./src/project/spectra"))
 sys.path.append(os.path.abspath("./src/project/myPyQt"))
+from project.spectra.BatchDetection import detectPeaks
+from project.spectra.PeakDatabase import PeakDatabase
 from project.spectra.SpectraDataStructure import SpectraData
+from project.spectra.SpectrumRepository import spectrumRepository
+from project.spectra.ResultCache import resultCache
 
 filepath = f"{os.path.dirname(__file__)}"
 
@@ -34,6 +41,16 @@ class TestSpectraData(TestCase):
         f"{filepath}/test_data/tableData/48-Cd_n-g_tableData_max.csv",
         header=None)
 
+    def setUp(self):
+        # Results are cached in a temporary directory, so each test runs the analysis itself.
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.cacheDirectory = patch.object(resultCache, 'directory', self.tempDir.name)
+        self.cacheDirectory.start()
+
+    def tearDown(self):
+        self.cacheDirectory.stop()
+        self.tempDir.cleanup()
+
     def test_ElementData_init_Normal(self):
 
         # Normal
@@ -151,6 +168,196 @@ class TestSpectraData(TestCase):
         element.graphData[0] = element.energyToTOF(element.graphData[0], None)
         self.assertFalse(element.graphData.equals(self.graphData2))
 
+    def test_deriveResults(self):
+        spectra = {}
+        for tof, energyResults in [(False, None), (True, None), (True, 'energy')]:
+            spectra[(tof, energyResults)] = SpectraData(
+                name="29-Cu-63_n-g",
+                numPeaks=None,
+                tableDataMax=None,
+                tableDataMin=None,
+                graphData=self.graphData.copy(),
+                graphColour=(0, 0, 0),
+                isToF=tof,
+                distributions=None,
+                defaultDist=None,
+                updatingDatabase=True,
+                energyResults=None if energyResults is None else spectra[(False, None)].derivedResults())
+        energy, detected, derived = spectra.values()
+        # Same peaks as detecting them in the ToF domain, limits are the mapped energy limits.
+        np.testing.assert_array_equal(derived.maxima, detected.maxima)
+        np.testing.assert_array_equal(derived.minima, detected.minima)
+        for peak, (left, right) in energy.maxPeakLimitsX.items():
+            tofPeak, tofLeft, tofRight = derived.energyToTOF([peak, right, left])
+            self.assertEqual(derived.maxPeakLimitsX[tofPeak], (tofLeft, tofRight))
+        self.assertEqual(list(derived.maxPeakLimitsX), sorted(derived.maxPeakLimitsX))
+        self.assertEqual(derived.maxTableData.shape, detected.maxTableData.shape)
+        self.assertEqual(list(derived.maxTableData.columns), list(detected.maxTableData.columns))
+
+    def test_rescaleLength(self):
+        spectra = []
+        for length in [{"n-g": 22.804, "n-tot": 23.404}, {"n-g": 20.0, "n-tot": 23.404}]:
+            spectra.append(SpectraData(
+                name="29-Cu-63_n-g",
+                numPeaks=None,
+                tableDataMax=None,
+                tableDataMin=None,
+                graphData=self.graphData.copy(),
+                graphColour=(0, 0, 0),
+                isToF=True,
+                distributions=None,
+                defaultDist=None,
+                length=length,
+                updatingDatabase=True))
+        rescaled, converted = spectra
+        limits = dict(rescaled.maxPeakLimitsX)
+        integrals = rescaled.maxTableData["Integral"].iloc[1:].to_numpy(dtype=float)
+        rescaled.rescaleLength({"n-g": 20.0, "n-tot": 23.404})
+        # Same peaks as converting with the new length, limits and integrals scale with the axis.
+        np.testing.assert_allclose(rescaled.graphData[0], converted.graphData[0], rtol=1e-15)
+        np.testing.assert_allclose(rescaled.maxima, converted.maxima, rtol=1e-15)
+        np.testing.assert_allclose(list(rescaled.maxPeakLimitsX.values()),
+                                   np.array(list(limits.values())) * 20 / 22.804, rtol=1e-15)
+        np.testing.assert_allclose(rescaled.maxTableData["Integral"].iloc[1:].to_numpy(dtype=float),
+                                   integrals * 20 / 22.804, rtol=1e-5)
+        np.testing.assert_array_equal(rescaled.maxTableData["TOF (us)"].iloc[1:].to_numpy(dtype=float),
+                                      converted.maxTableData["TOF (us)"].iloc[1:].to_numpy(dtype=float))
+        self.assertEqual(list(rescaled.maxTableData["Rank by Integral"]),
+                         list(converted.maxTableData["Rank by Integral"]))
+
+    def test_mixedGraphData(self):
+        dist = {"29-Cu-63": 0.691500, "29-Cu-65": 0.308500}
+        element = SpectraData(
+            name="element_29-Cu_n-g",
+            numPeaks=None,
+            tableDataMax=None,
+            tableDataMin=None,
+            graphData=None,
+            graphColour=(0, 0, 0),
+            isToF=False,
+            distributions=dist,
+            defaultDist=dist,
+            distChanging=True)
+        isotopes = [spectrumRepository.get(f"{name}_n-g") for name in dist]
+        # Weighted sum of the isotopes over the union grid, for the plotted and any other distribution.
+        for weights in [dist, {"29-Cu-63": 0.2, "29-Cu-65": 0.8}, {"29-Cu-63": 1.0, "29-Cu-65": 0.0}]:
+            graphData = element.mixedGraphData(weights).to_numpy()
+            expected = sum(weight * np.interp(graphData[:, 0], *isotope[np.argsort(isotope[:, 0], kind='stable')].T)
+                           for weight, isotope in zip(weights.values(), isotopes))
+            np.testing.assert_allclose(graphData[:, 1], expected, rtol=1e-12)
+        np.testing.assert_array_equal(element.graphData.to_numpy(), element.mixedGraphData().to_numpy())
+
+    def test_compound(self):
+        dist = {"29-Cu-63_n-g": 0.5, "48-Cd-106_n-g": 0.5}
+        compound = SpectraData("compound_Cu-63[0.5]-Cd-106[0.5]_n-g", None, None, None, None, None, None,
+                               dist, dist, isCompound=True)
+        compound.setGraphDataFromDist({name: pd.DataFrame(spectrumRepository.get(name) * [1, weight])
+                                       for name, weight in dist.items()})
+        self.assertFalse(compound.graphData.empty)
+
+        # Changed data has its limits calculated rather than loaded for the spectra of the same name.
+        changed = SpectraData(
+            name="29-Cu-63_n-g",
+            numPeaks=None,
+            tableDataMax=None,
+            tableDataMin=None,
+            graphData=compound.graphData.copy(),
+            graphColour=(0, 0, 0),
+            isToF=False,
+            distributions=None,
+            defaultDist=None,
+            isCompound=True)
+        detected = SpectraData(
+            name="29-Cu-63_n-g",
+            numPeaks=None,
+            tableDataMax=None,
+            tableDataMin=None,
+            graphData=compound.graphData.copy(),
+            graphColour=(0, 0, 0),
+            isToF=False,
+            distributions=None,
+            defaultDist=None,
+            updatingDatabase=True)
+        self.assertEqual(changed.maxPeakLimitsX, detected.maxPeakLimitsX)
+        self.assertEqual(changed.minPeakLimitsX, detected.minPeakLimitsX)
+
+    def test_applyDetectedPeaks(self):
+        graphData = self.graphData.drop_duplicates(0).dropna().sort_values(0, ignore_index=True)
+        spectra = []
+        for detectedPeaks in [None, detectPeaks("29-Cu-63_n-g", graphData.to_numpy())]:
+            spectra.append(SpectraData(
+                name="29-Cu-63_n-g",
+                numPeaks=None,
+                tableDataMax=None,
+                tableDataMin=None,
+                graphData=graphData.copy(),
+                graphColour=(0, 0, 0),
+                isToF=False,
+                distributions=None,
+                defaultDist=None,
+                updatingDatabase=True,
+                detectedPeaks=detectedPeaks))
+        detected, applied = spectra
+        # Same peaks, limits and tables as detecting them in the instance.
+        np.testing.assert_array_equal(applied.maxima, detected.maxima)
+        np.testing.assert_array_equal(applied.minima, detected.minima)
+        self.assertEqual(applied.maxPeakLimitsX, detected.maxPeakLimitsX)
+        self.assertEqual(applied.minPeakLimitsY, detected.minPeakLimitsY)
+        pd.testing.assert_frame_equal(applied.maxTableData, detected.maxTableData)
+        pd.testing.assert_frame_equal(applied.minTableData, detected.minTableData)
+
+    def test_resultCache(self):
+        def spectra() -> SpectraData:
+            # Not in the peak database, so its limits are analysed rather than loaded.
+            return SpectraData(
+                name="29-Cu-test_n-g",
+                numPeaks=None,
+                tableDataMax=None,
+                tableDataMin=None,
+                graphData=self.graphData.copy(),
+                graphColour=(0, 0, 0),
+                isToF=False,
+                distributions=None,
+                defaultDist=None)
+        analysed = spectra()
+        self.assertEqual(len(os.listdir(self.tempDir.name)), 1)
+        # The second construction restores the cached results instead of analysing the spectra again.
+        with patch.object(SpectraData, 'analysePeaks', side_effect=AssertionError):
+            cached = spectra()
+        np.testing.assert_array_equal(cached.maxima, analysed.maxima)
+        np.testing.assert_array_equal(cached.minima, analysed.minima)
+        self.assertEqual(cached.maxPeakLimitsX, analysed.maxPeakLimitsX)
+        pd.testing.assert_frame_equal(cached.maxTableData, analysed.maxTableData)
+
+    def test_resultCacheKey(self):
+        dist = {"29-Cu-63": 0.6915, "29-Cu-65": 0.3085}
+        graphDataDir = f"{self.tempDir.name}/graphData/"
+        os.makedirs(graphDataDir)
+        for name in dist:
+            np.savetxt(f"{graphDataDir}{name}_n-g.csv", spectrumRepository.get(f"{name}_n-g"), delimiter=',')
+        spectra = SpectraData(
+            name="element_29-Cu_n-g",
+            numPeaks=None,
+            tableDataMax=None,
+            tableDataMin=None,
+            graphData=self.graphData.copy(),
+            graphColour=(0, 0, 0),
+            isToF=False,
+            distributions=dist,
+            defaultDist=dist,
+            graphDataDir=graphDataDir)
+        key = spectra.resultCacheKey()
+        self.assertEqual(spectra.resultCacheKey(), key)
+        # A rebuild of the spectra in the peak database changes the key.
+        with patch.object(PeakDatabase, 'getBuildKey', return_value='rebuilt'):
+            self.assertNotEqual(spectra.resultCacheKey(), key)
+        # As does a change to the source file of an isotope.
+        stat = os.stat(f"{graphDataDir}29-Cu-65_n-g.csv")
+        os.utime(f"{graphDataDir}29-Cu-65_n-g.csv", (stat.st_atime, stat.st_mtime + 1))
+        self.assertNotEqual(spectra.resultCacheKey(), key)
+        for name in dist:
+            spectrumRepository.invalidate(f"{name}_n-g")
+
 
 if __name__ == '__main__':
     main()
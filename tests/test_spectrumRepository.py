@@ -0,0 +1,70 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.SpectrumRepository import SpectrumRepository
+
+filepath = f"{os.path.dirname(__file__)}"
+
+
+class TestSpectrumRepository(TestCase):
+
+    graphDataDir = f"{filepath}/test_data/graphData/"
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.storeDir = f"{self.tempDir.name}/"
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_hitsAndMisses(self):
+        repository = SpectrumRepository(budget=1024 ** 3, storeDir=self.storeDir)
+        data = repository.get('element_29-Cu_n-g', self.graphDataDir)
+        self.assertFalse(data.flags.writeable)
+        with self.assertRaises(ValueError):
+            data[0, 0] = 0
+        self.assertIs(repository.get('element_29-Cu_n-g', self.graphDataDir), data)
+        self.assertEqual(repository.stats()['hits'], 1)
+        self.assertEqual(repository.stats()['misses'], 1)
+        self.assertEqual(repository.residentBytes, data.nbytes)
+
+        graphData = repository.getGraphData('element_29-Cu_n-g', self.graphDataDir)
+        pd.testing.assert_frame_equal(
+            graphData, pd.read_csv(f"{self.graphDataDir}element_29-Cu_n-g.csv", header=None).astype(float))
+        graphData[0] = 0
+        self.assertFalse(np.all(data[:, 0] == 0))
+
+        repository.invalidate('element_29-Cu_n-g')
+        self.assertEqual(repository.residentBytes, 0)
+        self.assertNotIn('element_29-Cu_n-g', repository)
+
+    def test_eviction(self):
+        repository = SpectrumRepository(budget=1024 ** 3, storeDir=self.storeDir)
+        copper = repository.get('element_29-Cu_n-g', self.graphDataDir)
+        cadmium = repository.get('element_48-Cd_n-g', self.graphDataDir)
+        repository.get('element_29-Cu_n-g', self.graphDataDir)
+
+        # Cadmium is the least recently used spectra, so is evicted first.
+        repository.setBudget(copper.nbytes)
+        self.assertIn('element_29-Cu_n-g', repository)
+        self.assertNotIn('element_48-Cd_n-g', repository)
+        self.assertEqual(repository.stats()['evictions'], 1)
+        self.assertEqual(repository.residentBytes, copper.nbytes)
+
+        # Spectra larger than the budget are returned without being kept.
+        repository.setBudget(cadmium.nbytes - 1)
+        repository.get('element_48-Cd_n-g', self.graphDataDir)
+        self.assertNotIn('element_48-Cd_n-g', repository)
+        self.assertLessEqual(repository.residentBytes, repository.budget)
+
+
+if __name__ == '__main__':
+    main()
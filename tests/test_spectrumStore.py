@@ -0,0 +1,51 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest import TestCase, main
+
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.abspath("./src/"))
+sys.path.append(os.path.abspath("./src/project/"))
+from project.spectra.SpectrumStore import buildSpectrumStore, loadGraphData, loadSpectrum, storePath
+
+filepath = f"{os.path.dirname(__file__)}"
+
+
+class TestSpectrumStore(TestCase):
+
+    graphDataDir = f"{filepath}/test_data/graphData/"
+
+    def test_buildAndLoad(self):
+        with tempfile.TemporaryDirectory() as storeDir:
+            storeDir = f"{storeDir}/"
+            converted = buildSpectrumStore([self.graphDataDir], storeDir)
+            self.assertEqual(sorted(converted), ['element_29-Cu_n-g', 'element_48-Cd_n-g'])
+            # Up to date files are not converted again.
+            self.assertEqual(buildSpectrumStore([self.graphDataDir], storeDir), [])
+
+            expected = pd.read_csv(f"{self.graphDataDir}element_29-Cu_n-g.csv", header=None)
+            spectrum = loadSpectrum('element_29-Cu_n-g', self.graphDataDir, storeDir)
+            self.assertIsInstance(spectrum, np.memmap)
+            self.assertEqual(spectrum.shape, expected.shape)
+            self.assertTrue(np.array_equal(spectrum, expected.to_numpy()))
+
+            graphData = loadGraphData('element_29-Cu_n-g', self.graphDataDir, storeDir)
+            pd.testing.assert_frame_equal(graphData, expected.astype(float))
+            del spectrum
+
+    def test_fallbackToCSV(self):
+        with tempfile.TemporaryDirectory() as storeDir:
+            storeDir = f"{storeDir}/"
+            self.assertFalse(os.path.exists(storePath('element_48-Cd_n-g', storeDir)))
+            spectrum = loadSpectrum('element_48-Cd_n-g', self.graphDataDir, storeDir)
+            self.assertNotIsInstance(spectrum, np.memmap)
+            self.assertEqual(spectrum.shape[1], 2)
+            with self.assertRaises(FileNotFoundError):
+                loadSpectrum('element_00-Xx_n-g', self.graphDataDir, storeDir)
+
+
+if __name__ == '__main__':
+    main()